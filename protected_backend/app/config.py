@@ -6,17 +6,24 @@ Handles environment variables, runtime mode selection, and application settings.
 
 import os
 import json
+import time
 import fcntl
+import atexit
+import asyncio
+import logging
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from enum import Enum
-from functools import lru_cache
-from typing import Optional, Dict, Any
+from functools import lru_cache, partial
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import threading
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 
+logger = logging.getLogger(__name__)
+
 
 class RuntimeMode(str, Enum):
     """Runtime mode enumeration."""
@@ -24,6 +31,26 @@ class RuntimeMode(str, Enum):
     RASPBERRY_PI_ROS2 = "raspberry_pi_ros2"
 
 
+class ConfigFsyncPolicy(str, Enum):
+    """Durability of local config writes (see LocalConfigManager)."""
+    ALWAYS = "always"
+    BATCHED = "batched"
+    OFF = "off"
+
+
+class ServerProfile(str, Enum):
+    """uvicorn server profile (see app.server)."""
+    DEFAULT = "default"
+    PERFORMANCE = "performance"
+
+
+class ProcessRole(str, Enum):
+    """Role of this process in the multi-worker deployment (see app.server)."""
+    STANDALONE = "standalone"
+    HARDWARE = "hardware"
+    HTTP = "http"
+
+
 class LogLevel(str, Enum):
     """Log level enumeration."""
     DEBUG = "DEBUG"
@@ -41,6 +68,24 @@ class Settings(BaseSettings):
     debug: bool = Field(default=False, description="Debug mode")
     log_level: LogLevel = Field(default=LogLevel.INFO, description="Log level")
     
+    # Server profile settings (see app.server)
+    server_profile: ServerProfile = Field(
+        default=ServerProfile.DEFAULT,
+        description="default (uvicorn defaults) or performance (uvloop/httptools when installed, no access log)"
+    )
+    workers: int = Field(
+        default=1,
+        description="HTTP worker processes; above 1 a separate hardware-owner process runs the runtime manager"
+    )
+    hardware_socket: Optional[str] = Field(
+        default=None,
+        description="Unix socket of the hardware-owner process (default: per-port path in the temp dir)"
+    )
+    process_role: ProcessRole = Field(
+        default=ProcessRole.STANDALONE,
+        description="Set by the launcher: standalone, hardware (owner) or http (worker)"
+    )
+    
     # Runtime mode
     runtime_mode: RuntimeMode = Field(
         default=RuntimeMode.MACBOOK_SIM,
@@ -119,6 +164,126 @@ class Settings(BaseSettings):
     camera_fps: int = Field(default=30, description="Camera FPS")
     camera_snapshot_timeout_ms: int = Field(default=2000, description="Camera snapshot timeout in milliseconds")
     
+    # Camera frame cache settings (see app.services.frame_cache)
+    camera_frame_cache: bool = Field(
+        default=True,
+        description="Keep a persistent camera subscription and serve snapshots from its latest frame"
+    )
+    camera_frame_slots: int = Field(
+        default=4,
+        description="Number of preallocated frame buffers in the camera ring"
+    )
+    camera_idle_shutdown_s: float = Field(
+        default=0.0,
+        description="Drop the camera subscription after this many idle seconds (0 keeps it on)"
+    )
+    
+    # Camera encode pipeline settings (see app.services.frame_pipeline)
+    camera_pipeline_idle_s: float = Field(
+        default=10.0,
+        description="Evict a (width, height, quality) encode profile after this many unused seconds"
+    )
+    camera_pipeline_max_profiles: int = Field(
+        default=8,
+        description="Maximum number of encode profiles kept at once"
+    )
+    
+    # Resumable SSE settings (see app.middleware.sse_replay)
+    sse_replay_max_events: int = Field(
+        default=512,
+        description="Maximum SSE events kept per stream for Last-Event-ID replay"
+    )
+    sse_replay_ttl_s: int = Field(
+        default=120,
+        description="Seconds a finished SSE stream stays resumable"
+    )
+    sse_replay_max_streams: int = Field(
+        default=64,
+        description="Maximum number of SSE streams kept for replay"
+    )
+    
+    # Coze file_id cache settings (see app.services.file_id_cache)
+    file_id_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse Coze file_id for re-uploaded identical files"
+    )
+    file_id_cache_ttl_s: int = Field(
+        default=86400,
+        description="Seconds a cached Coze file_id is reused"
+    )
+    file_id_cache_max_entries: int = Field(
+        default=512,
+        description="Maximum number of cached Coze file_ids (LRU eviction)"
+    )
+    file_id_cache_max_upload_mb: int = Field(
+        default=32,
+        description="Uploads larger than this bypass the file_id cache"
+    )
+    
+    # Conditional GET settings (see app.middleware.etag)
+    etag_enabled: bool = Field(
+        default=True,
+        description="Emit ETag/Cache-Control on read-mostly routes and answer If-None-Match with 304"
+    )
+    
+    # Batch API settings (see app.routers.batch)
+    batch_max_operations: int = Field(
+        default=32,
+        description="Maximum number of operations in one POST /api/v1/batch"
+    )
+    batch_operation_timeout_s: float = Field(
+        default=30.0,
+        description="Seconds a single batch operation may run before it is cancelled"
+    )
+    
+    # Request context settings (see app.middleware.request_context)
+    server_timing: bool = Field(
+        default=True,
+        description="Add a Server-Timing header with the time until response headers were sent"
+    )
+    slow_request_ms: int = Field(
+        default=0,
+        description="Log requests whose response headers took longer than this (0 disables)"
+    )
+    
+    # Response serialization (see app.utils.json_codec)
+    fast_json: bool = Field(
+        default=False,
+        description="Render JSON responses with orjson when it is installed (opt-in)"
+    )
+    
+    # Coze API endpoint override (e.g. the local fake_coze server for offline tests)
+    coze_api_base: Optional[str] = Field(
+        default=None,
+        description="Coze API base URL; exported as COZE_API_BASE for the Coze service"
+    )
+    
+    # Local config cache settings (see LocalConfigManager)
+    config_cache_enabled: bool = Field(
+        default=True,
+        description="Serve config reads from an in-memory snapshot invalidated by file mtime/inode"
+    )
+    config_watch: bool = Field(
+        default=False,
+        description="Invalidate the config snapshot via inotify instead of a stat() per read (Linux)"
+    )
+    config_fsync: ConfigFsyncPolicy = Field(
+        default=ConfigFsyncPolicy.ALWAYS,
+        description="Config write durability: always (fsync per write), batched (group commit) or off"
+    )
+    config_write_window_ms: int = Field(
+        default=100,
+        description="Batched/off policies: delay during which config writes are coalesced into one"
+    )
+    config_io_workers: int = Field(
+        default=2,
+        description="Threads of the executor running config file I/O off the event loop"
+    )
+    config_write_delay_ms: int = Field(
+        default=0,
+        description="Testing aid: extra delay added to every config file write (emulates a slow SD card)"
+    )
+    
     # LLM proxy settings
     llm_service_url: Optional[str] = Field(
         default=None,
@@ -157,18 +322,91 @@ def get_settings() -> Settings:
     """Get cached application settings."""
     return Settings()
 
+
+def _copy_json(value: Any) -> Any:
+    """Deep copy of a JSON-shaped value (much cheaper than copy.deepcopy)."""
+    if isinstance(value, dict):
+        return {k: _copy_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
 # Local JSON Configuration Management
 class LocalConfigManager:
-    """Manages local JSON configuration file with thread-safe operations."""
+    """Manages local JSON configuration file with thread-safe operations.
+    
+    Reads are served from an in-memory snapshot of the file. The snapshot is
+    keyed by the file's (device, inode, mtime_ns, size) stamp: atomic replaces
+    change the inode and in-place edits change mtime/size, so external edits
+    are picked up on the next read. With `watch=True` an inotify watcher marks
+    the snapshot stale instead, and clean reads skip even the stat() call.
+    
+    Writes are group-committed. A write is applied to the in-memory snapshot
+    immediately and numbered; the flusher writes the newest staged config in
+    one temp-file + rename, so a burst of writes costs one disk write:
     
-    def __init__(self, config_path: Optional[str] = None):
+    - ``always``: the caller blocks until its config is fsynced; writers that
+      arrive while a flush is running share the next flush. Readers and
+      listeners only see a write once it is on disk. If a flush fails, every
+      write staged up to then fails with it (later ones were built on top of
+      it) and the config is reloaded from the file.
+    - ``batched``: the caller returns at once and listeners see the write
+      immediately; staged writes are flushed and fsynced after `write_window_ms`.
+    - ``off``: like ``batched`` but without fsync (the OS decides when data
+      reaches the card).
+    """
+    
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        cache: bool = True,
+        watch: bool = False,
+        fsync_policy: Optional[ConfigFsyncPolicy] = None,
+        write_window_ms: int = 100,
+        write_delay_ms: int = 0,
+    ):
         # Use a re-entrant lock to avoid deadlocks when a method holding
         # the lock calls another method that attempts to acquire it again.
-        # For example, read_config() may call _atomic_write() when creating
-        # defaults, which also acquires the same lock.
+        # For example, merge_config() loads and stages the config while
+        # holding it, and both steps acquire the same lock.
         self._lock = threading.RLock()
         self._config_path = self._get_config_path(config_path)
         self._ensure_config_dir()
+        
+        self._cache_enabled = cache
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._stamp: Optional[tuple] = None
+        # Set by the inotify watcher; only consulted while the watcher runs
+        self._stale = True
+        self._watcher = None
+        
+        # Group commit state. _staged_seq > _written_seq means the snapshot is
+        # ahead of the file. Disk I/O happens under _flush_lock only, never
+        # under _lock, so reads and staging never wait for an fsync.
+        self._fsync_policy = ConfigFsyncPolicy(fsync_policy or ConfigFsyncPolicy.ALWAYS)
+        self._write_window_s = max(0, write_window_ms) / 1000
+        self._write_delay_s = max(0, write_delay_ms) / 1000
+        self._flush_lock = threading.Lock()
+        self._staged_seq = 0
+        self._written_seq = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self.write_stats = {"writes": 0, "flushes": 0, "flush_errors": 0}
+        # Called under _lock with every new snapshot (staged or reloaded), in order
+        self._listeners: List[Callable[[Dict[str, Any]], Any]] = []
+        # ``always`` policy: staged snapshots waiting for their flush to succeed,
+        # the config last known to be on disk (served to readers meanwhile), and
+        # the last write sequence that succeeded / failed
+        self._unpublished: List[Tuple[int, Dict[str, Any]]] = []
+        self._durable: Optional[Dict[str, Any]] = None
+        self._durable_seq = 0
+        self._failed_seq = 0
+        self._failed_error: Optional[BaseException] = None
+        if self._fsync_policy != ConfigFsyncPolicy.ALWAYS:
+            atexit.register(self.flush)
+        
+        if cache and watch:
+            self.start_watching()
     
     def _get_config_path(self, config_path: Optional[str] = None) -> Path:
         """Get configuration file path with environment variable override."""
@@ -198,66 +436,341 @@ class LocalConfigManager:
             "coze_workspace_id": None
         }
     
-    def _atomic_write(self, data: Dict[str, Any]):
-        """Atomically write configuration to file with file locking."""
+    def _file_stamp(self) -> Optional[tuple]:
+        """Identity of the file on disk, or None if it does not exist."""
+        try:
+            st = os.stat(self._config_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+    
+    def _remember(self, data: Dict[str, Any], stamp: Optional[tuple]):
+        """Store `data` as the snapshot matching the on-disk `stamp`."""
+        if not self._cache_enabled:
+            return
+        self._snapshot = _copy_json(data)
+        self._durable = self._snapshot
+        self._stamp = stamp
+        self._stale = False
+    
+    def invalidate(self):
+        """Drop the cached snapshot; the next read goes to disk."""
         with self._lock:
-            # Create temporary file in same directory
-            temp_fd, temp_path = tempfile.mkstemp(
-                dir=self._config_path.parent,
-                prefix=f"{self._config_path.name}.tmp"
-            )
-            
+            if self.dirty:
+                # Staged writes are the newest config; keep them
+                return
+            self._snapshot = None
+            self._stamp = None
+            self._stale = True
+    
+    def _mark_stale(self):
+        # Called from the watcher thread: no lock, a bool store is atomic
+        self._stale = True
+    
+    def start_watching(self) -> bool:
+        """Invalidate via inotify instead of stat() per read; False if unavailable."""
+        from app.utils import inotify
+        
+        with self._lock:
+            if self._watcher is not None and self._watcher.running:
+                return True
+            if not inotify.is_available():
+                return False
+            watcher = inotify.FileWatcher(self._config_path, self._mark_stale)
             try:
-                with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-                    # Acquire exclusive lock
-                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                    f.flush()
-                    os.fsync(f.fileno())
-                
-                # Atomic replace
-                os.replace(temp_path, self._config_path)
-                
+                watcher.start()
+            except OSError:
+                return False
+            self._watcher = watcher
+            # Anything may have changed before the watch was in place
+            self._stale = True
+            return True
+    
+    def stop_watching(self):
+        """Stop the inotify watcher and fall back to stat-based invalidation."""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+    
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.running
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], Any]):
+        """Call `listener(config)` whenever the configuration changes.
+        
+        Listeners run under the manager lock, in write order, and must not
+        block or call back into the manager.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+    
+    def _notify(self, config: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                listener(config)
             except Exception:
-                # Clean up temp file on error
-                try:
-                    os.unlink(temp_path)
-                except OSError:
-                    pass
-                raise
+                logger.exception("Configuration listener failed")
+    
+    @property
+    def dirty(self) -> bool:
+        """True while staged writes have not reached the file yet."""
+        return self._staged_seq > self._written_seq
+    
+    def _cached(self, staged: bool = False) -> Optional[Dict[str, Any]]:
+        """Return a copy of the snapshot if it still matches the file.
+        
+        With the ``always`` policy, pending writes are only visible with
+        `staged` (read-modify-write under the lock); plain reads get the
+        config last written to disk.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if self.dirty:
+            if not staged and self._fsync_policy == ConfigFsyncPolicy.ALWAYS and self._durable is not None:
+                return _copy_json(self._durable)
+            return _copy_json(snapshot)
+        if not self._cache_enabled:
+            return None
+        if self.watching:
+            if self._stale:
+                return None
+        elif self._file_stamp() != self._stamp:
+            return None
+        return _copy_json(snapshot)
+    
+    def _atomic_write(self, data: Dict[str, Any], fsync: bool = True):
+        """Atomically write configuration to file with file locking."""
+        # Create temporary file in same directory
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=self._config_path.parent,
+            prefix=f"{self._config_path.name}.tmp"
+        )
+        
+        try:
+            with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
+                # Acquire exclusive lock
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            
+            if self._write_delay_s:
+                time.sleep(self._write_delay_s)
+            
+            # Atomic replace
+            os.replace(temp_path, self._config_path)
+            
+        except Exception:
+            # Clean up temp file on error
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+    
+    def _stage(self, data: Dict[str, Any]) -> int:
+        """Apply `data` to the in-memory snapshot and return its write sequence number."""
+        with self._lock:
+            self._staged_seq += 1
+            self._snapshot = _copy_json(data)
+            self._stamp = None
+            self.write_stats["writes"] += 1
+            if self._fsync_policy == ConfigFsyncPolicy.ALWAYS:
+                # Published by _flush_staged once the write is on disk
+                self._unpublished.append((self._staged_seq, self._snapshot))
+            else:
+                self._notify(self._snapshot)
+            return self._staged_seq
+    
+    def _flush_staged(self):
+        """Write the newest staged config to disk. Caller holds _flush_lock."""
+        with self._lock:
+            if not self.dirty:
+                return
+            seq = self._staged_seq
+            data = self._snapshot
+        
+        try:
+            self._atomic_write(data, fsync=self._fsync_policy != ConfigFsyncPolicy.OFF)
+        except Exception as e:
+            with self._lock:
+                self.write_stats["flush_errors"] += 1
+                if self._fsync_policy == ConfigFsyncPolicy.ALWAYS:
+                    # Every write staged so far contains the failed state: fail them
+                    # all and fall back to the file, the last durable config
+                    self._failed_seq = self._written_seq = self._staged_seq
+                    self._failed_error = e
+                    self._unpublished = []
+                    self._snapshot = None
+                    self._durable = None
+                    self._stamp = None
+                    self._stale = True
+            raise
+        
+        stamp = self._file_stamp()
+        with self._lock:
+            self._written_seq = seq
+            self._durable_seq = seq
+            self._durable = data
+            self.write_stats["flushes"] += 1
+            while self._unpublished and self._unpublished[0][0] <= seq:
+                self._notify(self._unpublished.pop(0)[1])
+            if seq == self._staged_seq:
+                # Nothing newer was staged meanwhile: the snapshot is the file
+                self._stamp = stamp
+                self._stale = False
+                if not self._cache_enabled:
+                    self._snapshot = None
+    
+    def _commit(self, seq: int):
+        """Make write `seq` durable according to the fsync policy."""
+        if self._fsync_policy != ConfigFsyncPolicy.ALWAYS:
+            self._schedule_flush()
+            return
+        
+        with self._flush_lock:
+            # A flush that ran while we waited may already have written us...
+            if self._durable_seq >= seq:
+                return
+            # ...or failed with us in it
+            if self._failed_seq >= seq:
+                raise OSError(f"Configuration write failed: {self._failed_error}") from self._failed_error
+            # A failed write leaves the file as the source of truth and the caller sees the error
+            self._flush_staged()
+    
+    def _schedule_flush(self):
+        with self._lock:
+            if self._flush_timer is not None:
+                return
+            timer = threading.Timer(self._write_window_s, self._flush_from_timer)
+            timer.daemon = True
+            self._flush_timer = timer
+        timer.start()
+    
+    def _flush_from_timer(self):
+        with self._lock:
+            self._flush_timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f"Failed to flush configuration to {self._config_path}; retrying")
+            self._schedule_flush()
+    
+    def flush(self):
+        """Write any staged configuration to disk now."""
+        with self._flush_lock:
+            self._flush_staged()
     
     def read_config(self) -> Dict[str, Any]:
         """Read configuration from file, return default if not exists."""
+        config, seq = self._load()
+        if seq:
+            # Defaults were staged because the file was missing or corrupted
+            self._commit(seq)
+        return config
+    
+    def _load(self, staged: bool = False) -> Tuple[Dict[str, Any], int]:
+        """Return ``(config, seq)``; `seq` is non-zero if defaults had to be staged.
+        
+        `staged` includes writes not yet on disk (see `_cached`).
+        """
+        cached = self._cached(staged)
+        if cached is not None:
+            return cached, 0
+        
         with self._lock:
-            if not self._config_path.exists():
-                default_config = self._get_default_config()
-                self._atomic_write(default_config)
-                return default_config
+            # Another thread may have reloaded while we waited for the lock
+            cached = self._cached(staged)
+            if cached is not None:
+                return cached, 0
+            # Clear before reading so a change during the read re-triggers a reload
+            self._stale = False
             
-            try:
-                with open(self._config_path, 'r', encoding='utf-8') as f:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError) as e:
-                # Return default config if file is corrupted
+            if not self._config_path.exists():
                 default_config = self._get_default_config()
-                self._atomic_write(default_config)
-                return default_config
+                seq = self._stage(default_config)
+            else:
+                try:
+                    with open(self._config_path, 'r', encoding='utf-8') as f:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_SH)
+                        st = os.fstat(f.fileno())
+                        config = json.load(f)
+                    self._remember(config, (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size))
+                    self._notify(_copy_json(config))
+                    return config, 0
+                except (json.JSONDecodeError, OSError) as e:
+                    # Return default config if file is corrupted
+                    default_config = self._get_default_config()
+                    seq = self._stage(default_config)
+            return default_config, seq
     
-    def write_config(self, config: Dict[str, Any]):
-        """Write configuration to file."""
-        self._atomic_write(config)
+    def write_config(
+        self,
+        config: Dict[str, Any],
+        precondition: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Write configuration to file.
+        
+        Args:
+            config: Complete configuration to store
+            precondition: Optional callable run with the current config under
+                the write lock; its exceptions abort the write
+        """
+        if precondition is None:
+            self._commit(self._stage(config))
+            return
+        
+        with self._lock:
+            current_config, _ = self._load(staged=True)
+            precondition(current_config)
+            seq = self._stage(config)
+        
+        self._commit(seq)
     
-    def merge_config(self, partial_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Merge partial configuration with existing config."""
-        current_config = self.read_config()
-        current_config.update(partial_config)
-        return current_config
+    def merge_config(
+        self,
+        partial_config: Dict[str, Any],
+        validate: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+        precondition: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Atomically merge partial configuration into the current config and write it.
+        
+        Read, merge, validation and staging happen under one lock, so two
+        concurrent patches never lose each other's fields.
+        
+        Args:
+            partial_config: Fields to update
+            validate: Optional callable returning the validated config to store;
+                its exceptions abort the merge and leave the config unchanged
+            precondition: Optional callable run with the current config before
+                merging (e.g. an If-Match check); its exceptions abort the merge
+        
+        Returns:
+            The configuration as written
+        """
+        with self._lock:
+            # Staged defaults (if any) are superseded by the merge below
+            merged_config, _ = self._load(staged=True)
+            if precondition is not None:
+                precondition(merged_config)
+            merged_config.update(partial_config)
+            if validate is not None:
+                merged_config = validate(merged_config)
+            seq = self._stage(merged_config)
+        
+        self._commit(seq)
+        return merged_config
     
     def reset_config(self) -> Dict[str, Any]:
         """Reset configuration to default values."""
         default_config = self._get_default_config()
-        self._atomic_write(default_config)
+        self.write_config(default_config)
         return default_config
 
 
@@ -268,15 +781,104 @@ def get_local_config_manager() -> LocalConfigManager:
     """Get global LocalConfigManager instance."""
     global _local_config_manager
     if _local_config_manager is None:
-        _local_config_manager = LocalConfigManager()
+        settings = get_settings()
+        _local_config_manager = LocalConfigManager(
+            cache=settings.config_cache_enabled,
+            watch=settings.config_watch,
+            fsync_policy=settings.config_fsync,
+            write_window_ms=settings.config_write_window_ms,
+            write_delay_ms=settings.config_write_delay_ms,
+        )
     return _local_config_manager
 
 
+# Config file I/O (open/flock/json/fsync/rename) blocks. Async routes hand it
+# to this executor so a slow SD card never stalls the event loop, and with it
+# every SSE stream and control command served by the same worker.
+_config_executor: Optional[ThreadPoolExecutor] = None
+_config_executor_lock = threading.Lock()
+
+def get_config_executor() -> ThreadPoolExecutor:
+    """Get the dedicated executor for configuration I/O."""
+    global _config_executor
+    with _config_executor_lock:
+        if _config_executor is None:
+            _config_executor = ThreadPoolExecutor(
+                max_workers=max(1, get_settings().config_io_workers),
+                thread_name_prefix="config-io"
+            )
+        return _config_executor
+
+
+async def run_config_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking configuration call on the config executor and await it."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_config_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_config_executor():
+    """Wait for pending configuration I/O and stop the executor."""
+    global _config_executor
+    with _config_executor_lock:
+        executor, _config_executor = _config_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+class ConfigPreconditionFailed(Exception):
+    """Raised when an If-Match ETag does not match the current configuration."""
+    
+    def __init__(self, etag: str, version: int):
+        super().__init__(f"Configuration changed (current version {version}, ETag {etag})")
+        self.etag = etag
+        self.version = version
+
+
 class ConfigService:
-    """Service class for configuration operations with masking and validation."""
+    """Service class for configuration operations with masking and validation.
+    
+    Every configuration state is versioned through `feed` (see
+    app.services.config_feed): writes through this service, writes by other
+    components and external edits of the file all bump the version and wake
+    the watchers of GET /api/v1/config/watch.
+    """
     
     def __init__(self):
+        from app.services.config_feed import ConfigFeed
+        
         self.config_manager = get_local_config_manager()
+        self._schema: Optional[Dict[str, Any]] = None
+        self.feed = ConfigFeed()
+        self.config_manager.add_listener(self.feed.publish)
+    
+    def current_state(self) -> Tuple[int, Optional[str]]:
+        """
+        Get the current configuration version and ETag.
+        
+        Reading the configuration first picks up external edits of the file.
+        """
+        self.config_manager.read_config()
+        return self.feed.current()
+    
+    def _if_match(self, if_match: Optional[str]) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """Precondition enforcing an If-Match header against the current config."""
+        if if_match is None:
+            return None
+        from app.services.config_feed import config_etag, if_match_ok
+        
+        def check(current_config: Dict[str, Any]):
+            etag = config_etag(current_config)
+            if not if_match_ok(if_match, etag):
+                raise ConfigPreconditionFailed(etag, self.feed.version)
+        
+        return check
+    
+    def _versioned(self, config: Dict[str, Any]) -> Tuple[Dict[str, Any], int, str]:
+        from app.models.config import mask_sensitive_fields
+        from app.services.config_feed import config_etag
+        
+        etag = config_etag(config)
+        return mask_sensitive_fields(config), self.feed.version_of(etag), etag
     
     def get_config(self, include_secrets: bool = False) -> Dict[str, Any]:
         """
@@ -293,6 +895,29 @@ class ConfigService:
         config = self.config_manager.read_config()
         return mask_sensitive_fields(config, include_secrets)
     
+    def get_config_versioned(self, include_secrets: bool = False) -> Tuple[Dict[str, Any], int, Optional[str]]:
+        """
+        Get configuration together with its version and ETag.
+        
+        All three come from one `feed` snapshot, so a write landing between
+        reading the config and reading the version cannot pair them up wrong.
+        
+        Returns:
+            (configuration (masked unless `include_secrets`), version, ETag)
+        """
+        from app.models.config import mask_sensitive_fields
+        from app.services.config_feed import config_etag
+        
+        # Picks up external edits of the file and publishes them to the feed
+        config = self.config_manager.read_config()
+        version, etag, published = self.feed.snapshot()
+        if published is None:
+            # Nothing published yet (listener not called); version the read itself
+            etag = config_etag(config)
+            version = self.feed.version_of(etag)
+            published = config
+        return mask_sensitive_fields(_copy_json(published), include_secrets), version, etag
+    
     def put_config(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update entire configuration with validation.
@@ -306,16 +931,32 @@ class ConfigService:
         Raises:
             ValidationError: If validation fails
         """
-        from app.models.config import validate_config_data, mask_sensitive_fields
+        return self.put_config_versioned(config_data)[0]
+    
+    def put_config_versioned(
+        self,
+        config_data: Dict[str, Any],
+        if_match: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], int, str]:
+        """
+        Update entire configuration, optionally only if it still matches `if_match`.
+        
+        Returns:
+            (updated configuration (masked), version, ETag)
+        
+        Raises:
+            ValidationError: If validation fails
+            ConfigPreconditionFailed: If `if_match` does not match the current ETag
+        """
+        from app.models.config import validate_config_data
         
         # Validate configuration
-        validated_config = validate_config_data(config_data)
+        validated_config = validate_config_data(config_data).dict()
         
-        # Write to file
-        self.config_manager.write_config(validated_config.dict())
+        # Stage in memory; reaches disk according to the fsync policy
+        self.config_manager.write_config(validated_config, precondition=self._if_match(if_match))
         
-        # Return masked version
-        return mask_sensitive_fields(validated_config.dict())
+        return self._versioned(validated_config)
     
     def patch_config(self, partial_config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -330,19 +971,33 @@ class ConfigService:
         Raises:
             ValidationError: If validation fails
         """
-        from app.models.config import validate_config_data, mask_sensitive_fields
+        return self.patch_config_versioned(partial_config)[0]
+    
+    def patch_config_versioned(
+        self,
+        partial_config: Dict[str, Any],
+        if_match: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], int, str]:
+        """
+        Partially update configuration, optionally only if it still matches `if_match`.
         
-        # Merge with existing config
-        merged_config = self.config_manager.merge_config(partial_config)
+        Returns:
+            (updated configuration (masked), version, ETag)
         
-        # Validate merged configuration
-        validated_config = validate_config_data(merged_config)
+        Raises:
+            ValidationError: If validation fails
+            ConfigPreconditionFailed: If `if_match` does not match the current ETag
+        """
+        from app.models.config import validate_config_data
         
-        # Write to file
-        self.config_manager.write_config(validated_config.dict())
+        # Read, check, merge, validate and write as one atomic step
+        validated_config = self.config_manager.merge_config(
+            partial_config,
+            validate=lambda merged: validate_config_data(merged).dict(),
+            precondition=self._if_match(if_match)
+        )
         
-        # Return masked version
-        return mask_sensitive_fields(validated_config.dict())
+        return self._versioned(validated_config)
     
     def reset_config(self) -> Dict[str, Any]:
         """
@@ -351,10 +1006,16 @@ class ConfigService:
         Returns:
             Default configuration (masked)
         """
-        from app.models.config import mask_sensitive_fields
+        return self.reset_config_versioned()[0]
+    
+    def reset_config_versioned(self) -> Tuple[Dict[str, Any], int, str]:
+        """
+        Reset configuration to default values.
         
-        default_config = self.config_manager.reset_config()
-        return mask_sensitive_fields(default_config)
+        Returns:
+            (default configuration (masked), version, ETag)
+        """
+        return self._versioned(self.config_manager.reset_config())
     
     def get_schema(self) -> Dict[str, Any]:
         """
@@ -363,9 +1024,12 @@ class ConfigService:
         Returns:
             JSON Schema dictionary
         """
-        from app.models.config import get_config_schema
-        
-        return get_config_schema()
+        # The schema only depends on the LocalConfig model: build it once
+        if self._schema is None:
+            from app.models.config import get_config_schema
+            
+            self._schema = get_config_schema()
+        return _copy_json(self._schema)
 
 
 # Global service instance
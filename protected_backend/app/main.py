@@ -9,16 +9,15 @@ import asyncio
 import logging
 import os
 import sys
-from pathlib import Path
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from app.config import get_settings
 from app.utils.errors import TurbopiError
+from app.utils.json_codec import get_response_class
 from app.utils.logging import setup_logging
 from app.utils.responses import create_error_response
 
@@ -33,10 +32,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info(f"Starting Turbopi Backend in {settings.runtime_mode} mode")
     logger.info(f"Service will be advertised on port {settings.port}")
     
-    # Initialize runtime manager
-    from app.services.runtime import get_runtime_manager
-    runtime_manager = get_runtime_manager()
-    await runtime_manager.initialize()
+    # Initialize runtime manager (HTTP workers relay hardware routes to the owner process)
+    from app.config import ProcessRole
+    owns_hardware = settings.process_role != ProcessRole.HTTP
+    if owns_hardware:
+        from app.services.runtime import get_runtime_manager
+        runtime_manager = get_runtime_manager()
+        await runtime_manager.initialize()
+        from app.services.frame_cache import start_frame_cache, stop_frame_cache
+        start_frame_cache(runtime_manager)
+    else:
+        logger.info(f"HTTP worker: relaying hardware routes to {settings.hardware_socket}")
+    
+    # Warm the config snapshot and the cached JSON Schema before the first request.
+    # HTTP workers relay /api/v1/config to the owner and never touch the file.
+    from app.config import get_config_service, shutdown_config_executor
+    if owns_hardware:
+        config_service = get_config_service()
+        config_service.config_manager.read_config()
+        config_service.get_schema()
     
     # TODO: Initialize Zeroconf service discovery
     
@@ -46,7 +60,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     logger.info("Shutting down Turbopi Backend")
     
     # Cleanup runtime manager
-    await runtime_manager.cleanup()
+    if owns_hardware:
+        stop_frame_cache()
+        await runtime_manager.cleanup()
+    else:
+        from app.middleware.hardware_proxy import close_hardware_proxies
+        await close_hardware_proxies()
+    shutdown_config_executor()
+    if owns_hardware:
+        config_service.config_manager.stop_watching()
+        config_service.config_manager.flush()
     
     # TODO: Cleanup Zeroconf service
 
@@ -58,13 +81,45 @@ def create_app() -> FastAPI:
     # Setup logging
     setup_logging(settings.log_level)
     
+    # The Coze service resolves its base URL from COZE_API_BASE on every call
+    if settings.coze_api_base:
+        os.environ["COZE_API_BASE"] = settings.coze_api_base
+    
+    # orjson-backed JSONResponse when enabled and installed (large base64 snapshots, frequent polling)
+    response_class = get_response_class(settings.fast_json)
+    
     app = FastAPI(
         title="Turbopi Control Backend",
         description="ROS2-compatible control backend with Zeroconf discovery",
         version="0.1.0",
         lifespan=lifespan,
+        default_response_class=response_class,
     )
     
+    # Resumable SSE: event ids + per-stream replay buffer for Last-Event-ID reconnects
+    from app.middleware.sse_replay import ResumableSSEMiddleware
+    app.add_middleware(
+        ResumableSSEMiddleware,
+        max_events=settings.sse_replay_max_events,
+        ttl_s=settings.sse_replay_ttl_s,
+        max_streams=settings.sse_replay_max_streams,
+    )
+    
+    # Content-addressed Coze upload cache: identical bytes reuse their file_id
+    if settings.file_id_cache_enabled:
+        from app.middleware.upload_cache import FileIdCacheMiddleware
+        from app.services.file_id_cache import get_file_id_cache
+        app.add_middleware(
+            FileIdCacheMiddleware,
+            cache=get_file_id_cache(),
+            max_bytes=settings.file_id_cache_max_upload_mb * 1024 * 1024,
+        )
+    
+    # ETag / Cache-Control / 304 for read-mostly GET routes
+    if settings.etag_enabled:
+        from app.middleware.etag import ConditionalGetMiddleware
+        app.add_middleware(ConditionalGetMiddleware)
+    
     # CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -74,10 +129,30 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    # Multi-worker deployment: relay hardware/config routes and the resumable
+    # SSE routes (whose replay buffers must live in one process) to the owner
+    from app.config import ProcessRole
+    if settings.process_role == ProcessRole.HTTP:
+        from app.middleware.hardware_proxy import OWNER_PATH_PREFIXES, HardwareProxyMiddleware
+        from app.server import hardware_socket_path
+        app.add_middleware(
+            HardwareProxyMiddleware,
+            socket_path=hardware_socket_path(settings),
+            prefixes=OWNER_PATH_PREFIXES,
+        )
+    
+    # Trace id, Private Network Access preflight and Server-Timing (outermost)
+    from app.middleware.request_context import RequestContextMiddleware
+    app.add_middleware(
+        RequestContextMiddleware,
+        server_timing=settings.server_timing,
+        slow_request_ms=settings.slow_request_ms,
+    )
+    
     # Global exception handler
     @app.exception_handler(TurbopiError)
     async def turbopi_exception_handler(request: Request, exc: TurbopiError):
-        return JSONResponse(
+        return response_class(
             status_code=exc.status_code,
             content=create_error_response(
                 code=exc.error_code,
@@ -92,7 +167,7 @@ def create_app() -> FastAPI:
         logger = logging.getLogger(__name__)
         logger.exception("Unhandled exception occurred")
         
-        return JSONResponse(
+        return response_class(
             status_code=500,
             content=create_error_response(
                 code="INTERNAL_ERROR",
@@ -103,18 +178,21 @@ def create_app() -> FastAPI:
     
     # Register API routers
     from app.api import status, control, coze_conversations, coze_audio, coze_bots, coze_workspace, coze_files, coze_image, coze_transcriptions, camera, buzzer
-    from app.routers import config
+    from app.routers import config, coze_file_cache, batch, camera_frames
     app.include_router(status.router, prefix="/status", tags=["status"])
     app.include_router(control.router, prefix="/control", tags=["control"])
     app.include_router(config.router, prefix="/api/v1", tags=["configuration"])
+    app.include_router(batch.router, prefix="/api/v1", tags=["batch"])
     app.include_router(coze_conversations.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_audio.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_transcriptions.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_bots.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_workspace.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_files.router, prefix="/api/v1", tags=["llm"])
+    app.include_router(coze_file_cache.router, prefix="/api/v1", tags=["llm"])
     app.include_router(coze_image.router, prefix="/api/v1", tags=["llm"])
     app.include_router(camera.router, prefix="/api/v1", tags=["camera"])
+    app.include_router(camera_frames.router, prefix="/api/v1", tags=["camera"])
     app.include_router(buzzer.router, prefix="/api/v1", tags=["control"])
     
     # TODO: Register remaining routers
@@ -123,69 +201,15 @@ def create_app() -> FastAPI:
     # app.include_router(llm.router, prefix="/llm", tags=["llm"])
     # app.include_router(exec.router, prefix="/exec", tags=["exec"])
     
-    # Add trace_id middleware
-    @app.middleware("http")
-    async def add_trace_id_middleware(request: Request, call_next):
-        from app.utils.logging import set_trace_id
-        import uuid
-        
-        # Get or generate trace_id
-        trace_id = request.headers.get("X-Trace-ID") or str(uuid.uuid4())
-        set_trace_id(trace_id)
-        
-        # Store in request state for access in handlers
-        request.state.trace_id = trace_id
-        
-        response = await call_next(request)
-        
-        # Add trace_id to response headers
-        response.headers["X-Trace-ID"] = trace_id
-
-        return response
-
-    # Private Network Access (PNA) preflight compatibility
-    # Some browsers require Access-Control-Allow-Private-Network for HTTPS origins
-    # accessing private network resources (e.g., 192.168.x.x). Add the header
-    # when the request indicates a private-network preflight.
-    @app.middleware("http")
-    async def private_network_access_middleware(request: Request, call_next):
-        response = await call_next(request)
-
-        try:
-            if request.method == "OPTIONS":
-                req_pna = request.headers.get("Access-Control-Request-Private-Network")
-                if req_pna and req_pna.lower() == "true":
-                    response.headers["Access-Control-Allow-Private-Network"] = "true"
-        except Exception:
-            # Be permissive: do not block the response even if header handling fails
-            pass
-
-        return response
-    
     return app
 
 
 def main():
     """Main entry point for running the application."""
-    settings = get_settings()
+    from app.server import run
     
-    import uvicorn
-    
-    # Avoid relying on current working directory for reload; explicitly set watched dirs
-    reload_dirs = None
-    if settings.debug:
-        # Watch the backend app directory explicitly to prevent Path.cwd() issues
-        reload_dirs = [str(Path(__file__).resolve().parent)]
-
-    uvicorn.run(
-        "app.main:create_app",
-        factory=True,
-        host=settings.host,
-        port=settings.port,
-        log_level=settings.log_level.lower(),
-        reload=settings.debug,
-        reload_dirs=reload_dirs,
-    )
+    # Single process, or hardware owner + HTTP workers (TURBOPI_WORKERS > 1)
+    run(get_settings())
 
 
 # Create app instance for uvicorn
@@ -0,0 +1,5 @@
+"""
+ASGI middleware for the Turbopi Backend.
+
+Pure ASGI middleware classes registered by `app.main.create_app`.
+"""
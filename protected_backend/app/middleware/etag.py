@@ -0,0 +1,135 @@
+"""
+Conditional GET support for read-mostly routes.
+
+Voice lists, bot metadata, the config schema, the runtime mode and the workspace
+id almost never change, yet UIs poll them constantly. For those routes the JSON
+body is fingerprinted into a weak ``ETag`` (ignoring per-request fields such as
+``trace_id``), a ``Cache-Control: private, max-age=N`` header is added, and a
+request whose ``If-None-Match`` matches the current ETag is answered with an
+empty ``304 Not Modified``.
+"""
+
+import hashlib
+import json
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.asgi import get_header
+
+
+# (path pattern, max-age seconds)
+CACHEABLE_ROUTES: Tuple[Tuple[str, int], ...] = (
+    (r"/api/v1/coze/audio/voices", 300),
+    (r"/api/v1/coze/bots/list", 60),
+    (r"/api/v1/coze/bots/[^/]+", 60),
+    (r"/api/v1/config/schema", 3600),
+    (r"/api/v1/coze/workspace/id", 30),
+    (r"/status/mode", 3600),
+)
+
+# Top-level response fields that differ on every request and must not change the ETag.
+VOLATILE_FIELDS = frozenset({"trace_id", "timestamp"})
+
+
+def compute_etag(body: bytes) -> str:
+    """Weak ETag of a JSON response body, ignoring `VOLATILE_FIELDS`."""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if isinstance(payload, dict):
+        stable = {k: v for k, v in payload.items() if k not in VOLATILE_FIELDS}
+        body = json.dumps(stable, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return 'W/"%s"' % hashlib.sha1(body).hexdigest()[:20]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of `etag` against an ``If-None-Match`` header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    """Add ``ETag``/``Cache-Control`` to read-mostly routes and answer ``If-None-Match`` with 304."""
+
+    def __init__(self, app: ASGIApp, routes: Iterable[Tuple[str, int]] = CACHEABLE_ROUTES):
+        self.app = app
+        self.routes: List[Tuple[Pattern[str], int]] = [(re.compile(p + r"/?"), age) for p, age in routes]
+
+    def _max_age(self, path: str) -> Optional[int]:
+        for pattern, max_age in self.routes:
+            if pattern.fullmatch(path):
+                return max_age
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        max_age = self._max_age(scope["path"])
+        if max_age is None:
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = get_header(scope, b"if-none-match")
+        start: Optional[Message] = None
+        parts: List[bytes] = []
+
+        async def buffered_send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            await self._finish(start, b"".join(parts), max_age, if_none_match, send)
+
+        await self.app(scope, receive, buffered_send)
+
+    async def _finish(
+        self,
+        start: Message,
+        body: bytes,
+        max_age: int,
+        if_none_match: Optional[str],
+        send: Send,
+    ) -> None:
+        etag = compute_etag(body)
+        headers = [
+            (k, v) for k, v in start.get("headers", [])
+            if k.lower() not in (b"etag", b"cache-control")
+        ]
+        cache_headers = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", b"private, max-age=%d" % max_age),
+        ]
+        if etag_matches(if_none_match, etag):
+            # 304 carries no body, so drop the entity headers of the 200 it replaces.
+            headers = [
+                (k, v) for k, v in headers
+                if k.lower() not in (b"content-length", b"content-type")
+            ]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + cache_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": headers + cache_headers})
+        await send({"type": "http.response.body", "body": body, "more_body": False})
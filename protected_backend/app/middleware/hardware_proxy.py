@@ -0,0 +1,186 @@
+"""
+Forward hardware routes from an HTTP worker to the hardware-owner process.
+
+In the multi-worker deployment (see app.server) only the hardware-owner process
+holds the ROS/runtime manager, the local config service and its change feed.
+HTTP workers serve the stateless routes (Coze streaming, uploads, JSON encoding)
+themselves and relay control, camera, buzzer, status, batch and config requests
+to the owner over its Unix domain socket. The resumable Coze SSE routes are
+relayed too: their replay buffers (app.middleware.sse_replay) live in the owner,
+so a ``Last-Event-ID`` reconnect finds its stream whichever worker takes it. Request bodies are small and read
+whole; response bodies are streamed back chunk by chunk, so streaming routes
+work through the relay too.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Iterable, List, Optional, Tuple
+
+import httpx
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.middleware.sse_replay import RESUMABLE_SSE_PATHS
+from app.services.config_feed import WATCH_MAX_TIMEOUT_S
+from app.utils.responses import create_error_response
+
+logger = logging.getLogger(__name__)
+
+HARDWARE_PATH_PREFIXES: Tuple[str, ...] = (
+    "/control",
+    "/status",
+    "/api/v1/buzzer",
+    "/api/v1/camera",
+    "/api/v1/config",
+    "/api/v1/batch",
+)
+
+# Everything an HTTP worker relays (see app.main)
+OWNER_PATH_PREFIXES: Tuple[str, ...] = HARDWARE_PATH_PREFIXES + tuple(sorted(RESUMABLE_SSE_PATHS))
+
+# Connection-level headers that must not be relayed in either direction
+HOP_BY_HOP = frozenset({
+    b"connection", b"keep-alive", b"proxy-connection", b"transfer-encoding",
+    b"te", b"trailer", b"upgrade", b"host",
+})
+
+TRACE_HEADER = b"x-trace-id"
+
+# Slack on top of the longest config long-poll, so the relay never times out first
+PROXY_TIMEOUT_MARGIN_S = 10.0
+
+_instances: "weakref.WeakSet[HardwareProxyMiddleware]" = weakref.WeakSet()
+
+
+class HardwareProxyMiddleware:
+    """Relay requests under `prefixes` to the hardware owner listening on `socket_path`."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        socket_path: str,
+        prefixes: Iterable[str] = HARDWARE_PATH_PREFIXES,
+        timeout_s: Optional[float] = None,
+        max_connections: int = 32,
+    ):
+        self.app = app
+        self.socket_path = socket_path
+        self.prefixes = tuple(prefixes)
+        self.timeout_s = timeout_s if timeout_s is not None else WATCH_MAX_TIMEOUT_S + PROXY_TIMEOUT_MARGIN_S
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        _instances.add(self)
+
+    def _forwarded(self, path: str) -> bool:
+        for prefix in self.prefixes:
+            if path == prefix or path.startswith(prefix + "/"):
+                return True
+        return False
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily: the middleware is built before the worker's event loop runs
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    uds=self.socket_path,
+                    limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                ),
+                base_url="http://hardware-owner",
+                timeout=httpx.Timeout(self.timeout_s, connect=5.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._forwarded(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        parts: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            parts.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+
+        # Stop relaying (and close the upstream stream) as soon as the client goes away
+        relay = asyncio.ensure_future(self._relay(scope, b"".join(parts), send))
+        disconnect = asyncio.ensure_future(_wait_disconnect(receive))
+        try:
+            await asyncio.wait({relay, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (relay, disconnect):
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(relay, disconnect, return_exceptions=True)
+        if relay.done() and not relay.cancelled() and relay.exception() is not None:
+            raise relay.exception()
+
+    async def _relay(self, scope: Scope, body: bytes, send: Send) -> None:
+        headers = [(k, v) for k, v in scope["headers"] if k.lower() not in HOP_BY_HOP and k.lower() != TRACE_HEADER]
+        state = scope.get("state") or {}
+        # The owner logs and answers under the same trace id as this worker
+        trace_id = state.get("trace_id")
+        if trace_id:
+            headers.append((TRACE_HEADER, trace_id.encode("latin-1")))
+        target = scope.get("raw_path") or scope["path"].encode("utf-8")
+        if scope.get("query_string"):
+            target += b"?" + scope["query_string"]
+        request = self.client.build_request(
+            scope["method"],
+            target.decode("latin-1"),
+            headers=headers,
+            content=body,
+        )
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.TransportError as e:
+            logger.warning(f"Hardware owner unreachable at {self.socket_path}: {e}")
+            error = JSONResponse(
+                status_code=503,
+                content=create_error_response(
+                    code="HARDWARE_OWNER_UNAVAILABLE",
+                    message="The hardware owner process is not reachable",
+                    details={"error": str(e)},
+                    trace_id=state.get("trace_id"),
+                ),
+            )
+            await error(scope, _no_receive, send)
+            return
+
+        try:
+            start: Message = {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": [(k, v) for k, v in response.headers.raw if k.lower() not in HOP_BY_HOP],
+            }
+            await send(start)
+            async for chunk in response.aiter_raw():
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            await response.aclose()
+
+
+async def close_hardware_proxies() -> None:
+    """Close the relay connections of every proxy in this process (worker shutdown)."""
+    for proxy in list(_instances):
+        await proxy.aclose()
+
+
+async def _wait_disconnect(receive: Receive) -> None:
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def _no_receive() -> Message:
+    return {"type": "http.disconnect"}
@@ -0,0 +1,84 @@
+"""
+Per-request context: trace id, Private Network Access preflight and timing.
+
+Replaces the two ``@app.middleware("http")`` functions that used to live in
+`app.main.create_app`. Those ran every request, SSE streams included, through
+two ``BaseHTTPMiddleware`` layers, each adding a task and a memory stream between
+the server and the app. This single pure ASGI middleware only rewrites the
+``http.response.start`` message and passes every body chunk straight through:
+
+- ``X-Trace-ID`` is taken from the request (or generated), stored in the log
+  context and ``request.state.trace_id``, and echoed on the response;
+- an ``OPTIONS`` request carrying ``Access-Control-Request-Private-Network: true``
+  gets ``Access-Control-Allow-Private-Network: true`` (needed by browsers when an
+  HTTPS page calls the robot's 192.168.x.x address);
+- ``Server-Timing: app;dur=<ms>`` reports the time until the response headers
+  were sent; when ``slow_request_ms`` is set, requests whose headers took longer
+  are logged (streams are not penalised for their length).
+"""
+
+import logging
+import time
+import uuid
+from typing import List, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.asgi import get_header
+from app.utils.logging import set_trace_id
+
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = b"x-trace-id"
+PNA_REQUEST_HEADER = b"access-control-request-private-network"
+PNA_ALLOW_HEADER = b"access-control-allow-private-network"
+SERVER_TIMING_HEADER = b"server-timing"
+
+
+class RequestContextMiddleware:
+    """Inject ``X-Trace-ID``, answer private-network preflights and record timing."""
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, slow_request_ms: int = 0):
+        self.app = app
+        self.server_timing = server_timing
+        self.slow_request_s = slow_request_ms / 1000.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        trace_id = get_header(scope, TRACE_HEADER) or str(uuid.uuid4())
+        set_trace_id(trace_id)
+        # Backing store of request.state for every Request built on this scope
+        scope.setdefault("state", {})["trace_id"] = trace_id
+
+        extra: List[Tuple[bytes, bytes]] = [(TRACE_HEADER, trace_id.encode("latin-1"))]
+        if scope["method"] == "OPTIONS":
+            pna = get_header(scope, PNA_REQUEST_HEADER)
+            if pna and pna.lower() == "true":
+                extra.append((PNA_ALLOW_HEADER, b"true"))
+                # Newer Starlette CORSMiddleware rejects private-network preflights
+                # unless configured for them; answer them here on every version.
+                scope = dict(scope, headers=[h for h in scope["headers"] if h[0].lower() != PNA_REQUEST_HEADER])
+        replaced = {name for name, _ in extra}
+        if self.server_timing:
+            replaced.add(SERVER_TIMING_HEADER)
+
+        async def send_with_context(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - started
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() not in replaced]
+                headers.extend(extra)
+                if self.server_timing:
+                    headers.append((SERVER_TIMING_HEADER, b"app;dur=%.1f" % (elapsed * 1000)))
+                message = dict(message, headers=headers)
+                if self.slow_request_s and elapsed >= self.slow_request_s:
+                    logger.info(
+                        f"Slow request {scope['method']} {scope['path']} -> {message['status']} "
+                        f"in {elapsed * 1000:.0f} ms (trace_id={trace_id})"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_with_context)
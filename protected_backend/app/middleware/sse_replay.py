@@ -0,0 +1,367 @@
+"""
+Resumable Server-Sent Events for the Coze streaming routes.
+
+Every SSE event emitted on a resumable route is tagged with an id of the form
+``<stream_id>:<seq>`` and kept in a short, bounded per-stream replay buffer.
+The upstream generation runs detached from the client connection, so when the
+robot's Wi-Fi drops mid-answer the client can reconnect to the same route with a
+``Last-Event-ID`` header and receive the missed events (and the rest of the
+answer) instead of asking the bot again.
+
+A generation nobody reads is not kept alive: it is cancelled when its stream is
+evicted from the registry, or once it has had no attached client for ``ttl_s``.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Deque, Iterable, List, Optional, Set, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils import json_codec
+from app.utils.asgi import get_header
+from app.utils.responses import create_error_response
+
+logger = logging.getLogger(__name__)
+
+RESUMABLE_SSE_PATHS = frozenset({
+    "/api/v1/coze/conversations/stream",
+    "/api/v1/coze/conversations/stream/plugins",
+    "/api/v1/coze/audio/chat/stream",
+    "/api/v1/coze/image/chat/stream",
+})
+
+STREAM_ID_HEADER = "X-SSE-Stream-ID"
+STREAM_EXPIRED_CODE = "SSE_STREAM_EXPIRED"
+
+
+class ReplayGapError(Exception):
+    """Raised when requested events were already evicted from the replay buffer."""
+
+
+class ReplayStream:
+    """Bounded buffer of encoded SSE frames for one generation."""
+
+    def __init__(self, stream_id: str, max_events: int):
+        self.stream_id = stream_id
+        self.events: Deque[Tuple[int, bytes]] = deque(maxlen=max_events)
+        self.last_seq = 0
+        self.done = False
+        self.finished_at: Optional[float] = None
+        self.producer: Optional["asyncio.Task[None]"] = None
+        self.readers = 0
+        self.detached_at: Optional[float] = time.monotonic()
+        self._cond = asyncio.Condition()
+
+    def cancel(self) -> None:
+        """Stop the upstream generation if it is still running."""
+        if self.producer is not None and not self.producer.done():
+            self.producer.cancel()
+
+    def encode(self, seq: int, frame: bytes) -> bytes:
+        return b"id: %s:%d\n%s\n\n" % (self.stream_id.encode("ascii"), seq, frame)
+
+    async def append(self, frame: bytes) -> None:
+        async with self._cond:
+            self.last_seq += 1
+            self.events.append((self.last_seq, self.encode(self.last_seq, frame)))
+            self._cond.notify_all()
+
+    async def finish(self) -> None:
+        async with self._cond:
+            self.done = True
+            self.finished_at = time.monotonic()
+            self._cond.notify_all()
+
+    def can_resume(self, after_seq: int) -> bool:
+        """True if every event after `after_seq` is still buffered (or not yet produced)."""
+        if after_seq >= self.last_seq:
+            return True
+        return bool(self.events) and self.events[0][0] <= after_seq + 1
+
+    async def iter_after(self, after_seq: int) -> AsyncIterator[bytes]:
+        """Yield encoded frames with seq > `after_seq`, following the live stream until it ends."""
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(lambda: self.last_seq > after_seq or self.done)
+                if not self.can_resume(after_seq):
+                    raise ReplayGapError(f"{self.stream_id}: events after {after_seq} were evicted")
+                pending = [(seq, data) for seq, data in self.events if seq > after_seq]
+                done = self.done
+            for seq, data in pending:
+                after_seq = seq
+                yield data
+            if done:
+                return
+
+
+class ReplayRegistry:
+    """Live and recently finished streams, bounded in count and age."""
+
+    def __init__(self, max_events: int, ttl_s: float, max_streams: int):
+        self.max_events = max_events
+        self.ttl_s = ttl_s
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[str, ReplayStream]" = OrderedDict()
+
+    def create(self) -> ReplayStream:
+        self.purge()
+        stream = ReplayStream(uuid.uuid4().hex, self.max_events)
+        self._streams[stream.stream_id] = stream
+        return stream
+
+    def get(self, stream_id: str) -> Optional[ReplayStream]:
+        self.purge()
+        return self._streams.get(stream_id)
+
+    def purge(self) -> None:
+        now = time.monotonic()
+        for sid, stream in list(self._streams.items()):
+            if stream.done and now - (stream.finished_at or now) > self.ttl_s:
+                del self._streams[sid]
+        # Over capacity: drop the oldest finished streams first, then the oldest overall.
+        while len(self._streams) >= self.max_streams:
+            victim = next((sid for sid, s in self._streams.items() if s.done), None)
+            if victim is None:
+                victim = next(iter(self._streams))
+                logger.info(f"Evicting live SSE stream {victim}; cancelling its generation")
+            self._streams.pop(victim).cancel()
+
+
+def parse_last_event_id(value: str) -> Optional[Tuple[str, int]]:
+    """Split ``<stream_id>:<seq>``; None if the header is not one of ours."""
+    stream_id, sep, seq = value.strip().rpartition(":")
+    if not sep or not stream_id or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
+# A blank line: two line terminators, each "\r\n", "\r" or "\n" (as SSEParser accepts)
+_EVENT_END = re.compile(rb"(?:\r\n|\r(?!\n)|\n)(?:\r\n|\r(?!\n)|\n)")
+
+
+class _FrameSplitter:
+    """Incrementally split the route's SSE output into frames (blank-line terminated)."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._scan = 0
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        buf = self._buf
+        buf += chunk
+        frames: List[bytes] = []
+        start = 0
+        # Resume a few bytes early so a terminator split across chunks is still found.
+        pos = max(self._scan - 3, 0)
+        while (match := _EVENT_END.search(buf, pos)) is not None:
+            # A trailing "\r" may be the first half of a "\r\n" still in flight
+            if match.end() == len(buf) and buf.endswith(b"\r"):
+                break
+            frame = bytes(buf[start:match.start()]).strip(b"\r\n")
+            if frame:
+                frames.append(frame)
+            start = pos = match.end()
+        if start:
+            del buf[:start]
+        self._scan = len(buf)
+        return frames
+
+    def flush(self) -> List[bytes]:
+        frame = bytes(self._buf).strip(b"\r\n")
+        self._buf.clear()
+        self._scan = 0
+        return [frame] if frame else []
+
+
+class ResumableSSEMiddleware:
+    """Tag SSE events with ids and serve ``Last-Event-ID`` reconnects from a replay buffer."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str] = RESUMABLE_SSE_PATHS,
+        max_events: int = 512,
+        ttl_s: float = 120.0,
+        max_streams: int = 64,
+    ):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.registry = ReplayRegistry(max_events=max_events, ttl_s=ttl_s, max_streams=max_streams)
+        # How long a generation keeps running with no client attached
+        self.detach_grace_s = ttl_s
+        self._producers: Set["asyncio.Task[None]"] = set()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        last_event_id = get_header(scope, b"last-event-id")
+        if last_event_id:
+            await self._resume(scope, receive, send, last_event_id)
+        else:
+            await self._start(scope, receive, send)
+
+    async def _resume(self, scope: Scope, receive: Receive, send: Send, last_event_id: str) -> None:
+        parsed = parse_last_event_id(last_event_id)
+        stream = self.registry.get(parsed[0]) if parsed else None
+        if stream is None or not stream.can_resume(parsed[1]):
+            response = JSONResponse(
+                status_code=410,
+                content=create_error_response(
+                    code=STREAM_EXPIRED_CODE,
+                    message="Stream can no longer be resumed; start a new request",
+                    details={"last_event_id": last_event_id},
+                ),
+            )
+            await response(scope, receive, send)
+            return
+        logger.info(f"Resuming SSE stream {stream.stream_id} after event {parsed[1]}")
+        await self._forward(stream, parsed[1], receive, send)
+
+    async def _start(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Buffer the request body so the detached generation never touches the
+        # client connection again.
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        stream = self.registry.create()
+        first: "asyncio.Future[Message]" = asyncio.get_running_loop().create_future()
+        passthrough: "asyncio.Queue[Optional[Message]]" = asyncio.Queue()
+        closed = asyncio.Event()
+        body_sent = False
+        resumable = False
+        splitter = _FrameSplitter()
+
+        async def app_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": bytes(body), "more_body": False}
+            await closed.wait()
+            return {"type": "http.disconnect"}
+
+        async def app_send(message: Message) -> None:
+            nonlocal resumable
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                resumable = message["status"] == 200 and content_type.startswith(b"text/event-stream")
+                first.set_result(message)
+            elif not resumable:
+                await passthrough.put(message)
+            elif message["type"] == "http.response.body":
+                for frame in splitter.feed(message.get("body", b"")):
+                    await stream.append(frame)
+
+        async def produce() -> None:
+            try:
+                await self.app(scope, app_receive, app_send)
+            except asyncio.CancelledError as exc:
+                if not first.done():
+                    first.set_exception(exc)
+                logger.info(f"SSE stream {stream.stream_id} generation cancelled")
+            except BaseException as exc:
+                if not first.done():
+                    first.set_exception(exc)
+                else:
+                    logger.exception(f"SSE stream {stream.stream_id} failed after response start")
+            finally:
+                for frame in splitter.flush():
+                    await stream.append(frame)
+                await stream.finish()
+                await passthrough.put(None)
+                closed.set()
+
+        task = asyncio.create_task(produce())
+        stream.producer = task
+        self._producers.add(task)
+        task.add_done_callback(self._producers.discard)
+
+        start = await first
+        if not resumable:
+            await send(start)
+            while (message := await passthrough.get()) is not None:
+                await send(message)
+            return
+
+        headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"content-length"]
+        headers.append((STREAM_ID_HEADER.lower().encode("latin-1"), stream.stream_id.encode("latin-1")))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await self._forward(stream, 0, receive, send, started=True)
+
+    async def _forward(self, stream: ReplayStream, after_seq: int, receive: Receive, send: Send, started: bool = False) -> None:
+        if not started:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream; charset=utf-8"),
+                    (b"cache-control", b"no-cache"),
+                    (STREAM_ID_HEADER.lower().encode("latin-1"), stream.stream_id.encode("latin-1")),
+                ],
+            })
+
+        async def pump() -> None:
+            try:
+                async for data in stream.iter_after(after_seq):
+                    await send({"type": "http.response.body", "body": data, "more_body": True})
+            except ReplayGapError:
+                logger.warning(f"SSE stream {stream.stream_id} outran its replay buffer")
+                # Headers are already sent, so report the gap in-band instead of ending
+                # as if the answer were complete. No `id:`, so Last-Event-ID stays put.
+                error = create_error_response(
+                    code=STREAM_EXPIRED_CODE,
+                    message="Events were evicted from the replay buffer; start a new request",
+                    details={"stream_id": stream.stream_id},
+                )
+                await send({
+                    "type": "http.response.body",
+                    "body": b"event: error\ndata: " + json_codec.dumps(error) + b"\n\n",
+                    "more_body": True,
+                })
+            except OSError:
+                # Client went away mid-send; it may come back with Last-Event-ID.
+                return
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        async def watch_disconnect() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        pump_task = asyncio.create_task(pump())
+        watch_task = asyncio.create_task(watch_disconnect())
+        stream.readers += 1
+        stream.detached_at = None
+        try:
+            await asyncio.wait({pump_task, watch_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # The generation keeps filling the buffer even if this client went away,
+            # for a grace period in which it may come back with Last-Event-ID.
+            for task in (pump_task, watch_task):
+                task.cancel()
+            await asyncio.gather(pump_task, watch_task, return_exceptions=True)
+            stream.readers -= 1
+            if stream.readers == 0 and not stream.done:
+                stream.detached_at = time.monotonic()
+                asyncio.get_running_loop().call_later(
+                    self.detach_grace_s, self._cancel_if_abandoned, stream, stream.detached_at
+                )
+
+    def _cancel_if_abandoned(self, stream: ReplayStream, detached_at: float) -> None:
+        # Still detached since `detached_at`: nobody resumed during the grace period
+        if stream.readers or stream.done or stream.detached_at != detached_at:
+            return
+        logger.info(f"SSE stream {stream.stream_id} has no client; cancelling its generation")
+        stream.cancel()
@@ -0,0 +1,181 @@
+"""
+Deduplicated Coze file uploads.
+
+`/api/v1/coze/files/upload` is answered from the content-addressed file_id cache
+(`app.services.file_id_cache`) when the same bytes were uploaded before, so a
+client that re-sends the same picture on every turn pays the upstream Coze
+upload only once. On a miss the request goes to the regular route and the
+returned `file_id` is recorded. Bodies over `max_bytes`, including chunked ones
+without a Content-Length, are streamed to the route uncached.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import List, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.file_id_cache import FileIdCache, sha256_hex
+from app.utils.asgi import get_header
+from app.utils.responses import create_success_response
+
+logger = logging.getLogger(__name__)
+
+CACHED_UPLOAD_PATHS = frozenset({
+    "/api/v1/coze/files/upload",
+})
+
+CACHE_STATUS_HEADER = "X-File-Cache"
+
+# `name="file"` in a Content-Disposition header, but not `filename="file"`
+_FILE_FIELD = re.compile(r'(?:^|[;\s])name="file"')
+
+
+class FileIdCacheMiddleware:
+    """Serve repeated uploads of identical bytes from the file_id cache."""
+
+    def __init__(self, app: ASGIApp, cache: FileIdCache, max_bytes: int = 32 * 1024 * 1024, paths=CACHED_UPLOAD_PATHS):
+        self.app = app
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        content_type = get_header(scope, b"content-type") or ""
+        length = get_header(scope, b"content-length")
+        boundary = _boundary(content_type)
+        if not content_type.startswith("multipart/form-data") or not boundary or (length and int(length) > self.max_bytes):
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the body once: it is needed both for hashing and for the route on a miss.
+        # Chunked uploads have no Content-Length, so the limit is enforced while reading.
+        chunks: List[bytes] = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            received += len(chunk)
+            more_body = message.get("more_body", False)
+            if more_body and received > self.max_bytes:
+                # Too large to cache: hand what we have plus the rest of the stream to the route
+                await self.app(scope, _prepend(b"".join(chunks), receive), send)
+                return
+        body = b"".join(chunks)
+        if received > self.max_bytes:
+            await self.app(scope, _prepend(body, receive, more_body=False), send)
+            return
+
+        replay = _prepend(body, receive, more_body=False)
+        loop = asyncio.get_running_loop()
+        # Hashing up to max_bytes and the cache file I/O stay off the event loop
+        digest = await loop.run_in_executor(None, _file_part_digest, body, boundary.encode("latin-1"))
+        if digest is None:
+            await self.app(scope, replay, send)
+            return
+
+        entry = await loop.run_in_executor(None, self.cache.get, digest)
+        if entry is not None:
+            logger.info(f"Coze file cache hit {digest[:12]} -> {entry['file_id']}")
+            trace_id = scope.get("state", {}).get("trace_id") or get_header(scope, b"x-trace-id")
+            response = JSONResponse(
+                content=create_success_response(
+                    data={"file_id": entry["file_id"], "file": entry["file"], "cached": True},
+                    message="File uploaded successfully",
+                    trace_id=trace_id,
+                ),
+                headers={CACHE_STATUS_HEADER: "hit"},
+            )
+            await response(scope, replay, send)
+            return
+
+        await self._upload_and_record(scope, replay, send, digest)
+
+    async def _upload_and_record(self, scope: Scope, receive: Receive, send: Send, digest: str) -> None:
+        start: Optional[Message] = None
+        parts: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            payload = b"".join(parts)
+            if start["status"] == 200:
+                await asyncio.get_running_loop().run_in_executor(None, self._record, digest, payload)
+            start["headers"] = list(start.get("headers", [])) + [
+                (CACHE_STATUS_HEADER.lower().encode("latin-1"), b"miss")
+            ]
+            await send(start)
+            await send({"type": "http.response.body", "body": payload, "more_body": False})
+
+        await self.app(scope, receive, capture)
+
+    def _record(self, digest: str, payload: bytes) -> None:
+        try:
+            data = json.loads(payload).get("data") or {}
+        except (ValueError, AttributeError):
+            return
+        file_id = data.get("file_id")
+        if file_id:
+            self.cache.put(digest, file_id, data.get("file"))
+
+
+def _boundary(content_type: str) -> Optional[str]:
+    for param in content_type.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "boundary" and value.strip():
+            return value.strip().strip('"')
+    return None
+
+
+def _file_part_digest(body: bytes, boundary: bytes) -> Optional[str]:
+    """SHA-256 of the ``file`` part of a multipart body, or None if it has none."""
+    delimiter = b"--" + boundary
+    view = memoryview(body)
+    pos = body.find(delimiter)
+    while pos >= 0:
+        start = pos + len(delimiter)
+        if body[start:start + 2] == b"--":
+            return None
+        end = body.find(b"\r\n" + delimiter, start)
+        if end < 0:
+            return None
+        head_end = body.find(b"\r\n\r\n", start, end)
+        if head_end >= 0:
+            headers = body[start:head_end].decode("latin-1").lower()
+            for line in headers.split("\r\n"):
+                if line.startswith("content-disposition:") and _FILE_FIELD.search(line) and "filename=" in line:
+                    return sha256_hex(view[head_end + 4:end])
+        pos = end + 2
+    return None
+
+
+def _prepend(data: bytes, receive: Receive, more_body: bool = True) -> Receive:
+    """`receive` that first returns `data`, then continues with the original stream."""
+    sent = False
+
+    async def wrapped() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": data, "more_body": more_body}
+
+    return wrapped
@@ -0,0 +1,222 @@
+"""
+Batch API endpoint
+
+Executes an ordered list of robot operations (control, buzzer, camera
+snapshot, status, configuration) in a single HTTP round trip. Each
+sub-request is dispatched in-process through the full application, so it
+behaves exactly like the equivalent standalone call.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlencode
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from app.config import get_settings
+from app.utils import json_codec
+from app.utils.responses import create_error_response, create_success_response
+
+router = APIRouter(tags=["batch"])
+
+# Routes that may be called from a batch. Streaming and upload routes are excluded.
+BATCHABLE_PATH_PREFIXES = (
+    "/control/",
+    "/status/",
+    "/api/v1/buzzer/",
+    "/api/v1/config/",
+)
+
+# Long-poll / streaming routes under the allowed prefixes; they would hold the whole batch open.
+BATCH_EXCLUDED_PATHS = (
+    "/api/v1/config/watch",
+)
+
+
+class BatchOperation(BaseModel):
+    """One sub-request of a batch."""
+    id: Optional[str] = Field(default=None, description="Caller-chosen identifier echoed in the result")
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = Field(default="GET", description="HTTP method")
+    path: str = Field(..., description="Route path, e.g. /control/move")
+    params: Optional[Dict[str, Any]] = Field(default=None, description="Query parameters")
+    body: Optional[Any] = Field(default=None, description="JSON request body")
+
+
+class BatchRequest(BaseModel):
+    """Ordered list of sub-requests and how to run them."""
+    operations: List[BatchOperation] = Field(..., min_length=1, description="Operations in execution order")
+    mode: Literal["sequential", "parallel"] = Field(default="sequential", description="Execution mode")
+    stop_on_error: bool = Field(
+        default=False,
+        description="Sequential mode only: skip remaining operations after the first failure"
+    )
+
+
+def _is_batchable(path: str) -> bool:
+    if path.rstrip("/").startswith(BATCH_EXCLUDED_PATHS):
+        return False
+    return path.startswith(BATCHABLE_PATH_PREFIXES) or path.rstrip("/") in ("/status", "/api/v1/config", "/api/v1/camera/snapshot")
+
+
+async def _dispatch(request: Request, op: BatchOperation, trace_id: str, disconnected: asyncio.Event) -> Tuple[int, Any]:
+    """Run `op` through the ASGI application and return ``(status, decoded_body)``."""
+    body = b"" if op.body is None else json_codec.dumps(op.body)
+    headers = [
+        (b"host", request.headers.get("host", "localhost").encode("latin-1")),
+        (b"accept", b"application/json"),
+        (b"x-trace-id", trace_id.encode("latin-1")),
+        (b"content-length", str(len(body)).encode("ascii")),
+    ]
+    if op.body is not None:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": op.method,
+        "scheme": request.url.scheme,
+        "path": op.path,
+        "raw_path": op.path.encode("utf-8"),
+        "root_path": "",
+        "query_string": urlencode(op.params or {}, doseq=True).encode("latin-1"),
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+    }
+
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Disconnect together with the batch client. A timed-out operation gets no
+        # disconnect: _run's wait_for cancels it instead.
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    status = 500
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await request.app(scope, receive, send)
+    raw = b"".join(chunks)
+    try:
+        return status, json_codec.loads(raw) if raw else None
+    except ValueError:
+        return status, raw.decode("utf-8", errors="replace")
+
+
+async def _run(request: Request, index: int, op: BatchOperation, trace_id: str, disconnected: asyncio.Event) -> Dict[str, Any]:
+    started = time.perf_counter()
+    timeout_s = get_settings().batch_operation_timeout_s
+    try:
+        status, payload = await asyncio.wait_for(_dispatch(request, op, trace_id, disconnected), timeout_s)
+    except asyncio.TimeoutError:
+        status, payload = 504, create_error_response(
+            code="BATCH_OPERATION_TIMEOUT",
+            message=f"Operation did not finish within {timeout_s:g}s",
+            trace_id=trace_id
+        )
+    except Exception as e:
+        status, payload = 500, create_error_response(
+            code="BATCH_OPERATION_ERROR",
+            message=f"Operation failed: {str(e)}",
+            trace_id=trace_id
+        )
+    return {
+        "index": index,
+        "id": op.id,
+        "status": status,
+        "ok": 200 <= status < 300,
+        "body": payload,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+@router.post("/batch")
+async def execute_batch(request: Request, batch: BatchRequest) -> Dict[str, Any]:
+    """
+    Execute several robot operations in one request.
+
+    Args:
+        batch: Ordered operations, execution mode and error policy
+
+    Returns:
+        One result per operation, in request order
+    """
+    trace_id = getattr(request.state, "trace_id", None) or str(uuid.uuid4())
+    max_operations = get_settings().batch_max_operations
+
+    if len(batch.operations) > max_operations:
+        raise HTTPException(
+            status_code=400,
+            detail=create_error_response(
+                code="BATCH_TOO_LARGE",
+                message=f"A batch may contain at most {max_operations} operations",
+                details={"operations": len(batch.operations)},
+                trace_id=trace_id
+            )
+        )
+    rejected = [i for i, op in enumerate(batch.operations) if not _is_batchable(op.path)]
+    if rejected:
+        raise HTTPException(
+            status_code=400,
+            detail=create_error_response(
+                code="BATCH_INVALID_OPERATION",
+                message="Operation path is not allowed in a batch",
+                details={"indexes": rejected, "allowed_prefixes": list(BATCHABLE_PATH_PREFIXES)},
+                trace_id=trace_id
+            )
+        )
+
+    # The body is already read, so the next message from the client is its disconnect
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect() -> None:
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    started = time.perf_counter()
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        if batch.mode == "parallel":
+            results = list(await asyncio.gather(
+                *(_run(request, i, op, trace_id, disconnected) for i, op in enumerate(batch.operations))
+            ))
+        else:
+            results = []
+            failed = False
+            for i, op in enumerate(batch.operations):
+                if failed and batch.stop_on_error:
+                    results.append({"index": i, "id": op.id, "status": None, "ok": False, "skipped": True, "body": None})
+                    continue
+                result = await _run(request, i, op, trace_id, disconnected)
+                failed = failed or not result["ok"]
+                results.append(result)
+    finally:
+        watcher.cancel()
+
+    succeeded = sum(1 for r in results if r["ok"])
+    return create_success_response(
+        data={
+            "mode": batch.mode,
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+        message="Batch executed",
+        trace_id=trace_id
+    )
@@ -0,0 +1,189 @@
+"""
+Binary camera endpoints
+
+``GET /api/v1/camera/snapshot.jpg`` returns the snapshot as a raw
+``image/jpeg`` body with its metadata in response headers, instead of the
+base64-in-JSON payload of ``POST /api/v1/camera/snapshot``.
+
+``GET /api/v1/camera/stream`` serves live video as ``multipart/x-mixed-replace``
+MJPEG (playable by an ``<img>`` tag), one JPEG part per frame.
+"""
+
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.config import get_settings
+from app.services.camera_frames import (
+    DEFAULT_JPEG_QUALITY,
+    DEFAULT_STREAM_QUALITY,
+    JpegFrame,
+    capture_jpeg,
+    stream_jpeg,
+)
+from app.utils.errors import TurbopiError
+from app.utils.responses import create_error_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/camera", tags=["camera"])
+
+STREAM_BOUNDARY = "frame"
+
+
+def _frame_headers(frame: JpegFrame) -> dict:
+    headers = {
+        "X-Frame-Width": str(frame.width),
+        "X-Frame-Height": str(frame.height),
+        "X-JPEG-Quality": str(frame.quality),
+        "X-Frame-Timestamp": frame.timestamp.isoformat(),
+        "Cache-Control": "no-store",
+    }
+    if frame.age_ms is not None:
+        headers["X-Frame-Age-Ms"] = f"{frame.age_ms:.1f}"
+    return headers
+
+
+def _parse_newer_than(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds from ``newer_than`` (epoch seconds or an ISO 8601 timestamp)."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value)
+    return (parsed if parsed.tzinfo else parsed.astimezone()).timestamp()
+
+
+@router.get(
+    "/snapshot.jpg",
+    response_class=Response,
+    responses={200: {"content": {"image/jpeg": {}}, "description": "Raw JPEG image"}},
+)
+async def get_snapshot_jpeg(
+    request: Request,
+    width: Optional[int] = Query(default=None, ge=320, le=1920, description="Optional snapshot width"),
+    height: Optional[int] = Query(default=None, ge=240, le=1080, description="Optional snapshot height"),
+    quality: int = Query(default=DEFAULT_JPEG_QUALITY, ge=1, le=100, description="JPEG quality"),
+    newer_than: Optional[str] = Query(
+        default=None,
+        description="Only return a frame captured after this time (epoch seconds or ISO 8601, e.g. a previous X-Frame-Timestamp)"
+    ),
+) -> Response:
+    """
+    Capture a camera snapshot as raw JPEG bytes.
+
+    Args:
+        width: Optional output width (default: camera resolution)
+        height: Optional output height (default: camera resolution)
+        quality: JPEG quality
+        newer_than: Optional capture time the returned frame must be newer than
+
+    Returns:
+        ``image/jpeg`` body; size, quality, capture time and age in ``X-Frame-*`` headers
+    """
+    trace_id = getattr(request.state, "trace_id", None)
+    try:
+        newer_than_ts = _parse_newer_than(newer_than)
+    except ValueError:
+        raise HTTPException(
+            status_code=422,
+            detail=create_error_response(
+                code="VALIDATION_ERROR",
+                message=f"Invalid newer_than timestamp: {newer_than}",
+                trace_id=trace_id
+            )
+        )
+    try:
+        frame = await capture_jpeg(width, height, quality, newer_than_ts)
+    except Exception as e:
+        raise _camera_error(e, "Snapshot capture failed", trace_id)
+    return Response(content=frame.data, media_type="image/jpeg", headers=_frame_headers(frame))
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {f"multipart/x-mixed-replace; boundary={STREAM_BOUNDARY}": {}}, "description": "MJPEG stream"}},
+)
+async def get_camera_stream(
+    request: Request,
+    fps: Optional[float] = Query(default=None, gt=0, le=60, description="Maximum frame rate (default: camera_fps)"),
+    width: Optional[int] = Query(default=None, ge=320, le=1920, description="Frame width (default: camera_width, or from height keeping the aspect ratio)"),
+    height: Optional[int] = Query(default=None, ge=240, le=1080, description="Frame height (default: camera_height, or from width keeping the aspect ratio)"),
+    quality: int = Query(default=DEFAULT_STREAM_QUALITY, ge=1, le=100, description="JPEG quality"),
+) -> StreamingResponse:
+    """
+    Stream live camera frames as MJPEG.
+
+    Args:
+        fps: Maximum frame rate; frames are never repeated, so a slower camera caps it
+        width: Output width
+        height: Output height; with only one of the two given the other
+            follows the camera's aspect ratio
+        quality: JPEG quality
+
+    Returns:
+        ``multipart/x-mixed-replace`` body, one ``image/jpeg`` part per frame
+    """
+    trace_id = getattr(request.state, "trace_id", None)
+    settings = get_settings()
+    if width is None and height is None:
+        width, height = settings.camera_width, settings.camera_height
+    frames = stream_jpeg(fps or settings.camera_fps, width, height, quality)
+    # Fetch the first frame before sending headers so capture errors get a JSON error response
+    try:
+        first = await frames.__anext__()
+    except Exception as e:
+        await frames.aclose()
+        raise _camera_error(e, "Camera stream failed", trace_id)
+    return StreamingResponse(
+        _multipart(first, frames),
+        media_type=f"multipart/x-mixed-replace; boundary={STREAM_BOUNDARY}",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _multipart(first: JpegFrame, frames: AsyncIterator[JpegFrame]) -> AsyncIterator[bytes]:
+    frame = first
+    try:
+        while True:
+            yield b"".join((
+                b"--" + STREAM_BOUNDARY.encode() + b"\r\n",
+                b"Content-Type: image/jpeg\r\n",
+                b"Content-Length: %d\r\n" % len(frame.data),
+                b"X-Frame-Timestamp: " + frame.timestamp.isoformat().encode() + b"\r\n\r\n",
+                frame.data,
+                b"\r\n",
+            ))
+            frame = await frames.__anext__()
+    except TurbopiError as e:
+        # Headers are already sent; end the stream so the client can reconnect
+        logger.warning(f"Camera stream ended: {e.message}")
+    finally:
+        await frames.aclose()
+
+
+def _camera_error(e: Exception, message: str, trace_id: Optional[str]) -> HTTPException:
+    if isinstance(e, TurbopiError):
+        return HTTPException(
+            status_code=e.status_code,
+            detail=create_error_response(
+                code=e.error_code,
+                message=e.message,
+                details=e.details,
+                trace_id=trace_id
+            )
+        )
+    return HTTPException(
+        status_code=422,
+        detail=create_error_response(
+            code="CAMERA_ERROR",
+            message=f"{message}: {str(e)}",
+            trace_id=trace_id
+        )
+    )
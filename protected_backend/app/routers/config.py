@@ -2,16 +2,22 @@
 Configuration management API endpoints
 
 Provides REST API for local JSON configuration management with
-validation, masking, and error handling.
+validation, masking, and error handling. Blocking file I/O runs on the
+dedicated config executor (see app.config.run_config_io), never on the
+event loop.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import json
+import time
 import uuid
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 
-from app.config import get_config_service
+from app.config import ConfigPreconditionFailed, ConfigService, get_config_service, run_config_io
+from app.middleware.etag import etag_matches
 from app.models.config import (
     LocalConfig,
     ConfigResponse,
@@ -20,24 +26,57 @@ from app.models.config import (
     ConfigErrorResponse,
     format_validation_errors
 )
+from app.services.config_feed import WATCH_MAX_TIMEOUT_S
 from app.utils.responses import (
     create_config_success_response,
     create_config_update_response,
     create_config_validation_error_response,
-    create_error_response
+    create_error_response,
+    create_success_response
 )
 
 router = APIRouter(prefix="/config", tags=["configuration"])
 
+VERSION_HEADER = "X-Config-Version"
+
+# GET /config/watch: how often waiting watchers re-check the file for external
+# edits, and how often an idle SSE stream sends a keep-alive comment
+WATCH_REFRESH_S = 1.0
+WATCH_KEEPALIVE_S = 15.0
+
+
+def _version_headers(version: int, etag: Optional[str]) -> Dict[str, str]:
+    headers = {VERSION_HEADER: str(version), "Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+
+def _precondition_failed(e: ConfigPreconditionFailed, trace_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=412,
+        detail=create_error_response(
+            code="CONFIG_PRECONDITION_FAILED",
+            message="Configuration was modified by another client; reload and retry",
+            details={"etag": e.etag, "version": e.version},
+            trace_id=trace_id
+        ),
+        headers=_version_headers(e.version, e.etag)
+    )
+
 
 @router.get("/", response_model=ConfigResponse)
 async def get_config(
     request: Request,
-    include_secrets: bool = Query(False, description="Include unmasked sensitive fields")
+    response: Response,
+    include_secrets: bool = Query(False, description="Include unmasked sensitive fields"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a cached copy; answered with 304 if unchanged")
 ) -> Dict[str, Any]:
     """
     Get current configuration with optional secret masking.
     
+    The response carries the configuration `ETag` and `X-Config-Version`.
+    
     Args:
         include_secrets: If True, return unmasked sensitive fields
     
@@ -48,7 +87,13 @@ async def get_config(
     
     try:
         config_service = get_config_service()
-        config_data = config_service.get_config(include_secrets=include_secrets)
+        config_data, version, etag = await run_config_io(
+            config_service.get_config_versioned, include_secrets=include_secrets
+        )
+        
+        if etag and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=_version_headers(version, etag))
+        response.headers.update(_version_headers(version, etag))
         
         return create_config_success_response(
             config_data=config_data,
@@ -70,13 +115,16 @@ async def get_config(
 @router.put("/", response_model=ConfigUpdateResponse)
 async def update_config(
     request: Request,
-    config_data: LocalConfig
+    response: Response,
+    config_data: LocalConfig,
+    if_match: Optional[str] = Header(None, description="Only update if the configuration still has this ETag")
 ) -> Dict[str, Any]:
     """
     Update entire configuration with validation.
     
     Args:
         config_data: New configuration data
+        if_match: Optional ETag for optimistic concurrency (412 on mismatch)
     
     Returns:
         Updated configuration (masked)
@@ -85,7 +133,10 @@ async def update_config(
     
     try:
         config_service = get_config_service()
-        updated_config = config_service.put_config(config_data.dict())
+        updated_config, version, etag = await run_config_io(
+            config_service.put_config_versioned, config_data.dict(), if_match=if_match
+        )
+        response.headers.update(_version_headers(version, etag))
         
         return create_config_update_response(
             config_data=updated_config,
@@ -93,6 +144,9 @@ async def update_config(
             trace_id=trace_id
         )
     
+    except ConfigPreconditionFailed as e:
+        raise _precondition_failed(e, trace_id)
+    
     except ValidationError as e:
         errors = format_validation_errors(e)
         raise HTTPException(
@@ -118,13 +172,16 @@ async def update_config(
 @router.patch("/", response_model=ConfigUpdateResponse)
 async def patch_config(
     request: Request,
-    partial_config: Dict[str, Any]
+    response: Response,
+    partial_config: Dict[str, Any],
+    if_match: Optional[str] = Header(None, description="Only update if the configuration still has this ETag")
 ) -> Dict[str, Any]:
     """
     Partially update configuration with validation.
     
     Args:
         partial_config: Partial configuration data
+        if_match: Optional ETag for optimistic concurrency (412 on mismatch)
     
     Returns:
         Updated configuration (masked)
@@ -133,7 +190,10 @@ async def patch_config(
     
     try:
         config_service = get_config_service()
-        updated_config = config_service.patch_config(partial_config)
+        updated_config, version, etag = await run_config_io(
+            config_service.patch_config_versioned, partial_config, if_match=if_match
+        )
+        response.headers.update(_version_headers(version, etag))
         
         return create_config_update_response(
             config_data=updated_config,
@@ -141,6 +201,9 @@ async def patch_config(
             trace_id=trace_id
         )
     
+    except ConfigPreconditionFailed as e:
+        raise _precondition_failed(e, trace_id)
+    
     except ValidationError as e:
         errors = format_validation_errors(e)
         raise HTTPException(
@@ -175,7 +238,7 @@ async def get_config_schema(request: Request) -> Dict[str, Any]:
     
     try:
         config_service = get_config_service()
-        schema = config_service.get_schema()
+        schema = await run_config_io(config_service.get_schema)
         
         return create_config_success_response(
             config_data=schema,
@@ -195,7 +258,7 @@ async def get_config_schema(request: Request) -> Dict[str, Any]:
 
 
 @router.post("/reset", response_model=ConfigUpdateResponse)
-async def reset_config(request: Request) -> Dict[str, Any]:
+async def reset_config(request: Request, response: Response) -> Dict[str, Any]:
     """
     Reset configuration to default values.
     
@@ -206,7 +269,8 @@ async def reset_config(request: Request) -> Dict[str, Any]:
     
     try:
         config_service = get_config_service()
-        default_config = config_service.reset_config()
+        default_config, version, etag = await run_config_io(config_service.reset_config_versioned)
+        response.headers.update(_version_headers(version, etag))
         
         return create_config_update_response(
             config_data=default_config,
@@ -239,7 +303,7 @@ async def get_config_with_secrets(request: Request) -> Dict[str, Any]:
     
     try:
         config_service = get_config_service()
-        config_data = config_service.get_config(include_secrets=True)
+        config_data = await run_config_io(config_service.get_config, include_secrets=True)
         
         return create_config_success_response(
             config_data=config_data,
@@ -255,4 +319,138 @@ async def get_config_with_secrets(request: Request) -> Dict[str, Any]:
                 message=f"Failed to read configuration with secrets: {str(e)}",
                 trace_id=trace_id
             )
-        )
\ No newline at end of file
+        )
+
+def _watch_payload(config_service: ConfigService, since: Optional[int], include_secrets: bool) -> Dict[str, Any]:
+    """Changes after `since`, or a full snapshot if `since` is unknown or too old."""
+    from app.models.config import mask_sensitive_fields
+    
+    # Reading the config picks up external edits of the file
+    config_service.current_state()
+    changes = None if since is None else config_service.feed.changes_since(since)
+    if changes is None:
+        version, etag, config = config_service.feed.snapshot()
+        return {
+            "version": version,
+            "etag": etag,
+            "snapshot": True,
+            "config": mask_sensitive_fields(config or {}, include_secrets),
+            "changes": [],
+        }
+    
+    events: List[Dict[str, Any]] = []
+    for entry in changes:
+        masked = mask_sensitive_fields(entry["config"], include_secrets)
+        events.append({
+            "version": entry["version"],
+            "etag": entry["etag"],
+            "changed": {key: masked.get(key) for key in entry["changed"]},
+            "removed": entry["removed"],
+        })
+    version, etag = (changes[-1]["version"], changes[-1]["etag"]) if changes else config_service.feed.current()
+    return {"version": version, "etag": etag, "snapshot": False, "config": None, "changes": events}
+
+
+def _sse_frame(event: str, version: int, data: Dict[str, Any], retry_ms: Optional[int] = None) -> bytes:
+    lines = [f"id: {version}", f"event: {event}"]
+    if retry_ms is not None:
+        lines.append(f"retry: {retry_ms}")
+    lines.append("data: " + json.dumps({"type": event, **data}, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+async def _watch_stream(request: Request, config_service: ConfigService, since: Optional[int], include_secrets: bool):
+    payload = await run_config_io(_watch_payload, config_service, since, include_secrets)
+    retry_ms: Optional[int] = 1000
+    while True:
+        if payload["snapshot"]:
+            yield _sse_frame("snapshot", payload["version"], {
+                "version": payload["version"],
+                "etag": payload["etag"],
+                "config": payload["config"],
+            }, retry_ms)
+            retry_ms = None
+        for change in payload["changes"]:
+            yield _sse_frame("change", change["version"], change)
+        since = payload["version"]
+        last_sent = time.monotonic()
+        
+        # Wait for the next version, re-checking the file and the client now and then
+        while True:
+            if await request.is_disconnected():
+                return
+            if not await config_service.feed.wait(since, WATCH_REFRESH_S):
+                await run_config_io(config_service.current_state)
+            if config_service.feed.version != since:
+                break
+            if time.monotonic() - last_sent >= WATCH_KEEPALIVE_S:
+                yield b": keep-alive\n\n"
+                last_sent = time.monotonic()
+        payload = await run_config_io(_watch_payload, config_service, since, include_secrets)
+
+
+@router.get("/watch")
+async def watch_config(
+    request: Request,
+    response: Response,
+    since: Optional[int] = Query(None, ge=0, description="Last configuration version the client has seen"),
+    timeout: float = Query(25.0, ge=0, le=WATCH_MAX_TIMEOUT_S, description="Long-poll: seconds to wait for a change"),
+    stream: bool = Query(False, description="Stream changes as Server-Sent Events"),
+    include_secrets: bool = Query(False, description="Include unmasked sensitive fields"),
+    accept: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Wait for configuration changes instead of polling GET /config/.
+    
+    Without `since` (or with a version that is no longer in the change
+    history) the current configuration is returned as a snapshot. Otherwise
+    the changes after `since` are returned, waiting up to `timeout` seconds
+    for one to happen (long-poll).
+    
+    With `stream=true` or `Accept: text/event-stream` the endpoint keeps the
+    connection open and sends a `snapshot` event followed by one `change`
+    event per new version; the SSE event id is the version, so a reconnect
+    with `Last-Event-ID` resumes without losing changes.
+    
+    Returns:
+        {version, etag, snapshot, config, changes: [{version, etag, changed, removed}]}
+    """
+    trace_id = str(uuid.uuid4())
+    config_service = get_config_service()
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    
+    if stream or (accept and "text/event-stream" in accept):
+        return StreamingResponse(
+            _watch_stream(request, config_service, since, include_secrets),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    try:
+        deadline = time.monotonic() + timeout
+        payload = await run_config_io(_watch_payload, config_service, since, include_secrets)
+        while not payload["snapshot"] and not payload["changes"]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or await request.is_disconnected():
+                break
+            await config_service.feed.wait(payload["version"], min(remaining, WATCH_REFRESH_S))
+            payload = await run_config_io(_watch_payload, config_service, since, include_secrets)
+        
+        response.headers.update(_version_headers(payload["version"], payload["etag"]))
+        return create_success_response(
+            data=payload,
+            message="Configuration changed" if payload["changes"] or payload["snapshot"] else "Configuration unchanged",
+            trace_id=trace_id
+        )
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=create_error_response(
+                code="CONFIG_WATCH_ERROR",
+                message=f"Failed to watch configuration: {str(e)}",
+                trace_id=trace_id
+            )
+        )
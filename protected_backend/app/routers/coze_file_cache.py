@@ -0,0 +1,50 @@
+"""
+Coze file_id cache API endpoints
+
+Exposes hit/miss counters of the content-addressed upload cache and
+allows clearing it.
+"""
+
+from typing import Dict, Any
+import uuid
+
+from fastapi import APIRouter, Request
+
+from app.services.file_id_cache import get_file_id_cache
+from app.utils.responses import create_success_response
+
+router = APIRouter(prefix="/coze/files/cache", tags=["llm"])
+
+
+@router.get("")
+async def get_file_cache_stats(request: Request) -> Dict[str, Any]:
+    """
+    Get Coze file_id cache statistics.
+    
+    Returns:
+        Entry count, limits and hit/miss/eviction counters
+    """
+    trace_id = getattr(request.state, "trace_id", None) or str(uuid.uuid4())
+    return create_success_response(
+        data=get_file_id_cache().stats(),
+        message="File cache statistics retrieved successfully",
+        trace_id=trace_id
+    )
+
+
+@router.delete("")
+async def clear_file_cache(request: Request) -> Dict[str, Any]:
+    """
+    Forget every cached file_id and reset the counters.
+    
+    Returns:
+        Statistics of the emptied cache
+    """
+    trace_id = getattr(request.state, "trace_id", None) or str(uuid.uuid4())
+    cache = get_file_id_cache()
+    cache.clear()
+    return create_success_response(
+        data=cache.stats(),
+        message="File cache cleared",
+        trace_id=trace_id
+    )
@@ -0,0 +1,162 @@
+"""
+uvicorn launcher: server profiles and the multi-worker deployment.
+
+``TURBOPI_SERVER_PROFILE=performance`` selects uvloop and httptools explicitly
+(falling back to asyncio/h11 with a warning when they are not installed) and
+turns off the per-request access log.
+
+``TURBOPI_WORKERS=N`` (N > 1) splits the backend over several processes so
+Coze streaming, JSON encoding and base64 snapshots can use every core of the Pi:
+
+- one hardware-owner process (``TURBOPI_PROCESS_ROLE=hardware``) runs the
+  ROS/runtime manager and the local config service, listening only on a Unix
+  domain socket;
+- N uvicorn HTTP workers (``TURBOPI_PROCESS_ROLE=http``) share the public port,
+  serve the stateless routes themselves and relay control, camera, buzzer,
+  status, batch and config requests, and the resumable Coze SSE routes, to the
+  owner (see app.middleware.hardware_proxy).
+"""
+
+import importlib.util
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import ProcessRole, ServerProfile, Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+OWNER_STARTUP_TIMEOUT_S = 30.0
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def uvicorn_options(settings: Settings) -> Dict[str, Any]:
+    """Keyword arguments for `uvicorn.run` shared by every process."""
+    options: Dict[str, Any] = {"log_level": settings.log_level.lower()}
+    if settings.server_profile != ServerProfile.PERFORMANCE:
+        return options
+
+    missing: List[str] = []
+    if _installed("uvloop"):
+        options["loop"] = "uvloop"
+    else:
+        options["loop"] = "asyncio"
+        missing.append("uvloop")
+    if _installed("httptools"):
+        options["http"] = "httptools"
+    else:
+        options["http"] = "h11"
+        missing.append("httptools")
+    if missing:
+        logger.warning(f"Performance profile without {', '.join(missing)} (pip install {' '.join(missing)})")
+    options["access_log"] = False
+    logger.info(f"Performance profile: loop={options['loop']} http={options['http']}")
+    return options
+
+
+def hardware_socket_path(settings: Settings) -> str:
+    return settings.hardware_socket or os.path.join(tempfile.gettempdir(), f"turbopi-hardware-{settings.port}.sock")
+
+
+def run(settings: Optional[Settings] = None) -> None:
+    """Run the backend as configured (single process or owner + workers)."""
+    settings = settings or get_settings()
+    import uvicorn
+
+    options = uvicorn_options(settings)
+    if settings.workers > 1 and settings.debug:
+        logger.warning("TURBOPI_WORKERS is ignored in debug (auto-reload) mode")
+    elif settings.workers > 1:
+        _run_multiprocess(settings, options)
+        return
+
+    # Avoid relying on current working directory for reload; explicitly set watched dirs
+    reload_dirs = None
+    if settings.debug:
+        # Watch the backend app directory explicitly to prevent Path.cwd() issues
+        reload_dirs = [str(Path(__file__).resolve().parent)]
+
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        reload_dirs=reload_dirs,
+        **options,
+    )
+
+
+def _run_multiprocess(settings: Settings, options: Dict[str, Any]) -> None:
+    import uvicorn
+
+    socket_path = hardware_socket_path(settings)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    owner_env = dict(
+        os.environ,
+        TURBOPI_PROCESS_ROLE=ProcessRole.HARDWARE.value,
+        TURBOPI_HARDWARE_SOCKET=socket_path,
+    )
+    owner = subprocess.Popen([sys.executable, "-m", "app.server"], cwd=BACKEND_DIR, env=owner_env)
+    try:
+        _wait_for_socket(socket_path, owner)
+        logger.info(f"Hardware owner (pid {owner.pid}) ready on {socket_path}; starting {settings.workers} HTTP workers")
+
+        # Inherited by the spawned uvicorn workers
+        os.environ["TURBOPI_PROCESS_ROLE"] = ProcessRole.HTTP.value
+        os.environ["TURBOPI_HARDWARE_SOCKET"] = socket_path
+        uvicorn.run(
+            "app.main:create_app",
+            factory=True,
+            host=settings.host,
+            port=settings.port,
+            workers=settings.workers,
+            **options,
+        )
+    finally:
+        owner.terminate()
+        try:
+            owner.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            owner.kill()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _wait_for_socket(socket_path: str, owner: subprocess.Popen) -> None:
+    deadline = time.monotonic() + OWNER_STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if owner.poll() is not None:
+            raise RuntimeError(f"Hardware owner exited with {owner.returncode} during startup")
+        if os.path.exists(socket_path):
+            return
+        time.sleep(0.05)
+    raise RuntimeError(f"Hardware owner did not listen on {socket_path} within {OWNER_STARTUP_TIMEOUT_S:.0f}s")
+
+
+def run_hardware_owner() -> None:
+    """Entry point of the hardware-owner process started by `_run_multiprocess`."""
+    settings = get_settings()
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:create_app",
+        factory=True,
+        uds=hardware_socket_path(settings),
+        **uvicorn_options(settings),
+    )
+
+
+if __name__ == "__main__":
+    run_hardware_owner()
@@ -0,0 +1,243 @@
+"""
+Raw JPEG camera frames
+
+`POST /api/v1/camera/snapshot` returns the JPEG base64-encoded inside JSON and
+also writes it to ``~/Downloads``. The binary routes use `capture_jpeg` instead:
+in ROS2 mode the latest frame held by the runtime provider's camera
+subscription is resized and JPEG-encoded on a worker thread and handed back as
+bytes, with no base64 step and no file write. When the always-on frame cache
+is running (app.services.frame_cache) the newest frame comes from its ring
+instead, so a snapshot does not wait for the next camera message. Providers
+without either (e.g. simulation) fall back to `RuntimeManager.capture_snapshot`
+and decode its base64 result, so the routes behave like the JSON snapshot
+everywhere.
+
+`stream_jpeg` drives ``GET /api/v1/camera/stream``: every viewer reads the same
+shared capture (the frame cache, or the provider's latest image), taking each
+new frame at most once and no faster than the requested frame rate. Providers
+without a live frame cannot stream.
+
+With the frame cache, encoding goes through app.services.frame_pipeline, so
+requests at the same size and quality share one encode per camera frame.
+"""
+
+import asyncio
+import base64
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from app.config import get_settings
+
+DEFAULT_JPEG_QUALITY = 90
+DEFAULT_STREAM_QUALITY = 80
+FRAME_POLL_S = 0.01
+
+
+@dataclass(frozen=True)
+class JpegFrame:
+    """One encoded camera frame."""
+    data: bytes
+    width: int
+    height: int
+    quality: int
+    timestamp: datetime
+    age_ms: Optional[float] = None
+
+
+def _timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.astimezone()
+    if isinstance(value, (int, float)) and value > 0:
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            return _timestamp(datetime.fromisoformat(value))
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def _provider_frame(provider: Any) -> Optional[Tuple[Any, Any]]:
+    """``(image, captured_at)`` of the provider's latest camera image, if any."""
+    lock = getattr(provider, "_camera_lock", None)
+    if lock is not None:
+        with lock:
+            image = getattr(provider, "_last_image_cv", None)
+            captured_at = getattr(provider, "_last_image_time", None)
+    else:
+        image = getattr(provider, "_last_image_cv", None)
+        captured_at = getattr(provider, "_last_image_time", None)
+    if image is None:
+        return None
+    return image, captured_at
+
+
+# cv2 conversions to BGR for the raw ROS encodings kept by the frame cache
+_TO_BGR = {"rgb8": "COLOR_RGB2BGR", "bgra8": "COLOR_BGRA2BGR", "rgba8": "COLOR_RGBA2BGR"}
+
+
+def encode_jpeg(
+    image: Any,
+    width: Optional[int],
+    height: Optional[int],
+    quality: int,
+    encoding: str = "bgr8",
+) -> Tuple[bytes, int, int]:
+    """
+    Resize an image if requested and JPEG-encode it; returns ``(jpeg, width, height)``.
+
+    When only one of `width` / `height` is given the other keeps the aspect ratio.
+    """
+    import cv2
+    from app.utils.errors import CameraError
+
+    src_h, src_w = image.shape[:2]
+    if width and not height:
+        out_w, out_h = width, max(1, round(src_h * width / src_w))
+    elif height and not width:
+        out_w, out_h = max(1, round(src_w * height / src_h)), height
+    else:
+        out_w, out_h = width or src_w, height or src_h
+    if (out_w, out_h) != (src_w, src_h):
+        image = cv2.resize(image, (out_w, out_h), interpolation=cv2.INTER_AREA)
+    # Convert after resizing so a downscaled frame converts fewer pixels
+    if encoding in _TO_BGR:
+        image = cv2.cvtColor(image, getattr(cv2, _TO_BGR[encoding]))
+    ok, buf = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)])
+    if not ok:
+        raise CameraError("Failed to encode image to JPEG")
+    return buf.tobytes(), out_w, out_h
+
+
+async def _wait_for_provider_frame(provider: Any, timeout_s: float, newer_than: Optional[float] = None) -> Tuple[Any, Any]:
+    from app.utils.errors import CameraError
+
+    deadline = time.monotonic() + timeout_s
+    while True:
+        frame = _provider_frame(provider)
+        if frame is not None and (newer_than is None or _timestamp(frame[1]).timestamp() > newer_than):
+            return frame
+        if time.monotonic() >= deadline:
+            raise CameraError("Snapshot timeout: no image received")
+        await asyncio.sleep(FRAME_POLL_S)
+
+
+async def capture_jpeg(
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: int = DEFAULT_JPEG_QUALITY,
+    newer_than: Optional[float] = None,
+) -> JpegFrame:
+    """
+    Capture one JPEG frame as raw bytes (see module docstring).
+
+    `newer_than` (epoch seconds) requires a frame captured after that time,
+    waiting up to ``camera_snapshot_timeout_ms`` for one.
+    """
+    from app.services.frame_cache import get_frame_cache
+    from app.services.frame_pipeline import get_frame_pipeline
+    from app.services.runtime import get_runtime_manager
+
+    timeout_s = get_settings().camera_snapshot_timeout_ms / 1000.0
+    loop = asyncio.get_running_loop()
+    cache = get_frame_cache()
+    if cache.attached:
+        _, frame = await get_frame_pipeline().frame(cache, width, height, quality, timeout_s, newer_than=newer_than)
+        return frame
+
+    runtime_manager = get_runtime_manager()
+    provider = getattr(runtime_manager, "_provider", None)
+    if provider is not None and hasattr(provider, "_last_image_cv"):
+        image, captured_at = await _wait_for_provider_frame(provider, timeout_s, newer_than)
+        timestamp = _timestamp(captured_at)
+        age_ms = round((time.time() - timestamp.timestamp()) * 1000.0, 1) if captured_at is not None else None
+        data, out_w, out_h = await loop.run_in_executor(None, encode_jpeg, image, width, height, quality)
+        return JpegFrame(data, out_w, out_h, quality, timestamp, age_ms)
+
+    return await _capture_via_runtime(runtime_manager, width, height, quality)
+
+
+async def _encode_cached(cached: Any, width: Optional[int], height: Optional[int], quality: int) -> JpegFrame:
+    """Encode a pinned `CachedFrame` on a worker thread and release it."""
+    loop = asyncio.get_running_loop()
+    try:
+        age_ms = cached.age_ms()
+        data, out_w, out_h = await loop.run_in_executor(
+            None, encode_jpeg, cached.image(), width, height, quality, cached.encoding
+        )
+    finally:
+        cached.release()
+    return JpegFrame(data, out_w, out_h, quality, _timestamp(cached.captured_at), round(age_ms, 1))
+
+
+async def stream_jpeg(
+    fps: float,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: int = DEFAULT_STREAM_QUALITY,
+) -> AsyncIterator[JpegFrame]:
+    """
+    Yield JPEG frames at up to `fps` from the shared capture (see module docstring).
+
+    With the frame cache running each yielded frame is a new camera frame,
+    encoded once for all viewers at the same size and quality; a viewer that
+    falls behind skips to the newest one instead of queueing. Without the cache
+    the provider's latest image is used, likewise only once per new frame.
+    Raises CameraError when the provider has no live camera frames, or when no
+    new frame arrives within ``camera_snapshot_timeout_ms``.
+    """
+    from app.services.frame_cache import get_frame_cache
+    from app.services.frame_pipeline import get_frame_pipeline
+    from app.services.runtime import get_runtime_manager
+    from app.utils.errors import CameraError
+
+    timeout_s = get_settings().camera_snapshot_timeout_ms / 1000.0
+    interval = 1.0 / fps
+    loop = asyncio.get_running_loop()
+    cache = get_frame_cache()
+    pipeline = get_frame_pipeline()
+    provider = getattr(get_runtime_manager(), "_provider", None)
+    if not cache.attached and not hasattr(provider, "_last_image_cv"):
+        # The capture_snapshot fallback (base64 + file write per call) is not a stream source
+        raise CameraError("Camera stream is not supported by the current runtime provider")
+    last_seq = 0
+    last_captured: Optional[float] = None
+    next_at = loop.time()
+    while True:
+        delay = next_at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if cache.attached:
+            last_seq, frame = await pipeline.frame(cache, width, height, quality, timeout_s, after_seq=last_seq)
+        else:
+            image, captured_at = await _wait_for_provider_frame(provider, timeout_s, last_captured)
+            timestamp = _timestamp(captured_at)
+            last_captured = timestamp.timestamp()
+            data, out_w, out_h = await loop.run_in_executor(None, encode_jpeg, image, width, height, quality)
+            age_ms = round((time.time() - last_captured) * 1000.0, 1) if captured_at is not None else None
+            frame = JpegFrame(data, out_w, out_h, quality, timestamp, age_ms)
+        # Pace from the previous slot, but never burst to catch up after a stall
+        next_at = max(next_at + interval, loop.time())
+        yield frame
+
+
+async def _capture_via_runtime(runtime_manager: Any, width: Optional[int], height: Optional[int], quality: int) -> JpegFrame:
+    from app.models.schemas import CameraSnapshotRequest
+    from app.utils.errors import CameraError
+
+    result = await runtime_manager.capture_snapshot(
+        CameraSnapshotRequest(width=width, height=height, quality=quality)
+    )
+    snapshot = result.get("snapshot", result) if isinstance(result, dict) else {}
+    encoded = snapshot.get("snapshot_b64") or snapshot.get("base64")
+    if not encoded:
+        raise CameraError("Snapshot capture returned no image")
+    return JpegFrame(
+        data=base64.b64decode(encoded),
+        width=int(snapshot.get("width") or width or 0),
+        height=int(snapshot.get("height") or height or 0),
+        quality=int(snapshot.get("jpeg_quality") or quality),
+        timestamp=_timestamp(snapshot.get("timestamp")),
+    )
@@ -0,0 +1,138 @@
+"""
+Versioned local configuration with a change feed.
+
+Every distinct configuration state published by ConfigService gets the next
+version number and a strong ETag (a hash of its canonical JSON). The last few
+changes are kept so a watcher that passes the version it has seen receives
+only what changed since; older or unknown versions get a full snapshot.
+``GET /api/v1/config/watch`` waits on the feed, so clients learn about changes
+as they happen instead of polling ``GET /api/v1/config/``.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+# Longest long-poll ``GET /api/v1/config/watch`` accepts; proxies in front of it must outlast it
+WATCH_MAX_TIMEOUT_S = 60.0
+
+
+def config_etag(config: Dict[str, Any]) -> str:
+    """Strong ETag of a configuration state."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return '"%s"' % hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:20]
+
+
+def if_match_ok(if_match: Optional[str], etag: str) -> bool:
+    """Strong comparison of an ``If-Match`` header value against `etag`."""
+    if if_match is None:
+        return True
+    if if_match.strip() == "*":
+        return True
+    return any(candidate.strip() == etag for candidate in if_match.split(","))
+
+
+def diff_keys(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+    """Return ``(changed, removed)`` top-level keys between two configs."""
+    old = old or {}
+    changed = [k for k, v in new.items() if k not in old or old[k] != v]
+    removed = [k for k in old if k not in new]
+    return changed, removed
+
+
+class ConfigFeed:
+    """Thread-safe version counter, change history and async waiters."""
+
+    def __init__(self, history: int = 64):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.etag: Optional[str] = None
+        self.config: Optional[Dict[str, Any]] = None
+        # Each entry: {"version", "etag", "changed", "removed", "config"}
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = set()
+
+    def current(self) -> Tuple[int, Optional[str]]:
+        return self.version, self.etag
+
+    def snapshot(self) -> Tuple[int, Optional[str], Optional[Dict[str, Any]]]:
+        """Consistent ``(version, etag, config)`` of the current state."""
+        with self._lock:
+            return self.version, self.etag, self.config
+
+    def publish(self, config: Dict[str, Any]) -> Tuple[int, str]:
+        """Record `config` as the current state; returns its ``(version, etag)``."""
+        with self._lock:
+            # Cheap path for the common case: nothing changed since the last read
+            if self.config is not None and config == self.config:
+                return self.version, self.etag
+            etag = config_etag(config)
+            if etag == self.etag:
+                return self.version, self.etag
+            changed, removed = diff_keys(self.config, config)
+            self.version += 1
+            self.etag = etag
+            self.config = config
+            self._history.append({
+                "version": self.version,
+                "etag": etag,
+                "changed": changed,
+                "removed": removed,
+                "config": config,
+            })
+            waiters, self._waiters = self._waiters, set()
+            version = self.version
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # Loop already closed
+                pass
+        return version, etag
+
+    def version_of(self, etag: str) -> int:
+        """Newest version whose state had `etag` (the current version if unknown)."""
+        with self._lock:
+            for entry in reversed(self._history):
+                if entry["etag"] == etag:
+                    return entry["version"]
+            return self.version
+
+    def changes_since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """Changes after `version`, oldest first; None if the history no longer covers it."""
+        with self._lock:
+            if version > self.version or version < 0:
+                return None
+            if version == self.version:
+                return []
+            pending = [entry for entry in self._history if entry["version"] > version]
+            if not pending or pending[0]["version"] != version + 1:
+                return None
+            return pending
+
+    async def wait(self, since: int, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for a version newer than `since`."""
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+        entry = (loop, future)
+        with self._lock:
+            if self.version != since:
+                return True
+            self._waiters.add(entry)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters.discard(entry)
+        return self.version != since
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,279 @@
+"""
+Content-addressed cache of Coze file IDs.
+
+Maps the SHA-256 of uploaded file bytes to the `file_id` Coze returned for them,
+so an identical image or document sent to `/api/v1/coze/files/upload` is
+uploaded to Coze only once (see `app.middleware.upload_cache`). Entries expire
+after a TTL, the least recently used entry is evicted when the cache is full,
+and the table is persisted next to the local configuration file.
+
+Writes to the file are debounced and done on a timer thread. Several processes
+(``TURBOPI_WORKERS`` > 1) share the file: each write re-reads it under an
+exclusive ``flock`` and merges the other processes' entries before replacing
+it, and a lookup that misses picks up entries written by others since.
+
+`/api/v1/coze/image/chat/stream` uploads its image inside the Coze service and
+does not go through this cache.
+"""
+
+import atexit
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def sha256_hex(data: bytes) -> str:
+    """Content key used by the cache."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileIdCache:
+    """Thread-safe LRU + TTL cache from content hash to Coze file metadata."""
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        ttl_s: float = 86400,
+        max_entries: int = 512,
+        persist_delay_s: float = 1.0,
+    ):
+        self._lock = threading.Lock()
+        # Serializes file writes; never held together with _lock during I/O
+        self._persist_lock = threading.Lock()
+        self._cache_path = self._get_cache_path(cache_path)
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.persist_delay_s = persist_delay_s
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._loaded = False
+        # Stamp of the file when last read or written; a change means another process wrote it
+        self._stamp: Optional[Tuple[int, int]] = None
+        # Removed here since the last write; not to be merged back from the file
+        self._dropped: Set[str] = set()
+        # Entries created up to this time were cleared (by any process)
+        self._cleared_at = 0.0
+        self._persist_timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        atexit.register(self.flush)
+
+    def _get_cache_path(self, cache_path: Optional[str] = None) -> Path:
+        """Get cache file path with environment variable override."""
+        if cache_path:
+            return Path(cache_path).expanduser().resolve()
+
+        env_cache_path = os.getenv("TURBOPI_FILE_ID_CACHE_PATH")
+        if env_cache_path:
+            return Path(env_cache_path).expanduser().resolve()
+
+        # Default path: ~/.turbopi/file_id_cache.json
+        return Path.home() / ".turbopi" / "file_id_cache.json"
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self._cache_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_file(self) -> Tuple[Dict[str, Dict[str, Any]], float]:
+        """``(entries, cleared_at)`` stored in the file; empty if missing or unreadable."""
+        try:
+            with open(self._cache_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return {}, 0.0
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable file_id cache {self._cache_path}: {e}")
+            return {}, 0.0
+        if "entries" in stored:
+            return stored["entries"], float(stored.get("cleared_at", 0.0))
+        # Flat table written by older versions
+        return stored, 0.0
+
+    def _merge(self, stored: Dict[str, Dict[str, Any]], cleared_at: float) -> None:
+        """Adopt entries another process wrote. Caller holds _lock."""
+        now = time.time()
+        if cleared_at > self._cleared_at:
+            self._cleared_at = cleared_at
+            for digest in [d for d, e in self._entries.items() if e["created_at"] <= cleared_at]:
+                del self._entries[digest]
+        for digest, entry in stored.items():
+            if digest in self._dropped or entry.get("created_at", 0) <= self._cleared_at:
+                continue
+            if now - entry.get("created_at", 0) > self.ttl_s:
+                continue
+            mine = self._entries.get(digest)
+            if mine is None or entry.get("last_used", 0) > mine.get("last_used", 0):
+                self._entries[digest] = entry
+        ordered = sorted(self._entries.items(), key=lambda kv: kv[1].get("last_used", 0))
+        self._entries = OrderedDict(ordered)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        self._stamp = self._file_stamp()
+        self._merge(*self._read_file())
+
+    def _refresh(self) -> None:
+        """Merge entries written by other processes since we last looked. Caller holds _lock."""
+        stamp = self._file_stamp()
+        if stamp is not None and stamp != self._stamp:
+            self._stamp = stamp
+            self._merge(*self._read_file())
+
+    def _persist(self) -> None:
+        self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self._cache_path.with_name(self._cache_path.name + ".lock")
+        with self._persist_lock, open(lock_path, "a") as lock_file:
+            # Other workers write the same file: merge their entries, then replace it
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            stored, cleared_at = self._read_file()
+            with self._lock:
+                self._merge(stored, cleared_at)
+                self._dropped.clear()
+                content = {"cleared_at": self._cleared_at, "entries": dict(self._entries)}
+            temp_fd, temp_path = tempfile.mkstemp(
+                dir=self._cache_path.parent,
+                prefix=f"{self._cache_path.name}.tmp"
+            )
+            try:
+                with os.fdopen(temp_fd, "w", encoding="utf-8") as f:
+                    json.dump(content, f, ensure_ascii=False)
+                os.replace(temp_path, self._cache_path)
+            except Exception:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                raise
+            with self._lock:
+                self._stamp = self._file_stamp()
+
+    def _schedule_persist(self) -> None:
+        """Write the table after `persist_delay_s`, coalescing changes. Caller holds _lock."""
+        if self._persist_timer is not None:
+            return
+        timer = threading.Timer(self.persist_delay_s, self._persist_from_timer)
+        timer.daemon = True
+        self._persist_timer = timer
+        timer.start()
+
+    def _persist_from_timer(self) -> None:
+        with self._lock:
+            self._persist_timer = None
+        try:
+            self._persist()
+        except OSError as e:
+            logger.warning(f"Failed to persist file_id cache: {e}")
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            timer, self._persist_timer = self._persist_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        try:
+            self._persist()
+        except OSError as e:
+            logger.warning(f"Failed to persist file_id cache: {e}")
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `digest` (and count a hit or miss)."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(digest)
+            if entry is None:
+                self._refresh()
+                entry = self._entries.get(digest)
+            if entry is not None and time.time() - entry["created_at"] > self.ttl_s:
+                del self._entries[digest]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(digest)
+            return dict(entry)
+
+    def put(self, digest: str, file_id: str, file_info: Optional[Dict[str, Any]] = None) -> None:
+        """Remember that content `digest` was uploaded to Coze as `file_id`."""
+        now = time.time()
+        with self._lock:
+            self._load()
+            self._entries[digest] = {
+                "file_id": file_id,
+                "file": file_info or {},
+                "created_at": now,
+                "last_used": now,
+            }
+            self._entries.move_to_end(digest)
+            self._dropped.discard(digest)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._dropped.add(evicted)
+                self.evictions += 1
+            self._schedule_persist()
+
+    def invalidate(self, digest: str) -> None:
+        """Forget `digest`, e.g. after Coze rejected its cached file_id."""
+        with self._lock:
+            self._load()
+            if self._entries.pop(digest, None) is not None:
+                self._dropped.add(digest)
+                self._schedule_persist()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            self._cleared_at = time.time()
+            self.hits = self.misses = self.evictions = 0
+            self._schedule_persist()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "path": str(self._cache_path),
+            }
+
+
+# Global instance
+_file_id_cache = None
+
+def get_file_id_cache() -> FileIdCache:
+    """Get global FileIdCache instance."""
+    global _file_id_cache
+    if _file_id_cache is None:
+        from app.config import get_settings
+        settings = get_settings()
+        _file_id_cache = FileIdCache(
+            ttl_s=settings.file_id_cache_ttl_s,
+            max_entries=settings.file_id_cache_max_entries,
+        )
+    return _file_id_cache
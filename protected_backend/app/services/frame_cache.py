@@ -0,0 +1,332 @@
+"""
+Always-on camera frame cache
+
+The ROS2 provider waits for the next camera message on every snapshot. This
+cache keeps its own subscription to ``ros2_camera_topic`` on the provider's
+node and copies each image into a small ring of preallocated buffers, so a
+snapshot can encode the newest frame immediately and report its age.
+
+- The ROS callback does a single copy into a free slot; nothing is allocated
+  per frame once the buffers have grown to the camera resolution.
+- Readers pin the slot they encode from, and the writer skips pinned slots,
+  so a frame is never overwritten while it is being read. When every slot is
+  pinned the incoming frame is dropped.
+- With ``camera_idle_shutdown_s`` set, the subscription is dropped after that
+  much inactivity and re-created by the next request (which then waits for a
+  fresh frame). The buffers are kept.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# ROS image encodings copied as-is (bytes per pixel); others are converted to bgr8
+RAW_ENCODINGS = {"bgr8": 3, "rgb8": 3, "mono8": 1, "bgra8": 4, "rgba8": 4}
+
+
+class _Slot:
+    __slots__ = ("buffer", "size", "seq", "width", "height", "step", "encoding", "captured_at", "received", "pins")
+
+    def __init__(self, capacity: int):
+        self.buffer = bytearray(capacity)
+        self.size = 0
+        self.seq = 0
+        self.width = 0
+        self.height = 0
+        self.step = 0
+        self.encoding = ""
+        self.captured_at = 0.0
+        self.received = 0.0
+        self.pins = 0
+
+
+class CachedFrame:
+    """A pinned ring slot; call `release()` (or use ``with``) when done reading it."""
+
+    __slots__ = ("seq", "width", "height", "encoding", "captured_at", "received", "_slot", "_ring")
+
+    def __init__(self, slot: _Slot, ring: "FrameRing"):
+        self.seq = slot.seq
+        self.width = slot.width
+        self.height = slot.height
+        self.encoding = slot.encoding
+        self.captured_at = slot.captured_at
+        self.received = slot.received
+        self._slot: Optional[_Slot] = slot
+        self._ring = ring
+
+    def age_ms(self) -> float:
+        return (time.monotonic() - self.received) * 1000.0
+
+    def image(self) -> Any:
+        """numpy view of the frame (H x W x C, or H x W for mono8); valid until `release()`."""
+        import numpy as np
+
+        slot = self._slot
+        if slot is None:
+            raise RuntimeError("frame already released")
+        channels = RAW_ENCODINGS[self.encoding]
+        rows = np.frombuffer(slot.buffer, dtype=np.uint8, count=self.height * slot.step).reshape(self.height, slot.step)
+        pixels = rows[:, :self.width * channels]
+        if channels == 1:
+            return pixels
+        return pixels.reshape(self.height, self.width, channels)
+
+    def release(self) -> None:
+        if self._slot is not None:
+            self._ring._unpin(self._slot)
+            self._slot = None
+
+    def __enter__(self) -> "CachedFrame":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+class FrameRing:
+    """Preallocated ring of raw frames with reader pinning."""
+
+    def __init__(self, slots: int, capacity: int = 0):
+        self._lock = threading.Lock()
+        self._slots = [_Slot(capacity) for _ in range(max(2, slots))]
+        self._head: Optional[_Slot] = None
+        self._index = 0
+        self.seq = 0
+        self.frames = 0
+        self.dropped = 0
+
+    def push(self, data: Any, width: int, height: int, step: int, encoding: str, captured_at: float) -> bool:
+        """Copy one frame into a free slot; False if every slot is pinned."""
+        view = memoryview(data).cast("B")
+        size = height * step
+        with self._lock:
+            slot = None
+            for offset in range(1, len(self._slots) + 1):
+                candidate = self._slots[(self._index + offset) % len(self._slots)]
+                if candidate.pins == 0 and candidate is not self._head:
+                    slot = candidate
+                    self._index = (self._index + offset) % len(self._slots)
+                    break
+            if slot is None:
+                self.dropped += 1
+                return False
+            if len(slot.buffer) < size:
+                slot.buffer = bytearray(size)
+            slot.buffer[:size] = view[:size]
+            self.seq += 1
+            slot.size = size
+            slot.seq = self.seq
+            slot.width = width
+            slot.height = height
+            slot.step = step
+            slot.encoding = encoding
+            slot.captured_at = captured_at
+            slot.received = time.monotonic()
+            self._head = slot
+            self.frames += 1
+            return True
+
+    def acquire_latest(self, after_seq: int = 0, newer_than: Optional[float] = None) -> Optional[CachedFrame]:
+        """Pin and return the newest frame if it is after `after_seq` and captured after `newer_than`."""
+        with self._lock:
+            slot = self._head
+            if slot is None or slot.seq <= after_seq:
+                return None
+            if newer_than is not None and slot.captured_at <= newer_than:
+                return None
+            slot.pins += 1
+            return CachedFrame(slot, self)
+
+    def _unpin(self, slot: _Slot) -> None:
+        with self._lock:
+            slot.pins -= 1
+
+
+class CameraFrameCache:
+    """Persistent camera subscription feeding a `FrameRing`, with async waiters."""
+
+    def __init__(self, slots: int = 4, idle_shutdown_s: float = 0.0, topic: Optional[str] = None):
+        self.ring = FrameRing(slots)
+        self.idle_shutdown_s = idle_shutdown_s
+        self.topic = topic
+        self._lock = threading.Lock()
+        self._node: Any = None
+        self._bridge: Any = None
+        self._subscription: Any = None
+        self._last_access = time.monotonic()
+        self._idle_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = set()
+        self.subscriptions = 0
+
+    @property
+    def attached(self) -> bool:
+        return self._node is not None
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscription is not None
+
+    def attach(self, provider: Any) -> bool:
+        """Use the ROS node of `provider`; False if it has none (e.g. simulation)."""
+        node = getattr(provider, "_ros_node", None)
+        if node is None:
+            return False
+        self._node = node
+        self._bridge = getattr(provider, "_bridge", None)
+        self.topic = self.topic or get_settings().ros2_camera_topic
+        self._subscribe()
+        if self.idle_shutdown_s > 0 and self._idle_thread is None:
+            self._stop.clear()
+            self._idle_thread = threading.Thread(target=self._idle_loop, name="camera-idle", daemon=True)
+            self._idle_thread.start()
+        return True
+
+    def detach(self) -> None:
+        self._stop.set()
+        if self._idle_thread is not None:
+            self._idle_thread.join(timeout=5)
+            self._idle_thread = None
+        self._unsubscribe()
+        self._node = None
+
+    def _subscribe(self) -> None:
+        with self._lock:
+            if self._subscription is not None or self._node is None:
+                return
+            from rclpy.qos import qos_profile_sensor_data
+            from sensor_msgs.msg import Image
+
+            # Best-effort QoS is compatible with both reliable and best-effort publishers
+            self._subscription = self._node.create_subscription(Image, self.topic, self._on_image, qos_profile_sensor_data)
+            self.subscriptions += 1
+            logger.info(f"Frame cache subscribed to {self.topic}")
+
+    def _unsubscribe(self) -> None:
+        with self._lock:
+            if self._subscription is None:
+                return
+            try:
+                self._node.destroy_subscription(self._subscription)
+            except Exception as e:
+                logger.warning(f"Failed to drop camera subscription: {e}")
+            self._subscription = None
+            logger.info(f"Frame cache unsubscribed from {self.topic}")
+
+    def _idle_loop(self) -> None:
+        interval = min(1.0, self.idle_shutdown_s / 4)
+        while not self._stop.wait(interval):
+            # Pending waiters count as activity: they are waiting for the next frame
+            if self.subscribed and not self._waiters and time.monotonic() - self._last_access > self.idle_shutdown_s:
+                self._unsubscribe()
+
+    def touch(self) -> None:
+        """Record a consumer; re-subscribes after an idle shutdown."""
+        self._last_access = time.monotonic()
+        if self._subscription is None and self._node is not None:
+            self._subscribe()
+
+    def _on_image(self, msg: Any) -> None:
+        try:
+            encoding = msg.encoding.lower()
+            if encoding in RAW_ENCODINGS:
+                self.push(msg.data, msg.width, msg.height, msg.step, encoding)
+                return
+            if self._bridge is None:
+                from cv_bridge import CvBridge
+                self._bridge = CvBridge()
+            image = self._bridge.imgmsg_to_cv2(msg, desired_encoding="bgr8")
+            self.push(image.data, image.shape[1], image.shape[0], image.strides[0], "bgr8")
+        except Exception as e:
+            logger.warning(f"Frame cache dropped image: {e}")
+
+    def push(self, data: Any, width: int, height: int, step: int, encoding: str, captured_at: Optional[float] = None) -> None:
+        """Store a frame and wake async waiters (callable from any thread)."""
+        if not self.ring.push(data, width, height, step, encoding, captured_at or time.time()):
+            return
+        with self._lock:
+            waiters, self._waiters = self._waiters, set()
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
+    async def next_frame(self, timeout_s: float, after_seq: int = 0, newer_than: Optional[float] = None) -> Optional[CachedFrame]:
+        """Newest frame after `after_seq` / `newer_than`, waiting up to `timeout_s`; None on timeout."""
+        self.touch()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        while True:
+            future: "asyncio.Future[None]" = loop.create_future()
+            entry = (loop, future)
+            with self._lock:
+                frame = self.ring.acquire_latest(after_seq, newer_than)
+                if frame is not None:
+                    return frame
+                self._waiters.add(entry)
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    return None
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                with self._lock:
+                    self._waiters.discard(entry)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "subscribed": self.subscribed,
+            "subscriptions": self.subscriptions,
+            "frames": self.ring.frames,
+            "dropped": self.ring.dropped,
+            "seq": self.ring.seq,
+        }
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_frame_cache: Optional[CameraFrameCache] = None
+
+
+def get_frame_cache() -> CameraFrameCache:
+    """Get global camera frame cache instance."""
+    global _frame_cache
+    if _frame_cache is None:
+        settings = get_settings()
+        _frame_cache = CameraFrameCache(
+            slots=settings.camera_frame_slots,
+            idle_shutdown_s=settings.camera_idle_shutdown_s,
+        )
+    return _frame_cache
+
+
+def start_frame_cache(runtime_manager: Any) -> bool:
+    """Attach the frame cache to the runtime provider's ROS node, if there is one."""
+    if not get_settings().camera_frame_cache:
+        return False
+    provider = getattr(runtime_manager, "_provider", None)
+    try:
+        return get_frame_cache().attach(provider)
+    except Exception as e:
+        logger.warning(f"Camera frame cache unavailable, snapshots use the provider: {e}")
+        return False
+
+
+def stop_frame_cache() -> None:
+    if _frame_cache is not None:
+        _frame_cache.detach()
@@ -0,0 +1,196 @@
+"""
+Encode-once camera frame pipeline
+
+Snapshots and streams used to resize and JPEG-encode the cached frame once per
+request. The pipeline keeps one entry per distinct ``(width, height, quality)``
+profile holding the last frame encoded at that profile, and every consumer of
+the profile shares those bytes:
+
+- A camera frame is encoded at most once per profile. Consumers that ask while
+  an encode is running wait for it instead of starting their own.
+- Encoding is pulled by consumers, so a profile costs at most one encode per
+  camera frame (or per frame at the fastest viewer's rate), however many
+  viewers it has, and nothing at all once they leave.
+- Latest frame wins: a consumer always gets the newest encoded frame. A slow
+  consumer skips frames rather than queueing them.
+- Profiles unused for ``camera_pipeline_idle_s`` are evicted, and at most
+  ``camera_pipeline_max_profiles`` are kept (least recently used first;
+  profiles with an encode in flight are only evicted once it finishes).
+"""
+
+import asyncio
+import dataclasses
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+ProfileKey = Tuple[Optional[int], Optional[int], int]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Encoded:
+    seq: int
+    frame: Any  # JpegFrame
+    received: float  # monotonic time the raw frame arrived
+
+
+class _Profile:
+    __slots__ = ("key", "latest", "pending", "wait_until", "last_used", "encodes", "hits")
+
+    def __init__(self, key: ProfileKey):
+        self.key = key
+        self.latest: Optional[_Encoded] = None
+        self.pending: Optional["asyncio.Future[_Encoded]"] = None
+        # Loop time until which the pending encode waits for a frame: the
+        # latest deadline among the consumers waiting on it
+        self.wait_until = 0.0
+        self.last_used = time.monotonic()
+        self.encodes = 0
+        self.hits = 0
+
+
+class FramePipeline:
+    """Per-profile JPEG encodes of the frame cache, shared by all consumers."""
+
+    def __init__(self, idle_s: float = 10.0, max_profiles: int = 8):
+        self.idle_s = idle_s
+        self.max_profiles = max(1, max_profiles)
+        self._profiles: "OrderedDict[ProfileKey, _Profile]" = OrderedDict()
+        self.evictions = 0
+
+    def _profile(self, key: ProfileKey) -> _Profile:
+        now = time.monotonic()
+        profile = self._profiles.get(key)
+        if profile is None:
+            profile = self._profiles[key] = _Profile(key)
+        self._profiles.move_to_end(key)
+        profile.last_used = now
+        self._evict(now, keep=key)
+        return profile
+
+    def _evict(self, now: float, keep: ProfileKey) -> None:
+        # Oldest first. The requested profile and profiles with an encode in
+        # flight are kept, so the count may exceed the limit until those finish.
+        for key, profile in list(self._profiles.items()):
+            over_limit = len(self._profiles) > self.max_profiles
+            if not over_limit and now - profile.last_used <= self.idle_s:
+                break
+            if key == keep or profile.pending is not None:
+                continue
+            del self._profiles[key]
+            self.evictions += 1
+            logger.debug(f"Evicted camera profile {key}")
+
+    async def frame(
+        self,
+        cache: Any,
+        width: Optional[int],
+        height: Optional[int],
+        quality: int,
+        timeout_s: float,
+        after_seq: int = 0,
+        newer_than: Optional[float] = None,
+    ) -> Tuple[int, Any]:
+        """
+        ``(seq, JpegFrame)`` of the newest frame at this profile that is after
+        `after_seq` and captured after `newer_than` (epoch seconds), encoding
+        it only if no consumer has yet. Raises CameraError on timeout.
+        """
+        from app.utils.errors import CameraError
+
+        profile = self._profile((width, height, quality))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_s
+        waited = False
+        while True:
+            latest = profile.latest
+            if latest is not None and latest.seq > after_seq and (newer_than is None or latest.frame.timestamp.timestamp() > newer_than):
+                # Fresh if it is the newest captured frame, or the encode this caller just waited for
+                if waited or latest.seq >= cache.ring.seq:
+                    profile.hits += 1
+                    age_ms = round((time.monotonic() - latest.received) * 1000.0, 1)
+                    return latest.seq, dataclasses.replace(latest.frame, age_ms=age_ms)
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise CameraError("Snapshot timeout: no image received")
+            # A joining consumer extends the shared encode's wait to its own deadline
+            profile.wait_until = max(profile.wait_until, deadline)
+            if profile.pending is None:
+                profile.pending = asyncio.ensure_future(self._encode_next(cache, profile))
+                profile.pending.add_done_callback(_consume_exception)
+            try:
+                await asyncio.wait_for(asyncio.shield(profile.pending), remaining)
+            except asyncio.TimeoutError:
+                raise CameraError("Snapshot timeout: no image received")
+            waited = True
+
+    async def _encode_next(self, cache: Any, profile: _Profile) -> _Encoded:
+        """Encode the newest cached frame after the profile's latest one.
+
+        Waits for a frame until ``profile.wait_until``, which consumers joining
+        meanwhile may extend; each consumer times out on its own deadline.
+        """
+        from app.services.camera_frames import _encode_cached
+        from app.utils.errors import CameraError
+
+        loop = asyncio.get_running_loop()
+        try:
+            done_seq = profile.latest.seq if profile.latest is not None else 0
+            while True:
+                remaining = profile.wait_until - loop.time()
+                if remaining <= 0:
+                    raise CameraError("Snapshot timeout: no image received")
+                cached = await cache.next_frame(remaining, after_seq=done_seq)
+                if cached is not None:
+                    break
+            seq, received = cached.seq, cached.received
+            width, height, quality = profile.key
+            frame = await _encode_cached(cached, width, height, quality)
+            encoded = _Encoded(seq, frame, received)
+            profile.latest = encoded
+            profile.encodes += 1
+            return encoded
+        finally:
+            profile.pending = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "profiles": [
+                {
+                    "width": key[0],
+                    "height": key[1],
+                    "quality": key[2],
+                    "encodes": profile.encodes,
+                    "hits": profile.hits,
+                    "idle_s": round(time.monotonic() - profile.last_used, 1),
+                }
+                for key, profile in self._profiles.items()
+            ],
+            "evictions": self.evictions,
+        }
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    # Waiters that timed out no longer retrieve the result; avoid "exception never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+_frame_pipeline: Optional[FramePipeline] = None
+
+
+def get_frame_pipeline() -> FramePipeline:
+    """Get global frame pipeline instance."""
+    global _frame_pipeline
+    if _frame_pipeline is None:
+        settings = get_settings()
+        _frame_pipeline = FramePipeline(
+            idle_s=settings.camera_pipeline_idle_s,
+            max_profiles=settings.camera_pipeline_max_profiles,
+        )
+    return _frame_pipeline
@@ -0,0 +1,15 @@
+"""
+Helpers for the raw ASGI middlewares in app.middleware.
+"""
+
+from typing import Optional
+
+from starlette.types import Scope
+
+
+def get_header(scope: Scope, name: bytes) -> Optional[str]:
+    """First value of request header `name` (lower-case bytes), or None."""
+    for key, value in scope.get("headers", []):
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
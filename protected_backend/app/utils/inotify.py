@@ -0,0 +1,136 @@
+"""
+Minimal inotify file watcher (Linux only, via libc; no extra dependency)
+
+Watches a single file through its parent directory, so atomic replaces
+(write temp file + rename) are seen as well as in-place edits. The callback
+runs on a daemon thread and must be cheap; LocalConfigManager only marks its
+cached snapshot as stale.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _libc = libc
+    return _libc
+
+
+def is_available() -> bool:
+    """Whether inotify can be used on this platform."""
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return False
+    try:
+        return hasattr(_load_libc(), "inotify_init1")
+    except OSError:
+        return False
+
+
+class FileWatcher:
+    """Calls `on_change()` whenever `path` is created, modified, replaced or removed."""
+
+    def __init__(self, path: Path, on_change: Callable[[], None], poll_interval_s: float = 1.0):
+        self._path = Path(path)
+        self._name = os.fsencode(self._path.name)
+        self._on_change = on_change
+        self._poll_interval_s = poll_interval_s
+        self._fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        wd = libc.inotify_add_watch(fd, os.fsencode(str(self._path.parent)), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(err, os.strerror(err), str(self._path.parent))
+        self._fd = fd
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="config-inotify", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._poll_interval_s * 2)
+            self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _run(self) -> None:
+        fd = self._fd
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([fd], [], [], self._poll_interval_s)
+                if not readable:
+                    continue
+                data = os.read(fd, 64 * 1024)
+            except OSError as e:
+                if e.errno in (errno.EAGAIN, errno.EINTR):
+                    continue
+                logger.warning(f"inotify watcher for {self._path} stopped: {e}")
+                self._on_change()
+                return
+            if self._matches(data):
+                try:
+                    self._on_change()
+                except Exception:
+                    logger.exception("inotify change callback failed")
+
+    def _matches(self, data: bytes) -> bool:
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+            offset += _EVENT_HEADER.size + length
+            if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF) or name == self._name:
+                return True
+        return False
@@ -0,0 +1,48 @@
+"""
+Fast JSON response rendering.
+
+Uses orjson when it is installed and falls back to the stdlib encoder
+otherwise, so the backend runs unchanged on images without orjson.
+"""
+
+import json
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize `content` to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """`JSONResponse` rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def get_response_class(fast_json: bool = False) -> Type[JSONResponse]:
+    """Default response class for the application."""
+    return FastJSONResponse if fast_json and orjson is not None else JSONResponse
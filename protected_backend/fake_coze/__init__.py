@@ -0,0 +1,19 @@
+"""
+Local stand-in for the Coze Open API, for offline and reproducible tests.
+
+Run it with ``python -m fake_coze`` from the protected_backend directory and
+point the backend at it with ``TURBOPI_COZE_API_BASE=http://127.0.0.1:8090``.
+"""
+
+from fake_coze.scenario import Injection, Rule, Scenario, load_scenario
+from fake_coze.server import FAKE_BOT_ID, FAKE_WORKSPACE_ID, create_app
+
+__all__ = [
+    "FAKE_BOT_ID",
+    "FAKE_WORKSPACE_ID",
+    "Injection",
+    "Rule",
+    "Scenario",
+    "create_app",
+    "load_scenario",
+]
@@ -0,0 +1,36 @@
+"""
+Start the fake Coze API server.
+
+    cd protected_backend
+    python3 -m fake_coze --port 8090 --scenario fake_coze/scenarios/slow_stream.json
+
+Then start the backend against it:
+
+    TURBOPI_COZE_API_BASE=http://127.0.0.1:8090 python3 start_protected_backend.py
+"""
+
+import argparse
+
+import uvicorn
+
+from fake_coze.scenario import load_scenario
+from fake_coze.server import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Coze API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--scenario", help="scenario file (.json or .yaml)")
+    parser.add_argument("--seed", type=int, help="override the scenario seed")
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    if args.seed is not None:
+        scenario.seed = args.seed
+    uvicorn.run(create_app(scenario), host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
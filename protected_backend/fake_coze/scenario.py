@@ -0,0 +1,156 @@
+"""
+Fake Coze scenarios
+
+A scenario scripts how the fake Coze server misbehaves: per-route latency,
+jitter, injected failures, rate limits and the streaming token rate. Rules
+are matched in order against ``METHOD path``; every matching rule overrides
+the fields it sets on top of the scenario defaults.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class Injection(BaseModel):
+    """Behavior knobs; unset fields fall through to earlier rules / defaults."""
+    latency_ms: Optional[float] = Field(default=None, description="Delay before the response starts")
+    jitter_ms: Optional[float] = Field(default=None, description="Uniform extra delay in [0, jitter_ms]")
+    fail_rate: Optional[float] = Field(default=None, ge=0, le=1, description="Probability of an injected failure")
+    fail_every: Optional[int] = Field(default=None, ge=1, description="Fail every Nth matching request (deterministic)")
+    fail_status: Optional[int] = Field(default=None, description="HTTP status of injected failures")
+    fail_code: Optional[int] = Field(default=None, description="Coze error code of injected failures")
+    rate_limit_rps: Optional[float] = Field(default=None, gt=0, description="Token-bucket rate; excess requests get 429")
+    rate_limit_burst: Optional[int] = Field(default=None, ge=1, description="Token-bucket size")
+    first_token_ms: Optional[float] = Field(default=None, description="Chat streams: delay before the first delta")
+    tokens_per_s: Optional[float] = Field(default=None, gt=0, description="Chat streams: delta events per second")
+    stream_drop_after: Optional[int] = Field(default=None, ge=0, description="Chat streams: cut the connection after N deltas")
+    reply: Optional[str] = Field(default=None, description="Answer text streamed back by chat")
+    transcript: Optional[str] = Field(default=None, description="Text returned by audio transcriptions")
+    requires_action: Optional[bool] = Field(default=None, description="Chat streams: ask for a local plugin call first")
+
+
+class Rule(Injection):
+    """Injection applied to requests whose path matches `path` (regex)."""
+    path: str = Field(..., description="Regular expression searched in the request path")
+    method: Optional[str] = Field(default=None, description="HTTP method; any when unset")
+
+
+# Behavior when neither the scenario defaults nor a rule say otherwise.
+BASE_INJECTION = Injection(
+    latency_ms=0,
+    jitter_ms=0,
+    fail_rate=0,
+    fail_status=500,
+    fail_code=5000,
+    first_token_ms=200,
+    tokens_per_s=50,
+    reply="你好！我是运行在本地的 Coze 替身，这段回答用于离线性能测试。",
+    transcript="小车向前移动一米",
+    requires_action=False,
+)
+
+
+class Scenario(BaseModel):
+    """A complete, reproducible fake Coze behavior."""
+    seed: int = Field(default=0, description="Seed for jitter and fail_rate")
+    defaults: Injection = Field(default_factory=Injection, description="Overrides of BASE_INJECTION for every route")
+    rules: List[Rule] = Field(default_factory=list)
+
+
+def load_scenario(path: Optional[str]) -> Scenario:
+    if not path:
+        return Scenario()
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith((".yaml", ".yml")):
+        import yaml
+        return Scenario.model_validate(yaml.safe_load(text) or {})
+    return Scenario.model_validate(json.loads(text))
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class Injector:
+    """Resolves the effective injection per request and keeps counters."""
+
+    def __init__(self, scenario: Scenario) -> None:
+        self._lock = threading.Lock()
+        self.load(scenario)
+
+    def load(self, scenario: Scenario) -> None:
+        with self._lock:
+            self.scenario = scenario
+            self._rules = [(re.compile(r.path), (r.method or "").upper(), r) for r in scenario.rules]
+            self._random = random.Random(scenario.seed)
+            self._buckets: Dict[Tuple[int, str], _Bucket] = {}
+            self._seen: Dict[int, int] = {}
+            self.stats: Dict[str, Any] = {"requests": 0, "failures": 0, "rate_limited": 0, "by_path": {}}
+
+    def resolve(self, method: str, path: str) -> Tuple[Dict[str, Any], List[int]]:
+        effective = BASE_INJECTION.model_dump()
+        effective.update(self.scenario.defaults.model_dump(exclude_none=True))
+        matched: List[int] = []
+        for i, (pattern, rule_method, rule) in enumerate(self._rules):
+            if rule_method and rule_method != method:
+                continue
+            if pattern.search(path):
+                matched.append(i)
+                effective.update(rule.model_dump(exclude_unset=True, exclude={"path", "method"}))
+        return effective, matched
+
+    def decide(self, method: str, path: str) -> Tuple[Dict[str, Any], Optional[str], float]:
+        """Return ``(effective_injection, verdict, delay_s)``; verdict is None, "fail" or "rate_limited"."""
+        effective, matched = self.resolve(method, path)
+        with self._lock:
+            self.stats["requests"] += 1
+            per_path = self.stats["by_path"].setdefault(f"{method} {path}", {"requests": 0, "failures": 0, "rate_limited": 0})
+            per_path["requests"] += 1
+
+            verdict: Optional[str] = None
+            if effective.get("rate_limit_rps"):
+                key = (matched[-1] if matched else -1, path)
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    burst = effective.get("rate_limit_burst") or max(1, int(effective["rate_limit_rps"]))
+                    bucket = self._buckets[key] = _Bucket(effective["rate_limit_rps"], burst)
+                if not bucket.take():
+                    verdict = "rate_limited"
+            if verdict is None:
+                for i in matched or [-1]:
+                    self._seen[i] = self._seen.get(i, 0) + 1
+                every = effective.get("fail_every")
+                count = self._seen[matched[-1] if matched else -1]
+                if (every and count % every == 0) or self._random.random() < (effective.get("fail_rate") or 0):
+                    verdict = "fail"
+            if verdict == "fail":
+                self.stats["failures"] += 1
+                per_path["failures"] += 1
+            elif verdict == "rate_limited":
+                self.stats["rate_limited"] += 1
+                per_path["rate_limited"] += 1
+
+            delay = (effective.get("latency_ms") or 0) / 1000
+            if effective.get("jitter_ms"):
+                delay += self._random.uniform(0, effective["jitter_ms"]) / 1000
+        return effective, verdict, delay
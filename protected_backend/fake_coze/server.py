@@ -0,0 +1,428 @@
+"""
+Fake Coze API server
+
+Implements the subset of the Coze Open API that the backend calls through
+cozepy: chat (streaming and polling), conversations, file upload, audio
+speech/voices/transcriptions, bots and workspaces. Responses use the Coze
+envelope (``{"code": 0, "msg": "", "data": ...}``) and the ``x-tt-logid``
+header, and all state lives in memory with deterministic ids.
+
+Behavior is scripted by a `Scenario` (see fake_coze.scenario) and can be
+replaced at runtime through ``PUT /__fake__/scenario``.
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import struct
+import time
+import uuid
+from array import array
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from fake_coze.scenario import Injector, Scenario
+
+ADMIN_PREFIX = "/__fake__"
+FAKE_WORKSPACE_ID = "7400000000000000001"
+FAKE_BOT_ID = "7400000000000000002"
+VOICES = [
+    {"voice_id": "7426720361733046281", "name": "湾湾小何", "language_code": "zh", "language_name": "中文"},
+    {"voice_id": "7426720361733046282", "name": "开朗学长", "language_code": "zh", "language_name": "中文"},
+    {"voice_id": "7426720361733046283", "name": "Sunny", "language_code": "en", "language_name": "English"},
+]
+
+
+class FakeCozeState:
+    """In-memory objects with deterministic, Coze-looking ids."""
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(7500000000000000001)
+        self.conversations: Dict[str, Dict[str, Any]] = {}
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.chats: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.bots: Dict[str, Dict[str, Any]] = {
+            FAKE_BOT_ID: {
+                "bot_id": FAKE_BOT_ID,
+                "name": "Fake TurboPi Bot",
+                "description": "Local stand-in bot",
+                "icon_url": "",
+                "create_time": 1700000000,
+                "update_time": 1700000000,
+                "version": "1",
+                "is_published": True,
+                "workspace_id": FAKE_WORKSPACE_ID,
+            }
+        }
+
+    def new_id(self) -> str:
+        return str(next(self._ids))
+
+    def conversation(self, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+        if conversation_id and conversation_id in self.conversations:
+            return self.conversations[conversation_id]
+        conv = {"id": conversation_id or self.new_id(), "created_at": int(time.time()), "meta_data": {}, "last_section_id": self.new_id()}
+        self.conversations[conv["id"]] = conv
+        self.messages.setdefault(conv["id"], [])
+        return conv
+
+
+def ok(data: Any = None, **extra: Any) -> JSONResponse:
+    body = {"code": 0, "msg": "", **extra}
+    if data is not None:
+        body["data"] = data
+    return JSONResponse(body, headers={"x-tt-logid": uuid.uuid4().hex})
+
+
+def coze_error(status: int, code: int, msg: str) -> JSONResponse:
+    return JSONResponse({"code": code, "msg": msg}, status_code=status, headers={"x-tt-logid": uuid.uuid4().hex})
+
+
+def tokenize(text: str) -> List[str]:
+    """Split into stream deltas: words for ASCII, characters for CJK."""
+    tokens: List[str] = []
+    word = ""
+    for ch in text:
+        if ch.isascii() and not ch.isspace():
+            word += ch
+            continue
+        if word:
+            tokens.append(word)
+            word = ""
+        if tokens and ch.isspace():
+            tokens[-1] += ch
+        else:
+            tokens.append(ch)
+    if word:
+        tokens.append(word)
+    return tokens
+
+
+def wav_bytes(text: str, sample_rate: int = 16000) -> bytes:
+    """A short 16-bit mono sine tone whose length follows the text length."""
+    seconds = min(10.0, 0.1 + 0.08 * len(text))
+    n = int(sample_rate * seconds)
+    frames = array("h", (int(3000 * math.sin(2 * math.pi * 440 * i / sample_rate)) for i in range(n))).tobytes()
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + len(frames), b"WAVE", b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16, b"data", len(frames),
+    )
+    return header + frames
+
+
+def sse(event: str, data: Any) -> bytes:
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+    return f"event:{event}\ndata:{payload}\n\n".encode("utf-8")
+
+
+def create_app(scenario: Optional[Scenario] = None) -> FastAPI:
+    """Build the fake Coze application for `scenario` (defaults when None)."""
+    app = FastAPI(title="Fake Coze API", docs_url=None, redoc_url=None)
+    state = FakeCozeState()
+    injector = Injector(scenario or Scenario())
+    app.state.fake = state
+    app.state.injector = injector
+
+    @app.middleware("http")
+    async def inject(request: Request, call_next):
+        if request.url.path.startswith(ADMIN_PREFIX):
+            return await call_next(request)
+        effective, verdict, delay = injector.decide(request.method, request.url.path)
+        request.state.injection = effective
+        if delay:
+            await asyncio.sleep(delay)
+        if verdict == "rate_limited":
+            return coze_error(429, 4013, "fake coze: rate limit exceeded")
+        if verdict == "fail":
+            return coze_error(effective["fail_status"] or 500, effective["fail_code"] or 5000, "fake coze: injected failure")
+        return await call_next(request)
+
+    # Admin
+
+    @app.get(f"{ADMIN_PREFIX}/scenario")
+    async def get_scenario():
+        return injector.scenario.model_dump()
+
+    @app.put(f"{ADMIN_PREFIX}/scenario")
+    async def put_scenario(new: Scenario):
+        injector.load(new)
+        return {"ok": True}
+
+    @app.get(f"{ADMIN_PREFIX}/stats")
+    async def get_stats():
+        return injector.stats
+
+    @app.post(f"{ADMIN_PREFIX}/reset")
+    async def reset():
+        injector.load(injector.scenario)
+        return {"ok": True}
+
+    # Chat
+
+    def chat_object(chat_id: str, conversation_id: str, bot_id: str, status: str, **extra: Any) -> Dict[str, Any]:
+        return {
+            "id": chat_id,
+            "conversation_id": conversation_id,
+            "bot_id": bot_id,
+            "created_at": int(time.time()),
+            "status": status,
+            **extra,
+        }
+
+    def message_object(chat: Dict[str, Any], content: str, msg_type: str = "answer", msg_id: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "id": msg_id or state.new_id(),
+            "conversation_id": chat["conversation_id"],
+            "bot_id": chat["bot_id"],
+            "chat_id": chat["id"],
+            "role": "assistant",
+            "type": msg_type,
+            "content": content,
+            "content_type": "text",
+            "created_at": int(time.time()),
+            "meta_data": {},
+        }
+
+    async def answer_stream(chat: Dict[str, Any], injection: Dict[str, Any]) -> AsyncIterator[bytes]:
+        reply = injection["reply"] or ""
+        tokens = tokenize(reply)
+        interval = 1.0 / injection["tokens_per_s"] if injection.get("tokens_per_s") else 0.0
+        msg_id = state.new_id()
+        await asyncio.sleep((injection.get("first_token_ms") or 0) / 1000)
+        drop_after = injection.get("stream_drop_after")
+        for i, token in enumerate(tokens):
+            if drop_after is not None and i >= drop_after:
+                raise ConnectionResetError("fake coze: stream dropped")
+            yield sse("conversation.message.delta", message_object(chat, token, msg_id=msg_id))
+            if interval:
+                await asyncio.sleep(interval)
+        answer = message_object(chat, reply, msg_id=msg_id)
+        state.messages.setdefault(chat["conversation_id"], []).append(answer)
+        yield sse("conversation.message.completed", answer)
+        yield sse("conversation.message.completed", message_object(chat, "", msg_type="verbose"))
+        chat.update(status="completed", completed_at=int(time.time()), usage={
+            "token_count": len(tokens) + 16, "output_count": len(tokens), "input_count": 16,
+        })
+        yield sse("conversation.chat.completed", chat)
+        yield sse("done", '"[DONE]"')
+
+    async def chat_stream(chat: Dict[str, Any], injection: Dict[str, Any]) -> AsyncIterator[bytes]:
+        yield sse("conversation.chat.created", chat)
+        yield sse("conversation.chat.in_progress", chat)
+        if injection.get("requires_action") and not chat.get("tool_outputs"):
+            chat.update(status="requires_action", required_action={
+                "type": "submit_tool_outputs",
+                "submit_tool_outputs": {"tool_calls": [{
+                    "id": state.new_id(),
+                    "type": "function",
+                    "function": {"name": "get_robot_state", "arguments": "{}"},
+                }]},
+            })
+            yield sse("conversation.chat.requires_action", chat)
+            yield sse("done", '"[DONE]"')
+            return
+        async for chunk in answer_stream(chat, injection):
+            yield chunk
+
+    def event_stream(body: AsyncIterator[bytes]) -> StreamingResponse:
+        return StreamingResponse(body, media_type="text/event-stream", headers={"x-tt-logid": uuid.uuid4().hex})
+
+    @app.post("/v3/chat")
+    async def create_chat(request: Request):
+        body = await request.json()
+        conversation = state.conversation(request.query_params.get("conversation_id"))
+        for m in body.get("additional_messages") or []:
+            state.messages[conversation["id"]].append(dict(m, id=state.new_id(), conversation_id=conversation["id"]))
+        chat = chat_object(state.new_id(), conversation["id"], body.get("bot_id") or FAKE_BOT_ID, "in_progress")
+        state.chats[chat["id"]] = chat
+        injection = request.state.injection
+        if body.get("stream"):
+            return event_stream(chat_stream(chat, injection))
+        # Polling mode: the answer is ready immediately for /v3/chat/retrieve.
+        async for _ in answer_stream(dict(chat), dict(injection, first_token_ms=0, tokens_per_s=None)):
+            pass
+        chat.update(status="completed", completed_at=int(time.time()))
+        return ok(chat_object(chat["id"], chat["conversation_id"], chat["bot_id"], "in_progress"))
+
+    @app.post("/v3/chat/submit_tool_outputs")
+    async def submit_tool_outputs(request: Request):
+        body = await request.json()
+        chat = state.chats.get(request.query_params.get("chat_id", ""))
+        if chat is None:
+            return coze_error(200, 4200, "chat not found")
+        chat.update(status="in_progress", tool_outputs=body.get("tool_outputs") or [])
+        chat.pop("required_action", None)
+        if body.get("stream"):
+            return event_stream(answer_stream(chat, request.state.injection))
+        async for _ in answer_stream(chat, dict(request.state.injection, first_token_ms=0, tokens_per_s=None)):
+            pass
+        return ok(chat)
+
+    @app.get("/v3/chat/retrieve")
+    async def retrieve_chat(request: Request):
+        chat = state.chats.get(request.query_params.get("chat_id", ""))
+        return ok(chat) if chat else coze_error(200, 4200, "chat not found")
+
+    @app.get("/v3/chat/message/list")
+    @app.post("/v3/chat/message/list")
+    async def list_chat_messages(request: Request):
+        chat_id = request.query_params.get("chat_id", "")
+        conv_id = request.query_params.get("conversation_id", "")
+        return ok([m for m in state.messages.get(conv_id, []) if m.get("chat_id") == chat_id])
+
+    # Conversations
+
+    @app.post("/v1/conversation/create")
+    async def create_conversation(request: Request):
+        body = await request.json() if await request.body() else {}
+        conversation = state.conversation()
+        for m in body.get("messages") or []:
+            state.messages[conversation["id"]].append(dict(m, id=state.new_id(), conversation_id=conversation["id"]))
+        return ok(conversation)
+
+    @app.get("/v1/conversation/retrieve")
+    async def retrieve_conversation(conversation_id: str):
+        conversation = state.conversations.get(conversation_id)
+        return ok(conversation) if conversation else coze_error(200, 4101, "conversation not found")
+
+    @app.delete("/v1/conversations/{conversation_id}")
+    async def delete_conversation(conversation_id: str):
+        state.conversations.pop(conversation_id, None)
+        state.messages.pop(conversation_id, None)
+        return ok({})
+
+    @app.post("/v1/conversations/{conversation_id}/clear")
+    async def clear_conversation(conversation_id: str):
+        state.messages[conversation_id] = []
+        return ok({"id": state.new_id(), "conversation_id": conversation_id})
+
+    @app.post("/v1/conversation/message/list")
+    async def list_messages(conversation_id: str):
+        return ok(list(reversed(state.messages.get(conversation_id, []))), first_id="", last_id="", has_more=False)
+
+    # Files
+
+    @app.post("/v1/files/upload")
+    async def upload_file(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            return coze_error(200, 4000, "file is required")
+        data = await upload.read()
+        info = {"id": state.new_id(), "bytes": len(data), "created_at": int(time.time()), "file_name": upload.filename or "file"}
+        state.files[info["id"]] = info
+        return ok(info)
+
+    @app.get("/v1/files/retrieve")
+    async def retrieve_file(file_id: str):
+        info = state.files.get(file_id)
+        return ok(info) if info else coze_error(200, 4000, "file not found")
+
+    # Audio
+
+    @app.post("/v1/audio/speech")
+    async def speech(request: Request):
+        body = await request.json()
+        fmt = (body.get("response_format") or "mp3").lower()
+        media = {"wav": "audio/wav", "pcm": "audio/pcm", "ogg_opus": "audio/ogg", "mp3": "audio/mpeg"}.get(fmt, "application/octet-stream")
+        return Response(wav_bytes(body.get("input") or ""), media_type=media, headers={"x-tt-logid": uuid.uuid4().hex})
+
+    @app.get("/v1/audio/voices")
+    async def list_voices(page_num: int = 1, page_size: int = 100):
+        start = (max(page_num, 1) - 1) * page_size
+        page = VOICES[start:start + page_size]
+        return ok({"voice_list": page, "has_more": start + page_size < len(VOICES)})
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or not hasattr(upload, "read"):
+            return coze_error(200, 4000, "file is required")
+        await upload.read()
+        return ok({"text": request.state.injection["transcript"]})
+
+    # Bots
+
+    def bot_payload(body: Dict[str, Any], bot_id: str) -> Dict[str, Any]:
+        bot = state.bots.get(bot_id) or {"bot_id": bot_id, "create_time": int(time.time()), "version": "0", "is_published": False}
+        bot.update({k: v for k, v in body.items() if k not in ("bot_id", "space_id")})
+        bot["workspace_id"] = body.get("space_id") or bot.get("workspace_id") or FAKE_WORKSPACE_ID
+        bot["update_time"] = int(time.time())
+        state.bots[bot_id] = bot
+        return bot
+
+    @app.post("/v1/bot/create")
+    async def create_bot(request: Request):
+        bot = bot_payload(await request.json(), state.new_id())
+        return ok({"bot_id": bot["bot_id"]})
+
+    @app.post("/v1/bot/update")
+    async def update_bot(request: Request):
+        body = await request.json()
+        if body.get("bot_id") not in state.bots:
+            return coze_error(200, 4200, "bot not found")
+        bot_payload(body, body["bot_id"])
+        return ok({})
+
+    @app.post("/v1/bot/publish")
+    async def publish_bot(request: Request):
+        body = await request.json()
+        bot = state.bots.get(body.get("bot_id", ""))
+        if bot is None:
+            return coze_error(200, 4200, "bot not found")
+        bot.update(is_published=True, version=str(int(bot.get("version") or 0) + 1))
+        return ok({"bot_id": bot["bot_id"], "version": bot["version"]})
+
+    @app.post("/v1/bots/{bot_id}/unpublish")
+    async def unpublish_bot(bot_id: str):
+        bot = state.bots.get(bot_id)
+        if bot is None:
+            return coze_error(200, 4200, "bot not found")
+        bot["is_published"] = False
+        return ok({})
+
+    @app.get("/v1/bot/get_online_info")
+    async def get_online_info(bot_id: str):
+        bot = state.bots.get(bot_id)
+        return ok(bot) if bot else coze_error(200, 4200, "bot not found")
+
+    @app.get("/v1/bots/{bot_id}")
+    async def retrieve_bot(bot_id: str):
+        bot = state.bots.get(bot_id)
+        return ok(bot) if bot else coze_error(200, 4200, "bot not found")
+
+    @app.get("/v1/space/published_bots_list")
+    async def published_bots(space_id: str = FAKE_WORKSPACE_ID, page_index: int = 1, page_size: int = 20):
+        bots = [b for b in state.bots.values() if b.get("is_published")]
+        items = [{"bot_id": b["bot_id"], "bot_name": b.get("name", ""), "description": b.get("description", ""),
+                  "icon_url": b.get("icon_url", ""), "publish_time": str(b.get("update_time", 0))} for b in bots]
+        start = (max(page_index, 1) - 1) * page_size
+        return ok({"space_bots": items[start:start + page_size], "total": len(items)})
+
+    @app.get("/v1/bots")
+    async def list_bots(workspace_id: str = FAKE_WORKSPACE_ID, page_num: int = 1, page_size: int = 20):
+        bots = list(state.bots.values())
+        start = (max(page_num, 1) - 1) * page_size
+        items = [{"id": b["bot_id"], "name": b.get("name", ""), "description": b.get("description", ""),
+                  "icon_url": b.get("icon_url", ""), "is_published": b.get("is_published", False),
+                  "updated_at": b.get("update_time", 0)} for b in bots[start:start + page_size]]
+        return ok({"items": items, "total": len(bots)})
+
+    # Workspaces
+
+    @app.get("/v1/workspaces")
+    async def list_workspaces():
+        return ok({"workspaces": [{
+            "id": FAKE_WORKSPACE_ID,
+            "name": "Fake Workspace",
+            "icon_url": "",
+            "role_type": "owner",
+            "workspace_type": "personal",
+        }], "total_count": 1})
+
+    return app
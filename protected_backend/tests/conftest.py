@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def config_env(tmp_path, monkeypatch):
+    """Fresh config singletons backed by a config file under `tmp_path`."""
+    import app.config as config
+
+    monkeypatch.setenv("TURBOPI_CONFIG_PATH", str(tmp_path / "config.json"))
+    monkeypatch.setenv("TURBOPI_CONFIG_FSYNC", "always")
+    config.get_settings.cache_clear()
+    monkeypatch.setattr(config, "_local_config_manager", None)
+    monkeypatch.setattr(config, "_config_service", None)
+    yield config
+    config.shutdown_config_executor()
+    if config._local_config_manager is not None:
+        config._local_config_manager.stop_watching()
+    config.get_settings.cache_clear()
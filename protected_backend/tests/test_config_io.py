@@ -0,0 +1,91 @@
+"""
+Config writes must not stall the event loop.
+
+Mounts the config router next to a stub ``POST /control/move`` and slows every
+config file write down with ``TURBOPI_CONFIG_WRITE_DELAY_MS``. While PATCHes
+are in flight, /control/move must still answer well within one write delay.
+"""
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+WRITE_DELAY_MS = 200
+
+
+def _build_app() -> FastAPI:
+    from app.routers import config as config_router
+
+    app = FastAPI()
+    app.include_router(config_router.router, prefix="/api/v1")
+
+    @app.post("/control/move")
+    async def move():
+        return {"success": True}
+
+    return app
+
+
+async def _move_latencies(client: httpx.AsyncClient, count: int) -> list:
+    # Includes a short pause before each move: with the in-process transport a
+    # blocked loop shows up there rather than inside the request
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        resp = await client.post("/control/move", json={"command": "forward"})
+        latencies.append((time.perf_counter() - started) * 1000 - 10)
+        assert resp.status_code == 200
+    return latencies
+
+
+def test_control_move_not_blocked_by_config_writes(config_env, monkeypatch):
+    monkeypatch.setenv("TURBOPI_CONFIG_WRITE_DELAY_MS", str(WRITE_DELAY_MS))
+    config_env.get_settings.cache_clear()
+    app = _build_app()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=30) as client:
+            patches = []
+
+            async def patch_loop(count):
+                for i in range(count):
+                    resp = await client.patch("/api/v1/config/", json={"telemetry_enabled": i % 2 == 0})
+                    patches.append(resp.status_code)
+                    # The in-process transport never suspends on its own
+                    await asyncio.sleep(0)
+
+            writers = [asyncio.ensure_future(patch_loop(5)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            latencies = await _move_latencies(client, 20)
+            await asyncio.gather(*writers)
+            return latencies, patches
+
+    latencies, patches = asyncio.run(run())
+
+    assert patches and all(status == 200 for status in patches)
+    assert max(latencies) < WRITE_DELAY_MS / 2, latencies
+
+
+def test_get_config_version_matches_body(config_env):
+    from app.services.config_feed import config_etag
+
+    app = _build_app()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.patch("/api/v1/config/", json={"telemetry_enabled": True})
+            resp = await client.get("/api/v1/config/", params={"include_secrets": True})
+            again = await client.get("/api/v1/config/", headers={"If-None-Match": resp.headers["ETag"]})
+            return resp, again
+
+    resp, again = asyncio.run(run())
+
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] == config_etag(config_env.get_config_service().feed.snapshot()[2])
+    assert again.status_code == 304
+    assert again.headers["X-Config-Version"] == resp.headers["X-Config-Version"]
@@ -0,0 +1,84 @@
+"""Group commit of LocalConfigManager under TURBOPI_CONFIG_FSYNC=always."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.config import ConfigFsyncPolicy, LocalConfigManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = LocalConfigManager(str(tmp_path / "config.json"), fsync_policy=ConfigFsyncPolicy.ALWAYS)
+    manager.write_config({"a": 0, "b": 0})
+    yield manager
+    manager.stop_watching()
+
+
+def _file(manager):
+    with open(manager._config_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_concurrent_writes_share_a_flush(tmp_path):
+    manager = LocalConfigManager(
+        str(tmp_path / "config.json"), fsync_policy=ConfigFsyncPolicy.ALWAYS, write_delay_ms=50
+    )
+    manager.write_config({})
+    threads = [threading.Thread(target=manager.merge_config, args=({f"k{i}": i},)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert _file(manager) == {f"k{i}": i for i in range(8)}
+    assert manager.write_stats["writes"] == 9
+    assert manager.write_stats["flushes"] < 9
+
+
+def test_failed_flush_fails_every_write_built_on_it(manager, monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def failing_write(data, fsync=True):
+        entered.set()
+        release.wait()
+        raise OSError("card removed")
+
+    monkeypatch.setattr(manager, "_atomic_write", failing_write)
+    errors = {}
+
+    def merge(key):
+        try:
+            manager.merge_config({key: 1})
+        except OSError as e:
+            errors[key] = e
+
+    first = threading.Thread(target=merge, args=("a",))
+    first.start()
+    assert entered.wait(5)
+    # Staged on top of "a" while its flush is still running
+    second = threading.Thread(target=merge, args=("b",))
+    second.start()
+    time.sleep(0.1)
+    # Plain reads see what is on disk, not the staged writes
+    assert manager.read_config() == {"a": 0, "b": 0}
+
+    release.set()
+    first.join()
+    second.join()
+    assert set(errors) == {"a", "b"}
+
+    monkeypatch.undo()
+    assert manager.read_config() == {"a": 0, "b": 0}
+    manager.merge_config({"c": 1})
+    assert _file(manager) == {"a": 0, "b": 0, "c": 1}
+
+
+def test_listeners_only_see_written_configs(manager):
+    seen = []
+    manager.add_listener(seen.append)
+    manager.merge_config({"a": 1})
+    assert seen[-1] == {"a": 1, "b": 0}
+    assert _file(manager) == seen[-1]
@@ -5,6 +5,8 @@ export default function CameraSnapshotPanel() {
   const [width, setWidth] = useState<string>('')
   const [height, setHeight] = useState<string>('')
   const [quality, setQuality] = useState<string>('90')
+  const [fps, setFps] = useState<string>('15')
+  const [streamUrl, setStreamUrl] = useState<string | null>(null)
 
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string | null>(null)
@@ -33,13 +35,30 @@ export default function CameraSnapshotPanel() {
     }
   }
 
+  const toggleStream = () => {
+    if (streamUrl) {
+      // Dropping the <img> closes the MJPEG connection
+      setStreamUrl(null)
+      return
+    }
+    setError(null)
+    setStreamUrl(
+      api.cameraStreamUrl({
+        fps: fps ? Number(fps) : undefined,
+        width: width ? Number(width) : undefined,
+        height: height ? Number(height) : undefined,
+        quality: quality ? Number(quality) : undefined,
+      })
+    )
+  }
+
   const base64 = result?.snapshot?.base64
 
   return (
     <div style={{ display: 'grid', gap: 16 }}>
       <h2>相机快照测试</h2>
 
-      <div style={{ display: 'grid', gap: 12, gridTemplateColumns: '1fr 1fr 1fr' }}>
+      <div style={{ display: 'grid', gap: 12, gridTemplateColumns: '1fr 1fr 1fr 1fr' }}>
         <label style={{ display: 'grid', gap: 6 }}>
           <span>宽度（可选）</span>
           <input
@@ -72,15 +91,41 @@ export default function CameraSnapshotPanel() {
             style={{ padding: '6px 8px' }}
           />
         </label>
+
+        <label style={{ display: 'grid', gap: 6 }}>
+          <span>实时画面帧率（1–60）</span>
+          <input
+            value={fps}
+            onChange={(e) => setFps(e.target.value)}
+            placeholder="15"
+            inputMode="numeric"
+            style={{ padding: '6px 8px' }}
+          />
+        </label>
       </div>
 
       <div style={{ display: 'flex', gap: 8, alignItems: 'center' }}>
         <button disabled={!canSubmit} onClick={handleCapture}>
           {loading ? '正在拍摄...' : '拍摄快照'}
         </button>
+        <button onClick={toggleStream}>{streamUrl ? '停止实时画面' : '实时画面'}</button>
         {error && <span style={{ color: 'red' }}>{error}</span>}
       </div>
 
+      {streamUrl && (
+        <div style={{ border: '1px solid #ddd', padding: 8 }}>
+          <img
+            src={streamUrl}
+            alt="Camera stream"
+            onError={() => {
+              setStreamUrl(null)
+              setError('实时画面连接失败')
+            }}
+            style={{ maxWidth: '100%', height: 'auto' }}
+          />
+        </div>
+      )}
+
       {base64 && (
         <div style={{ display: 'grid', gap: 12 }}>
           <div style={{ display: 'flex', gap: 12, alignItems: 'center', flexWrap: 'wrap' }}>
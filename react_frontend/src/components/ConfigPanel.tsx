@@ -29,6 +29,22 @@ export function ConfigPanel() {
     loadConfig()
   }, [includeSecrets])
 
+  // Keep the displayed configuration current without polling
+  useEffect(() => {
+    return api.watchConfig((event) => {
+      if (event.type === 'snapshot') {
+        setConfig(event.config)
+      } else {
+        setConfig((prev) => {
+          if (!prev) return prev
+          const next: Record<string, any> = { ...prev, ...event.changed }
+          event.removed.forEach((key) => delete next[key])
+          return next as ConfigData
+        })
+      }
+    }, includeSecrets)
+  }, [includeSecrets])
+
   const loadConfig = async () => {
     setLoading(true)
     setError(null)
@@ -165,6 +165,11 @@ export type ConfigSchema = {
   required?: string[]
 }
 
+// Events of GET /api/v1/config/watch (SSE); the event id is the config version
+export type ConfigWatchEvent =
+  | { type: 'snapshot'; version: number; etag: string; config: ConfigData }
+  | { type: 'change'; version: number; etag: string; changed: Partial<ConfigData>; removed: string[] }
+
 // Coze Conversations API types
 export type ConversationMessage = {
   role: 'user' | 'assistant'
@@ -260,6 +265,13 @@ export type CameraSnapshotRequest = {
   quality?: number
 }
 
+export type CameraStreamOptions = {
+  fps?: number
+  width?: number
+  height?: number
+  quality?: number
+}
+
 export type CameraSnapshotData = {
   snapshot: {
     saved_path: string
@@ -463,6 +475,22 @@ export const api = {
   getConfigWithSecrets: () =>
     request<ConfigResponse['data']>('/api/v1/config/secrets'),
 
+  // Push configuration changes instead of polling getConfig(); returns an unsubscribe function.
+  // EventSource reconnects by itself and resumes from the last version via Last-Event-ID.
+  watchConfig: (onEvent: (event: ConfigWatchEvent) => void, includeSecrets = false) => {
+    const source = new EventSource(`${BASE_URL}/api/v1/config/watch?stream=true&include_secrets=${includeSecrets}`)
+    const handler = (e: MessageEvent) => {
+      try {
+        onEvent(JSON.parse(e.data) as ConfigWatchEvent)
+      } catch (err) {
+        console.warn('⚠️ [ConfigWatch] Failed to parse event:', e.data, err)
+      }
+    }
+    source.addEventListener('snapshot', handler as EventListener)
+    source.addEventListener('change', handler as EventListener)
+    return () => source.close()
+  },
+
   // Coze Conversations
   createConversation: (data: ConversationCreateRequest) =>
     request<ConversationResponse>('/api/v1/coze/conversations/', {
@@ -666,6 +694,16 @@ export const api = {
       body: JSON.stringify(data),
     }),
 
+  // Camera Stream: MJPEG URL for an <img> tag (one connection, frames pushed by the server)
+  cameraStreamUrl: (options: CameraStreamOptions = {}) => {
+    const params = new URLSearchParams()
+    for (const [key, value] of Object.entries(options)) {
+      if (value !== undefined) params.set(key, String(value))
+    }
+    const query = params.toString()
+    return `${BASE_URL}/api/v1/camera/stream${query ? `?${query}` : ''}`
+  },
+
   // Buzzer Set
   buzzerSet: (data: BuzzerSetRequest) =>
     request<BuzzerSetData>('/api/v1/buzzer/set', {
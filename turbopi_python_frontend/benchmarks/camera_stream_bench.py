@@ -0,0 +1,129 @@
+"""
+摄像头实时画面基准：对比循环快照与 MJPEG 流（`GET /api/v1/camera/stream`）能达到的帧率。
+
+需要 ROS2 模式下正在运行的后端（模拟模式不支持摄像头）。依次测量：
+- `snapshot`：循环调用 `camera.snapshot()`（JSON + Base64，每帧一次请求）
+- `snapshot_bytes`：循环调用 `camera.snapshot_bytes()`（原始 JPEG，每帧一次请求）
+- `frames`：`camera.frames()` 读取 MJPEG 流（一个连接，服务端推送）
+- `frames xN`：N 个并发观看者同时读取 MJPEG 流（`--viewers`，可给多个值）
+
+输出每种方式的帧率（多观看者时为最慢者）、平均帧大小与帧间隔 p95。同尺寸、同质量的观看者
+共享后端的同一次编码，观看者增多时每人的帧率应保持不变；可在机器人上用 `top` 观察后端 CPU。
+
+用法：
+    cd turbopi_python_frontend
+    pip install requests httpx
+    python3 benchmarks/camera_stream_bench.py --url http://<机器人IP>:8000
+    python3 benchmarks/camera_stream_bench.py --url http://<机器人IP>:8000 --fps 30 --width 640 --height 480 --viewers 1 4 16
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_bench import percentile  # noqa: E402
+from turbopi_sdk import camera  # noqa: E402
+from turbopi_sdk.aio import camera as aio_camera  # noqa: E402
+from turbopi_sdk.aio.client import AsyncTurboPiClient  # noqa: E402
+from turbopi_sdk.aio.client import set_default_client as set_async_default_client  # noqa: E402
+from turbopi_sdk.client import TurboPiClient, set_default_client  # noqa: E402
+
+
+def summarize(stamps: List[float], sizes: List[int]) -> Dict[str, Any]:
+    gaps = sorted((b - a) * 1000 for a, b in zip(stamps, stamps[1:]))
+    wall = stamps[-1] - stamps[0] if len(stamps) > 1 else 0.0
+    return {
+        "frames": len(stamps),
+        "fps": round((len(stamps) - 1) / wall, 1) if wall > 0 else 0.0,
+        "avg_kb": round(sum(sizes) / len(sizes) / 1024, 1) if sizes else 0.0,
+        "gap_p95_ms": percentile(gaps, 95),
+    }
+
+
+def measure(frames: Iterable[Any], size: Callable[[Any], int], duration: float) -> Dict[str, Any]:
+    stamps: List[float] = []
+    sizes: List[int] = []
+    deadline = time.perf_counter() + duration
+    for frame in frames:
+        stamps.append(time.perf_counter())
+        sizes.append(size(frame))
+        if stamps[-1] >= deadline:
+            break
+    return summarize(stamps, sizes)
+
+
+def looped(call: Callable[[], Any]) -> Iterable[Any]:
+    while True:
+        yield call()
+
+
+async def measure_viewers(args: argparse.Namespace, viewers: int) -> Dict[str, Any]:
+    async with AsyncTurboPiClient(base_url=args.url, timeout=30, pool_maxsize=viewers + 2) as client:
+        set_async_default_client(client)
+
+        async def viewer() -> Dict[str, Any]:
+            stamps: List[float] = []
+            sizes: List[int] = []
+            deadline = time.perf_counter() + args.duration
+            stream = aio_camera.frames(fps=args.fps, width=args.width, height=args.height, quality=args.quality)
+            try:
+                async for jpeg in stream:
+                    stamps.append(time.perf_counter())
+                    sizes.append(len(jpeg))
+                    if stamps[-1] >= deadline:
+                        break
+            finally:
+                await stream.aclose()
+            return summarize(stamps, sizes)
+
+        results = await asyncio.gather(*(viewer() for _ in range(viewers)))
+        set_async_default_client(None)
+    return {
+        "frames": sum(r["frames"] for r in results),
+        "fps": round(min(r["fps"] for r in results), 1),
+        "avg_kb": results[0]["avg_kb"],
+        "gap_p95_ms": max((r["gap_p95_ms"] or 0.0) for r in results),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", required=True, help="backend base URL, e.g. http://192.168.1.10:8000")
+    ap.add_argument("--fps", type=float, default=30.0, help="frame rate requested from the stream")
+    ap.add_argument("--width", type=int, default=640)
+    ap.add_argument("--height", type=int, default=480)
+    ap.add_argument("--quality", type=int, default=80)
+    ap.add_argument("--duration", type=float, default=10.0, help="seconds per method")
+    ap.add_argument("--viewers", type=int, nargs="*", default=[4], help="concurrent stream viewers, one run per value")
+    ap.add_argument("--out", help="write results JSON here")
+    args = ap.parse_args()
+
+    set_default_client(TurboPiClient(base_url=args.url, timeout=30))
+    size_kw = {"width": args.width, "height": args.height, "quality": args.quality}
+    results: Dict[str, Any] = {
+        "snapshot": measure(looped(lambda: camera.snapshot(**size_kw)), lambda r: len(json.dumps(r)), args.duration),
+        "snapshot_bytes": measure(looped(lambda: camera.snapshot_bytes(**size_kw)), len, args.duration),
+        "frames": measure(camera.frames(fps=args.fps, **size_kw), len, args.duration),
+    }
+    for viewers in args.viewers:
+        results[f"frames x{viewers}"] = asyncio.run(measure_viewers(args, viewers))
+
+    print(f"{args.width}x{args.height} q{args.quality}, stream fps={args.fps:g}")
+    print(f"  {'method':<16} {'frames':>7} {'fps':>7} {'avg KB':>8} {'gap p95':>9}")
+    for name, r in results.items():
+        print(f"  {name:<16} {r['frames']:>7} {r['fps']:>7} {r['avg_kb']:>8} {r['gap_p95_ms']!s:>9}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"meta": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+配置写入不阻塞事件循环的回归检查：慢速配置写入期间 `/control/move` 的延迟不应上升。
+
+以 `macbook_sim` 模式启动后端，使用临时配置文件、`TURBOPI_CONFIG_FSYNC=always`，
+并通过 `TURBOPI_CONFIG_WRITE_DELAY_MS` 让每次配置写盘额外耗时（模拟慢速 SD 卡）：
+1. 基线：仅并发调用 `POST /control/move`，统计延迟；
+2. 干扰：同时持续发送 `PATCH /api/v1/config/`，再次统计 `/control/move` 延迟。
+
+配置 I/O 若仍在事件循环上执行，每次写入都会让并发的控制命令多等待约一个写盘耗时；
+放到专用线程池后两组延迟应基本一致。第二组 p95 比基线高出 `--max-added-ms` 以上时
+以退出码 1 结束。
+
+用法：
+    cd turbopi_python_frontend
+    pip install httpx
+    python3 benchmarks/config_io_bench.py
+    python3 benchmarks/config_io_bench.py --write-delay-ms 300 --requests 300 --max-added-ms 15
+    python3 benchmarks/config_io_bench.py --url http://192.168.3.80:8000   # 真实 SD 卡，不注入延迟
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_bench import free_port, percentile, start_backend, wait_ready  # noqa: E402
+from turbopi_sdk.aio import AsyncTurboPiClient  # noqa: E402
+
+MOVE = {"command": "forward", "speed": 0.1, "duration_ms": 50}
+
+
+async def measure_moves(client: AsyncTurboPiClient, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            resp = await client.request("POST", "/control/move", json=MOVE, headers={"X-Trace-ID": str(uuid.uuid4())})
+            latencies.append((time.perf_counter() - started) * 1000)
+            if resp.status_code >= 400:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "max": round(latencies[-1], 3) if latencies else None,
+    }
+
+
+async def write_config(client: AsyncTurboPiClient, stop: asyncio.Event, stats: Dict[str, Any]) -> None:
+    i = 0
+    while not stop.is_set():
+        i += 1
+        started = time.perf_counter()
+        resp = await client.request("PATCH", "/api/v1/config/", json={"notes": f"config_io_bench {i}"})
+        stats["latencies"].append((time.perf_counter() - started) * 1000)
+        if resp.status_code >= 400:
+            stats["errors"] += 1
+
+
+async def run(args: argparse.Namespace) -> int:
+    proc: Optional[subprocess.Popen] = None
+    url = args.url
+    tmp = tempfile.TemporaryDirectory()
+    if url is None:
+        port = free_port()
+        proc = start_backend(port, {
+            "TURBOPI_CONFIG_PATH": str(Path(tmp.name) / "config.json"),
+            "TURBOPI_CONFIG_FSYNC": "always",
+            "TURBOPI_CONFIG_WRITE_DELAY_MS": str(args.write_delay_ms),
+        })
+        url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(url, proc, args.startup_timeout)
+        async with AsyncTurboPiClient(base_url=url, timeout=30, pool_maxsize=args.concurrency + args.writers + 2) as client:
+            original = ((await client.get("/api/v1/config/")).get("data") or {}).get("config", {}).get("notes")
+            await measure_moves(client, args.warmup, args.concurrency)
+            baseline = await measure_moves(client, args.requests, args.concurrency)
+
+            stop = asyncio.Event()
+            writes: Dict[str, Any] = {"latencies": [], "errors": 0}
+            writers = [asyncio.create_task(write_config(client, stop, writes)) for _ in range(args.writers)]
+            await asyncio.sleep(0.05)
+            loaded = await measure_moves(client, args.requests, args.concurrency)
+            stop.set()
+            await asyncio.gather(*writers)
+            if args.url is not None:
+                await client.request("PATCH", "/api/v1/config/", json={"notes": original})
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        tmp.cleanup()
+
+    write_lat = sorted(writes["latencies"])
+    print(f"{'phase':<28} {'n':>6} {'err':>5} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name, r in (("control_move", baseline), ("control_move + config PATCH", loaded)):
+        print(f"{name:<28} {r['requests']:>6} {r['errors']:>5} {r['p50']:>9} {r['p95']:>9} {r['max']:>9}")
+    print(
+        f"{'config PATCH':<28} {len(write_lat):>6} {writes['errors']:>5}"
+        f" {percentile(write_lat, 50)!s:>9} {percentile(write_lat, 95)!s:>9} {(round(write_lat[-1], 3) if write_lat else None)!s:>9}"
+    )
+
+    added = (loaded["p95"] or 0) - (baseline["p95"] or 0)
+    if added > args.max_added_ms:
+        print(f"FAIL: config writes added {added:.1f} ms to control_move p95 (allowed {args.max_added_ms} ms)")
+        return 1
+    print(f"OK: control_move p95 changed by {added:+.1f} ms while config writes were in flight")
+    return 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", help="check a running backend instead of starting one (no write delay is injected)")
+    ap.add_argument("--write-delay-ms", type=int, default=200, help="emulated duration of one config file write")
+    ap.add_argument("--requests", type=int, default=200, help="control_move calls per phase")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--writers", type=int, default=2, help="concurrent PATCH loops during the second phase")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--max-added-ms", type=float, default=25.0, help="allowed control_move p95 increase")
+    ap.add_argument("--startup-timeout", type=float, default=30.0)
+    args = ap.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+SDK 启动（导入）耗时基准，基于 `python -X importtime`，并按预算检查回归。
+
+对每个目标模块启动若干次全新解释器，取 `-X importtime` 报告中该模块累计耗时
+的中位数；同时检查导入阶段不应加载的重依赖（requests、urllib3、yaml、httpx、
+orjson）。任一目标超出预算或加载了重依赖时以退出码 1 结束，可直接放入 CI 或
+提交前钩子。
+
+用法：
+    cd turbopi_python_frontend
+    python3 benchmarks/import_time_bench.py
+    python3 benchmarks/import_time_bench.py --budget-ms 30 --runs 15
+    python3 benchmarks/import_time_bench.py --target turbopi_sdk.control
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGETS = ["turbopi_sdk", "turbopi_sdk.buzzer", "turbopi_sdk.control", "turbopi_sdk.status"]
+HEAVY_MODULES = {"requests", "urllib3", "yaml", "httpx", "orjson"}
+DEFAULT_BUDGET_MS = 50.0
+
+
+def import_once(target: str) -> Tuple[float, Set[str]]:
+    """Import `target` in a fresh interpreter; return (cumulative ms, top-level modules loaded)."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    env.pop("TURBOPI_FAST_JSON", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    cumulative_us = None
+    loaded: Set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|", 2)
+        if not cum.strip().isdigit():
+            continue  # header line
+        module = name.strip()
+        loaded.add(module.split(".")[0])
+        if module == target:
+            cumulative_us = int(cum)
+    if cumulative_us is None:
+        # Already imported by a parent package during this run: no own line.
+        cumulative_us = 0
+    return cumulative_us / 1000.0, loaded
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--target", action="append", help="module to import (repeatable)")
+    ap.add_argument("--runs", type=int, default=9)
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="median import budget per target")
+    args = ap.parse_args()
+
+    targets = args.target or DEFAULT_TARGETS
+    failures: List[str] = []
+    print(f"{'target':<24} {'median':>9} {'min':>9} {'max':>9}  heavy deps")
+    for target in targets:
+        samples: List[float] = []
+        heavy: Dict[str, int] = {}
+        for _ in range(args.runs):
+            ms, loaded = import_once(target)
+            samples.append(ms)
+            for mod in loaded & HEAVY_MODULES:
+                heavy[mod] = heavy.get(mod, 0) + 1
+        median = statistics.median(samples)
+        print(
+            f"{target:<24} {median:>7.1f}ms {min(samples):>7.1f}ms {max(samples):>7.1f}ms"
+            f"  {', '.join(sorted(heavy)) or '-'}"
+        )
+        if median > args.budget_ms:
+            failures.append(f"{target}: median {median:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        if heavy:
+            failures.append(f"{target}: imports heavy dependencies at import time: {', '.join(sorted(heavy))}")
+
+    if failures:
+        print("\nFAIL")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nOK (budget {args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+JSON 编解码微基准：标准库 `json` 与 orjson（`turbopi_sdk.codec`）对比。
+
+两类典型负载：
+- snapshot：摄像头快照响应，`data.image_base64` 为数百 KB 的 base64 字符串；
+  分别测量后端序列化（dumps）与 SDK 反序列化（loads）。
+- stream：一次 Coze 流式对话的数千个小 JSON 帧，测量 SDK 逐帧解析（loads）。
+
+用法：
+    cd turbopi_python_frontend
+    pip install orjson
+    python3 benchmarks/json_codec_bench.py
+    python3 benchmarks/json_codec_bench.py --snapshot-kb 600 --frames 10000
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turbopi_sdk import codec  # noqa: E402
+
+
+def snapshot_payload(kb: int) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "code": "SUCCESS",
+        "message": "Snapshot captured",
+        "data": {
+            "width": 640,
+            "height": 480,
+            "format": "jpeg",
+            "image_base64": base64.b64encode(os.urandom(kb * 1024)).decode("ascii"),
+        },
+        "trace_id": "2f1c3a8e-6f0b-4a53-9d3e-1b2c3d4e5f60",
+        "mode": "macbook_sim",
+    }
+
+
+def stream_frames(n: int) -> List[bytes]:
+    frames = [{"type": "conversation_id", "content": "conv_7458849876543210987"}]
+    frames += [{"type": "content", "content": f"第{i}段：小车向前移动，摄像头识别到前方障碍物。"} for i in range(n)]
+    frames.append({"type": "done"})
+    return [codec._std_dumps(f) for f in frames]
+
+
+def best_of(repeat: int, fn: Callable[[], Any]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--snapshot-kb", type=int, default=300, help="raw JPEG size before base64")
+    ap.add_argument("--frames", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    snap = snapshot_payload(args.snapshot_kb)
+    snap_bytes = codec._std_dumps(snap)
+    frames = stream_frames(args.frames)
+
+    codecs = [("stdlib", codec._std_dumps, codec._std_loads)]
+    if codec._load_orjson() is not None:
+        codecs.append(("orjson", codec._orjson_dumps, codec._orjson_loads))
+    else:
+        print("orjson 未安装，仅测量标准库（pip install orjson）")
+
+    print(f"snapshot: {len(snap_bytes) / 1024:.0f} KB JSON; stream: {len(frames)} frames")
+    print(f"{'codec':<8} {'snapshot dumps':>16} {'snapshot loads':>16} {'stream loads':>14} {'frames/s':>12}")
+    for name, dumps, loads in codecs:
+        t_dump = best_of(args.repeat, lambda: dumps(snap))
+        t_load = best_of(args.repeat, lambda: loads(snap_bytes))
+        t_stream = best_of(args.repeat, lambda: [loads(f) for f in frames])
+        print(
+            f"{name:<8} {t_dump * 1e3:>13.3f} ms {t_load * 1e3:>13.3f} ms"
+            f" {t_stream * 1e3:>11.2f} ms {len(frames) / t_stream:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+端到端负载与延迟基准：以 `macbook_sim` 模式启动后端，按可配置并发驱动 openapi.yaml 中的接口。
+
+每个场景对应一个接口（控制、蜂鸣器、摄像头快照、配置读写、批量，以及 Coze 的会话、
+语音、图片 SSE 流等），统计：
+- 延迟 p50 / p95 / p99 / 最大值（毫秒）与吞吐（req/s）；
+- SSE 场景的首个事件时间（time-to-first-event）与事件数；
+- 后端进程 RSS（开始、峰值、结束）。
+
+结果保存为 JSON，可与已保存的基线对比（p95 变慢或吞吐下降超过容差时以退出码 1 结束）。
+Coze 场景需要 Coze 服务与 `--bot-id`；`--fake-coze` 会同时启动本地 Coze 替身
+（protected_backend/fake_coze，可带场景文件注入延迟与故障）并让后端指向它，
+结果可离线复现。没有 Coze 时用 `--skip-coze` 跳过。
+
+用法：
+    cd turbopi_python_frontend
+    pip install httpx pyyaml
+    python3 benchmarks/load_bench.py --skip-coze
+    python3 benchmarks/load_bench.py --concurrency 32 --requests 500 --out bench.json
+    python3 benchmarks/load_bench.py --baseline bench_baseline.json --tolerance 0.15
+    python3 benchmarks/load_bench.py --fake-coze ../protected_backend/fake_coze/scenarios/slow_stream.json
+    python3 benchmarks/load_bench.py --url http://192.168.3.80:8000 --only control_state --only status_health
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = ROOT.parent / "protected_backend"
+OPENAPI_PATH = BACKEND_DIR / "openapi.yaml"
+SAMPLE_WAV = ROOT / "examples" / "coze_chat_test.wav"
+FAKE_COZE_BOT_ID = "7400000000000000002"  # fake_coze.FAKE_BOT_ID
+sys.path.insert(0, str(ROOT))
+
+from turbopi_sdk.aio import AsyncTurboPiClient  # noqa: E402
+
+# (ok, time to first SSE event in ms or None, SSE events)
+Outcome = Tuple[bool, Optional[float], int]
+Call = Callable[[AsyncTurboPiClient, Dict[str, Any]], Awaitable[Outcome]]
+
+
+class Scenario:
+    """One benchmarked route: `call` performs a single request.
+
+    Chat scenarios (`chat=True`) generate an answer per call, need a bot id and run
+    with the smaller `--sse-requests` / `--sse-concurrency` budget.
+    """
+
+    def __init__(self, name: str, method: str, path: str, call: Call, coze: bool = False, sse: bool = False, chat: bool = False) -> None:
+        self.name = name
+        self.method = method
+        self.path = path
+        self.call = call
+        self.coze = coze
+        self.sse = sse
+        self.chat = chat or sse
+
+
+async def _json(client: AsyncTurboPiClient, method: str, path: str, body: Optional[Any] = None) -> Outcome:
+    kwargs: Dict[str, Any] = {"headers": {"Accept": "application/json", "X-Trace-ID": str(uuid.uuid4())}}
+    if body is not None:
+        kwargs["json"] = body
+    resp = await client.request(method, path, **kwargs)
+    return resp.status_code < 400, None, 0
+
+
+async def _sse(client: AsyncTurboPiClient, path: str, **kwargs: Any) -> Outcome:
+    started = time.perf_counter()
+    first: Optional[float] = None
+    events = 0
+    ok = True
+    async for payload in client.iter_sse_events(path, method="POST", max_reconnects=0, **kwargs):
+        if first is None:
+            first = (time.perf_counter() - started) * 1000
+        events += 1
+        if isinstance(payload, dict) and payload.get("type") == "error":
+            ok = False
+    return ok and events > 0, first, events
+
+
+async def _multipart(client: AsyncTurboPiClient, path: str, fields: Dict[str, Any], files: Dict[str, Any]) -> Outcome:
+    resp = await client.post_multipart(path, fields=fields, files=files)
+    return resp.get("success") is not False, None, 0
+
+
+def scenarios() -> List[Scenario]:
+    def get(path: str) -> Call:
+        return lambda c, ctx: _json(c, "GET", path)
+
+    def post(path: str, body: Any) -> Call:
+        return lambda c, ctx: _json(c, "POST", path, body)
+
+    def chat_body(ctx: Dict[str, Any]) -> Dict[str, Any]:
+        return {"text": ctx["prompt"], "bot_id": ctx["bot_id"], "user_id": "bench"}
+
+    def audio_body(ctx: Dict[str, Any]) -> Dict[str, Any]:
+        return {"input_text": ctx["prompt"], "bot_id": ctx["bot_id"], "user_id": "bench", "play": False}
+
+    def upload(c: AsyncTurboPiClient, ctx: Dict[str, Any]) -> Awaitable[Outcome]:
+        # Unique content per request so the file_id cache does not short-circuit the upload.
+        data = uuid.uuid4().bytes * 256
+        return _multipart(c, "/api/v1/coze/files/upload", {}, {"file": ("bench.bin", data, "application/octet-stream")})
+
+    def transcribe(c: AsyncTurboPiClient, ctx: Dict[str, Any]) -> Awaitable[Outcome]:
+        return _multipart(c, "/api/v1/coze/audio/transcriptions", {}, {"file": ("bench.wav", ctx["wav"], "audio/wav")})
+
+    return [
+        Scenario("status", "GET", "/status/", get("/status/")),
+        Scenario("status_health", "GET", "/status/health", get("/status/health")),
+        Scenario("status_mode", "GET", "/status/mode", get("/status/mode")),
+        Scenario("control_state", "GET", "/control/state", get("/control/state")),
+        Scenario("control_move", "POST", "/control/move", post("/control/move", {"command": "forward", "speed": 0.1, "duration_ms": 50})),
+        Scenario("control_stop", "POST", "/control/stop", post("/control/stop", {})),
+        Scenario("buzzer_set", "POST", "/api/v1/buzzer/set", post("/api/v1/buzzer/set", {"freq": 2000, "on_time": 0.01, "off_time": 0.01, "repeat": 1})),
+        Scenario("camera_snapshot", "POST", "/api/v1/camera/snapshot", post("/api/v1/camera/snapshot", {"width": 640, "height": 480, "quality": 80})),
+        Scenario("camera_snapshot_jpg", "GET", "/api/v1/camera/snapshot.jpg", get("/api/v1/camera/snapshot.jpg")),
+        Scenario("config_get", "GET", "/api/v1/config/", get("/api/v1/config/")),
+        Scenario("config_schema", "GET", "/api/v1/config/schema", get("/api/v1/config/schema")),
+        Scenario("config_patch", "PATCH", "/api/v1/config/", lambda c, ctx: _json(c, "PATCH", "/api/v1/config/", ctx["config_patch"])),
+        Scenario("batch", "POST", "/api/v1/batch", post("/api/v1/batch", {
+            "operations": [{"method": "GET", "path": "/control/state"}, {"method": "GET", "path": "/status/health"}],
+            "mode": "parallel",
+        })),
+        Scenario("coze_voices", "GET", "/api/v1/coze/audio/voices", get("/api/v1/coze/audio/voices"), coze=True),
+        Scenario("coze_voice_id", "GET", "/api/v1/coze/audio/voice_id", get("/api/v1/coze/audio/voice_id"), coze=True),
+        Scenario("coze_conversation_create", "POST", "/api/v1/coze/conversations", post("/api/v1/coze/conversations/", {}), coze=True),
+        Scenario("coze_conversation_stream", "POST", "/api/v1/coze/conversations/stream",
+                 lambda c, ctx: _sse(c, "/api/v1/coze/conversations/stream", json_body=chat_body(ctx)), coze=True, sse=True),
+        Scenario("coze_conversation_stream_plugins", "POST", "/api/v1/coze/conversations/stream/plugins",
+                 lambda c, ctx: _sse(c, "/api/v1/coze/conversations/stream/plugins", json_body=chat_body(ctx)), coze=True, sse=True),
+        Scenario("coze_audio_chat", "POST", "/api/v1/coze/audio/chat",
+                 lambda c, ctx: _json(c, "POST", "/api/v1/coze/audio/chat", audio_body(ctx)), coze=True, chat=True),
+        Scenario("coze_audio_chat_stream", "POST", "/api/v1/coze/audio/chat/stream",
+                 lambda c, ctx: _sse(c, "/api/v1/coze/audio/chat/stream", json_body=audio_body(ctx)), coze=True, sse=True),
+        Scenario("coze_image_chat_stream", "POST", "/api/v1/coze/image/chat/stream",
+                 lambda c, ctx: _sse(c, "/api/v1/coze/image/chat/stream", form_fields=dict(chat_body(ctx), conversation_id="")),
+                 coze=True, sse=True),
+        Scenario("coze_tts", "POST", "/api/v1/coze/audio/tts", lambda c, ctx: _json(c, "POST", "/api/v1/coze/audio/tts", {"input_text": ctx["prompt"], "play": False}), coze=True),
+        Scenario("coze_transcriptions", "POST", "/api/v1/coze/audio/transcriptions", transcribe, coze=True),
+        Scenario("coze_files_upload", "POST", "/api/v1/coze/files/upload", upload, coze=True),
+        Scenario("coze_files_cache", "GET", "/api/v1/coze/files/cache", get("/api/v1/coze/files/cache")),
+    ]
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(q / 100.0 * len(sorted_values)) - 1))
+    return round(sorted_values[idx], 3)
+
+
+class RssSampler:
+    """Samples the backend's resident set size from /proc (Linux) or psutil."""
+
+    def __init__(self, pid: Optional[int], interval: float = 0.1) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[int] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def read_kb(self) -> Optional[int]:
+        if self.pid is None:
+            return None
+        try:
+            with open(f"/proc/{self.pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        try:
+            import psutil
+        except ImportError:
+            return None
+        try:
+            return psutil.Process(self.pid).memory_info().rss // 1024
+        except psutil.Error:
+            return None
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            kb = self.read_kb()
+            if kb is not None:
+                self.samples.append(kb)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_backend(port: int, extra_env: Dict[str, str]) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        TURBOPI_RUNTIME_MODE="macbook_sim",
+        TURBOPI_HOST="127.0.0.1",
+        TURBOPI_PORT=str(port),
+        TURBOPI_LOG_LEVEL="WARNING",
+        TURBOPI_DEBUG="false",
+        **extra_env,
+    )
+    return subprocess.Popen(
+        [sys.executable, "start_protected_backend.py"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+
+
+def start_fake_coze(port: int, scenario: str) -> subprocess.Popen:
+    cmd = [sys.executable, "-m", "fake_coze", "--port", str(port)]
+    if scenario:
+        cmd += ["--scenario", str(Path(scenario).resolve())]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+async def wait_ready(url: str, proc: Optional[subprocess.Popen], timeout: float, path: str = "/status/health") -> None:
+    deadline = time.monotonic() + timeout
+    async with AsyncTurboPiClient(base_url=url, timeout=1) as client:
+        while time.monotonic() < deadline:
+            if proc is not None and proc.poll() is not None:
+                err = proc.stderr.read().decode("utf-8", errors="replace") if proc.stderr else ""
+                raise RuntimeError(f"backend exited with {proc.returncode}:\n{err[-2000:]}")
+            try:
+                if (await client.request("GET", path)).status_code == 200:
+                    return
+            except Exception:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"backend at {url} not ready after {timeout:.0f}s")
+
+
+async def run_scenario(client: AsyncTurboPiClient, sc: Scenario, ctx: Dict[str, Any], requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    ttfe: List[float] = []
+    events = 0
+    errors: Dict[str, int] = {}
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, events
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                ok, first, n = await sc.call(client, ctx)
+            except Exception as e:
+                ok, first, n = False, None, 0
+                key = type(e).__name__
+            else:
+                key = "failed_response"
+            latencies.append((time.perf_counter() - started) * 1000)
+            events += n
+            if first is not None:
+                ttfe.append(first)
+            if not ok:
+                errors[key] = errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    ttfe.sort()
+    result: Dict[str, Any] = {
+        "method": sc.method,
+        "path": sc.path,
+        "requests": len(latencies),
+        "errors": sum(errors.values()),
+        "error_kinds": errors,
+        "req_per_s": round(len(latencies) / wall, 2) if wall > 0 else None,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": round(latencies[-1], 3) if latencies else None,
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        },
+    }
+    if sc.sse:
+        result["sse"] = {
+            "events": events,
+            "ttfe_ms_p50": percentile(ttfe, 50),
+            "ttfe_ms_p95": percentile(ttfe, 95),
+        }
+    return result
+
+
+def openapi_coverage(covered: List[str]) -> List[str]:
+    """openapi.yaml paths without a scenario (path parameters are not benchmarked)."""
+    try:
+        import yaml
+    except ImportError:
+        return []
+    with open(OPENAPI_PATH, encoding="utf-8") as f:
+        spec = yaml.safe_load(f)
+    norm = {p.rstrip("/") for p in covered}
+    return sorted(p for p in spec.get("paths", {}) if p.rstrip("/") not in norm)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    regressions: List[str] = []
+    print(f"\n{'scenario':<34} {'p95 base':>10} {'p95 now':>10} {'Δ':>7}   {'req/s base':>10} {'req/s now':>10} {'Δ':>7}")
+    for name, now in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        p95_b, p95_n = base["latency_ms"]["p95"], now["latency_ms"]["p95"]
+        rps_b, rps_n = base["req_per_s"], now["req_per_s"]
+        d_p95 = (p95_n - p95_b) / p95_b if p95_b and p95_n is not None else 0.0
+        d_rps = (rps_n - rps_b) / rps_b if rps_b and rps_n is not None else 0.0
+        print(f"{name:<34} {p95_b:>10} {p95_n:>10} {d_p95:>+6.0%}   {rps_b:>10} {rps_n:>10} {d_rps:>+6.0%}")
+        if d_p95 > tolerance:
+            regressions.append(f"{name}: p95 {p95_b} -> {p95_n} ms ({d_p95:+.0%})")
+        if d_rps < -tolerance:
+            regressions.append(f"{name}: req/s {rps_b} -> {rps_n} ({d_rps:+.0%})")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    proc: Optional[subprocess.Popen] = None
+    fake: Optional[subprocess.Popen] = None
+    url = args.url
+    pid = args.pid
+    if url is None:
+        port = free_port()
+        extra_env = dict(kv.split("=", 1) for kv in args.env)
+        if args.fake_coze is not None:
+            fake_port = free_port()
+            fake = start_fake_coze(fake_port, args.fake_coze)
+            await wait_ready(f"http://127.0.0.1:{fake_port}", fake, args.startup_timeout, "/__fake__/stats")
+            extra_env.setdefault("TURBOPI_COZE_API_BASE", f"http://127.0.0.1:{fake_port}")
+            args.bot_id = args.bot_id or FAKE_COZE_BOT_ID
+        proc = start_backend(port, extra_env)
+        pid = proc.pid
+        url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(url, proc, args.startup_timeout)
+        sampler = RssSampler(pid)
+        rss_start = sampler.read_kb()
+        sampler.start()
+
+        selected = [sc for sc in scenarios() if (not args.only or sc.name in args.only) and not (args.skip_coze and sc.coze)]
+        results: Dict[str, Any] = {}
+        async with AsyncTurboPiClient(base_url=url, timeout=args.timeout, pool_maxsize=args.concurrency + 4) as client:
+            config = (await client.get("/api/v1/config/")).get("data") or {}
+            ctx = {
+                "bot_id": args.bot_id,
+                "prompt": args.prompt,
+                "wav": SAMPLE_WAV.read_bytes() if SAMPLE_WAV.exists() else b"",
+                # Rewrite a value with itself: exercises validation and persistence without changing config.
+                "config_patch": {"coze_voice_id": (config.get("config") or config).get("coze_voice_id")},
+            }
+            print(f"{'scenario':<34} {'n':>6} {'err':>5} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'ttfe p50':>9}")
+            for sc in selected:
+                if sc.chat and not args.bot_id:
+                    print(f"{sc.name:<34} skipped (needs --bot-id)")
+                    continue
+                n = args.sse_requests if sc.chat else args.requests
+                for _ in range(args.warmup):
+                    try:
+                        await sc.call(client, ctx)
+                    except Exception:
+                        pass
+                r = await run_scenario(client, sc, ctx, n, args.sse_concurrency if sc.chat else args.concurrency)
+                results[sc.name] = r
+                lat = r["latency_ms"]
+                ttfe = r.get("sse", {}).get("ttfe_ms_p50")
+                print(
+                    f"{sc.name:<34} {r['requests']:>6} {r['errors']:>5} {r['req_per_s']:>9}"
+                    f" {lat['p50']:>9} {lat['p95']:>9} {lat['p99']:>9} {ttfe if ttfe is not None else '-':>9}"
+                )
+
+        sampler.stop()
+        rss = {
+            "start_kb": rss_start,
+            "peak_kb": max(sampler.samples) if sampler.samples else None,
+            "end_kb": sampler.read_kb(),
+        }
+        return {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "url": url,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "sse_requests": args.sse_requests,
+            },
+            "rss": rss,
+            "scenarios": results,
+            "uncovered_paths": openapi_coverage([sc.path for sc in scenarios()]),
+        }
+    finally:
+        for p in (proc, fake):
+            if p is None:
+                continue
+            p.terminate()
+            try:
+                p.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", help="benchmark a running backend instead of starting one")
+    ap.add_argument("--pid", type=int, help="backend pid for RSS sampling when --url is used")
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment for the started backend")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=200, help="requests per non-streaming scenario")
+    ap.add_argument("--sse-requests", type=int, default=20, help="calls per chat / SSE scenario")
+    ap.add_argument("--sse-concurrency", type=int, default=4)
+    ap.add_argument("--warmup", type=int, default=3, help="untimed calls per scenario")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--startup-timeout", type=float, default=30.0)
+    ap.add_argument("--only", action="append", help="run only this scenario (repeatable)")
+    ap.add_argument("--skip-coze", action="store_true", help="skip routes that need the Coze API")
+    ap.add_argument("--fake-coze", nargs="?", const="", metavar="SCENARIO",
+                    help="start the local fake Coze server (optionally with a scenario file) and point the backend at it")
+    ap.add_argument("--bot-id", default=os.getenv("TURBOPI_COZE_BOT_ID"), help="bot for the Coze streaming scenarios")
+    ap.add_argument("--prompt", default="用一句话介绍你自己")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--baseline", help="compare with a previous results JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed p95 / req/s regression vs baseline")
+    args = ap.parse_args()
+
+    report = asyncio.run(run(args))
+    rss = report["rss"]
+    if rss["start_kb"] is not None:
+        print(f"\nRSS: start {rss['start_kb'] / 1024:.1f} MB, peak {(rss['peak_kb'] or 0) / 1024:.1f} MB, end {(rss['end_kb'] or 0) / 1024:.1f} MB")
+    if report["uncovered_paths"]:
+        print("openapi paths without a scenario: " + ", ".join(report["uncovered_paths"]))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.out}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("\nREGRESSION")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nOK (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+HTTP 中间件开销基准：`/status/health` 吞吐与延迟，以及配置监听 SSE 的事件延迟。
+
+每个请求（包括长时间的 SSE 流）都会经过后端的中间件栈，因此这里测量两类指标：
+- `status_health`：按 `--concurrency` 并发请求 `GET /status/health`，输出 req/s 与 p50/p95/p99；
+- `config_watch_sse`：打开 `GET /api/v1/config/watch?stream=true`，记录首个事件（snapshot）
+  时间，然后逐次 `PATCH /api/v1/config/`，统计从发出 PATCH 到收到对应 `change` 事件的延迟。
+
+同时检查响应是否带有 `X-Trace-ID` 与 `Server-Timing` 头。
+前后对比：在改动前的代码上用 `--out` 保存结果，改动后用 `--baseline` 对比
+（与 load_bench.py 相同，p95 变慢或吞吐下降超过 `--tolerance` 时以退出码 1 结束）。
+
+用法：
+    cd turbopi_python_frontend
+    pip install httpx
+    git stash && python3 benchmarks/middleware_bench.py --out mw_before.json && git stash pop
+    python3 benchmarks/middleware_bench.py --baseline mw_before.json
+    python3 benchmarks/middleware_bench.py --url http://192.168.3.80:8000 --concurrency 16 --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_bench import compare, free_port, percentile, start_backend, wait_ready  # noqa: E402
+from turbopi_sdk.aio import AsyncTurboPiClient  # noqa: E402
+
+WATCH_PATH = "/api/v1/config/watch?stream=true"
+
+
+def summarize(latencies: List[float], wall: float, errors: int) -> Dict[str, Any]:
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "req_per_s": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+    }
+
+
+async def bench_health(client: AsyncTurboPiClient, requests: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            resp = await client.request("GET", "/status/health")
+            latencies.append((time.perf_counter() - started) * 1000)
+            if resp.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def bench_watch(client: AsyncTurboPiClient, rounds: int) -> Dict[str, Any]:
+    """Snapshot time plus PATCH -> `change` event latency over one watch stream."""
+    events = client.iter_sse_events(WATCH_PATH, method="GET", timeout=(10, 60), max_reconnects=0)
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    try:
+        first = await events.__anext__()
+        ttfe = (time.perf_counter() - started) * 1000
+        if first.get("type") != "snapshot":
+            errors += 1
+        wall_start = time.perf_counter()
+        for i in range(rounds):
+            sent = time.perf_counter()
+            patch = asyncio.create_task(
+                client.request("PATCH", "/api/v1/config/", json={"notes": f"middleware_bench {time.time()} {i}"})
+            )
+            async for event in events:
+                if event.get("type") == "change":
+                    break
+            latencies.append((time.perf_counter() - sent) * 1000)
+            if (await patch).status_code >= 400:
+                errors += 1
+        wall = time.perf_counter() - wall_start
+    finally:
+        await events.aclose()
+    result = summarize(latencies, wall, errors)
+    result["sse"] = {"ttfe_ms": round(ttfe, 3), "events": len(latencies) + 1}
+    return result
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    proc: Optional[subprocess.Popen] = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        proc = start_backend(port, dict(kv.split("=", 1) for kv in args.env))
+        url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(url, proc, args.startup_timeout)
+        async with AsyncTurboPiClient(base_url=url, timeout=30, pool_maxsize=args.concurrency + 2) as client:
+            probe = await client.request("GET", "/status/health", headers={"X-Trace-ID": "middleware-bench"})
+            headers = {
+                "x_trace_id_echoed": probe.headers.get("X-Trace-ID") == "middleware-bench",
+                "server_timing": probe.headers.get("Server-Timing"),
+            }
+            original = ((await client.get("/api/v1/config/")).get("data") or {}).get("config", {}).get("notes")
+
+            await bench_health(client, args.warmup, args.concurrency)
+            results = {"status_health": await bench_health(client, args.requests, args.concurrency)}
+            results["config_watch_sse"] = await bench_watch(client, args.sse_rounds)
+            await client.request("PATCH", "/api/v1/config/", json={"notes": original})
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    print(f"{'scenario':<20} {'n':>6} {'err':>5} {'req/s':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'ttfe':>9}")
+    for name, r in results.items():
+        lat = r["latency_ms"]
+        ttfe = r.get("sse", {}).get("ttfe_ms", "-")
+        print(
+            f"{name:<20} {r['requests']:>6} {r['errors']:>5} {r['req_per_s']:>9}"
+            f" {lat['p50']:>9} {lat['p95']:>9} {lat['p99']:>9} {ttfe:>9}"
+        )
+    print(f"X-Trace-ID echoed: {headers['x_trace_id_echoed']}, Server-Timing: {headers['server_timing']}")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "url": url,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "sse_rounds": args.sse_rounds,
+        },
+        "headers": headers,
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", help="benchmark a running backend instead of starting one")
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment for the started backend")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=1000, help="GET /status/health requests")
+    ap.add_argument("--sse-rounds", type=int, default=50, help="config PATCHes observed on the watch stream")
+    ap.add_argument("--warmup", type=int, default=50)
+    ap.add_argument("--startup-timeout", type=float, default=30.0)
+    ap.add_argument("--out", help="write JSON results to this file")
+    ap.add_argument("--baseline", help="compare with a previous --out file")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed relative p95 / req/s regression")
+    args = ap.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+SSE 解析器微基准：对比旧版字符串缓冲解析与 `turbopi_sdk.sse.SSEParser`。
+
+默认合成一段“录制的” Coze 流：大量中文 `content` 增量帧，末尾附带一个很长的
+`completed` 帧，并按 1KB（与旧实现一致）切块投喂。也可通过 `--file` 指定真实抓包
+（原始 `text/event-stream` 字节）。
+
+用法：
+    cd turbopi_python_frontend
+    python3 benchmarks/sse_parser_bench.py
+    python3 benchmarks/sse_parser_bench.py --file recorded_stream.txt --chunk 1024
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from turbopi_sdk.sse import SSEParser  # noqa: E402
+
+
+def synth_stream(deltas: int, completed_kb: int) -> bytes:
+    frames = [{"type": "conversation_id", "content": "conv_7458849876543210987"}]
+    text = []
+    for i in range(deltas):
+        piece = f"第{i}段：小车向前移动，摄像头识别到前方障碍物。"
+        text.append(piece)
+        frames.append({"type": "content", "content": piece})
+    completed = "".join(text)
+    while len(completed.encode("utf-8")) < completed_kb * 1024:
+        completed += completed
+    frames.append({"type": "completed", "content": completed})
+    frames.append({"type": "done"})
+    return b"".join(f"data: {json.dumps(f, ensure_ascii=False)}\n\n".encode("utf-8") for f in frames)
+
+
+def chunked(raw: bytes, size: int) -> List[bytes]:
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+def legacy_parse(chunks: Iterable[bytes]) -> List[str]:
+    """Pre-SSEParser algorithm from `turbopi_sdk.http.iter_sse_events`."""
+    out = []
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk.decode("utf-8", errors="ignore")
+        while "\n\n" in buffer:
+            frame, buffer = buffer.split("\n\n", 1)
+            data_lines = [line[len("data:"):].strip() for line in frame.splitlines() if line.startswith("data:")]
+            if data_lines:
+                out.append("\n".join(data_lines))
+    return out
+
+
+def parser_parse(chunks: Iterable[bytes]) -> List[str]:
+    parser = SSEParser()
+    out = []
+    for chunk in chunks:
+        out.extend(e.data for e in parser.feed(chunk))
+    return out
+
+
+def run(name: str, fn: Callable[[List[bytes]], List[str]], chunks: List[bytes], total_bytes: int, repeat: int, expected: List[str]) -> None:
+    best = float("inf")
+    result: List[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(chunks)
+        best = min(best, time.perf_counter() - t0)
+    lost = sum(len(a) - len(b) for a, b in zip(expected, result))
+    print(
+        f"{name:<10} {len(result) / best:>12,.0f} events/s {total_bytes / best / 1e6:>10.1f} MB/s"
+        f"  best={best * 1000:.2f} ms  lost_chars={lost}"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--file", help="recorded raw SSE bytes")
+    ap.add_argument("--deltas", type=int, default=5000)
+    ap.add_argument("--completed-kb", type=int, default=512)
+    ap.add_argument("--chunk", type=int, default=1024)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    raw = Path(args.file).read_bytes() if args.file else synth_stream(args.deltas, args.completed_kb)
+    chunks = chunked(raw, args.chunk)
+    expected = parser_parse([raw])
+    print(f"stream: {len(raw) / 1e6:.2f} MB, {len(expected)} events, {len(chunks)} chunks of {args.chunk} B")
+    run("legacy", legacy_parse, chunks, len(raw), args.repeat, expected)
+    run("SSEParser", parser_parse, chunks, len(raw), args.repeat, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+多进程部署基准：在 `macbook_sim` 模式下对比 1 个与 N 个 HTTP worker 的混合负载表现。
+
+依次以 `TURBOPI_WORKERS=1` 和 `TURBOPI_WORKERS=N`（默认都使用 `TURBOPI_SERVER_PROFILE=performance`）
+启动后端，用同一组并发客户端循环执行混合请求：控制、状态、蜂鸣器、摄像头快照（base64）、
+配置读取、批量；加 `--fake-coze` 时再混入 Coze 语音列表与会话 SSE 流（本地 Coze 替身）。
+N > 1 时控制/摄像头/蜂鸣器/状态/配置请求经 Unix socket 转发到硬件进程，
+其余请求由各 worker 自行处理。
+
+输出每种配置的总吞吐（req/s）与各场景 p50/p95，最后给出 N worker 相对 1 worker 的变化。
+
+用法：
+    cd turbopi_python_frontend
+    pip install httpx pyyaml
+    python3 benchmarks/worker_bench.py
+    python3 benchmarks/worker_bench.py --workers 4 --concurrency 32 --duration 20 --fake-coze
+    python3 benchmarks/worker_bench.py --profile default --out workers.json
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from load_bench import (  # noqa: E402
+    FAKE_COZE_BOT_ID, Scenario, free_port, percentile, scenarios, start_backend, start_fake_coze, wait_ready,
+)
+from turbopi_sdk.aio import AsyncTurboPiClient  # noqa: E402
+
+HARDWARE_MIX = ["control_move", "control_state", "status_health", "buzzer_set", "camera_snapshot", "config_get", "batch"]
+COZE_MIX = ["coze_voices", "coze_conversation_stream"]
+
+
+async def mixed_load(client: AsyncTurboPiClient, mix: List[Scenario], ctx: Dict[str, Any], concurrency: int, duration: float) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = {sc.name: [] for sc in mix}
+    errors: Dict[str, int] = {sc.name: 0 for sc in mix}
+    deadline = time.perf_counter() + duration
+
+    async def user(offset: int) -> None:
+        i = offset
+        while time.perf_counter() < deadline:
+            sc = mix[i % len(mix)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                ok = (await sc.call(client, ctx))[0]
+            except Exception:
+                ok = False
+            latencies[sc.name].append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors[sc.name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(n) for n in range(concurrency)))
+    wall = time.perf_counter() - started
+    total = sum(len(v) for v in latencies.values())
+    per_scenario: Dict[str, Any] = {}
+    for name, values in latencies.items():
+        values.sort()
+        per_scenario[name] = {
+            "requests": len(values),
+            "errors": errors[name],
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+        }
+    return {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "req_per_s": round(total / wall, 2) if wall > 0 else 0.0,
+        "scenarios": per_scenario,
+    }
+
+
+async def run_config(workers: int, args: argparse.Namespace, coze_base: Optional[str]) -> Dict[str, Any]:
+    port = free_port()
+    env = {
+        "TURBOPI_WORKERS": str(workers),
+        "TURBOPI_SERVER_PROFILE": args.profile,
+    }
+    if coze_base:
+        env["TURBOPI_COZE_API_BASE"] = coze_base
+    env.update(dict(kv.split("=", 1) for kv in args.env))
+    proc = start_backend(port, env)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        await wait_ready(url, proc, args.startup_timeout)
+        names = HARDWARE_MIX + (COZE_MIX if coze_base else [])
+        by_name = {sc.name: sc for sc in scenarios()}
+        mix = [by_name[name] for name in names]
+        ctx = {"bot_id": FAKE_COZE_BOT_ID, "prompt": args.prompt, "wav": b"", "config_patch": {}}
+        async with AsyncTurboPiClient(base_url=url, timeout=30, pool_maxsize=args.concurrency + 4) as client:
+            await mixed_load(client, mix, ctx, args.concurrency, args.warmup)
+            return await mixed_load(client, mix, ctx, args.concurrency, args.duration)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    fake: Optional[subprocess.Popen] = None
+    coze_base: Optional[str] = None
+    if args.fake_coze is not None:
+        fake_port = free_port()
+        fake = start_fake_coze(fake_port, args.fake_coze)
+        coze_base = f"http://127.0.0.1:{fake_port}"
+        await wait_ready(coze_base, fake, args.startup_timeout, "/__fake__/stats")
+    try:
+        results: Dict[str, Any] = {}
+        for workers in (1, args.workers):
+            r = await run_config(workers, args, coze_base)
+            results[str(workers)] = r
+            print(f"\nworkers={workers}: {r['requests']} requests, {r['errors']} errors, {r['req_per_s']} req/s")
+            print(f"  {'scenario':<28} {'n':>6} {'err':>5} {'p50':>9} {'p95':>9}")
+            for name, s in r["scenarios"].items():
+                print(f"  {name:<28} {s['requests']:>6} {s['errors']:>5} {s['p50']!s:>9} {s['p95']!s:>9}")
+    finally:
+        if fake is not None:
+            fake.terminate()
+            fake.wait(timeout=10)
+
+    one, many = results["1"], results[str(args.workers)]
+    if one["req_per_s"]:
+        print(f"\nthroughput: {one['req_per_s']} -> {many['req_per_s']} req/s ({many['req_per_s'] / one['req_per_s'] - 1:+.0%})")
+    for name, s in many["scenarios"].items():
+        base = one["scenarios"][name]["p95"]
+        if base and s["p95"] is not None:
+            print(f"  {name:<28} p95 {base} -> {s['p95']} ms ({s['p95'] / base - 1:+.0%})")
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "profile": args.profile,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "fake_coze": args.fake_coze is not None,
+        },
+        "workers": results,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--workers", type=int, default=4, help="worker count compared against a single worker")
+    ap.add_argument("--profile", choices=["default", "performance"], default="performance")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--duration", type=float, default=15.0, help="seconds of measured load per configuration")
+    ap.add_argument("--warmup", type=float, default=2.0, help="seconds of unmeasured load per configuration")
+    ap.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment for the started backend")
+    ap.add_argument("--startup-timeout", type=float, default=45.0)
+    ap.add_argument("--fake-coze", nargs="?", const="", metavar="SCENARIO",
+                    help="add Coze routes to the mix, served by the local fake Coze server")
+    ap.add_argument("--prompt", default="用一句话介绍你自己")
+    ap.add_argument("--out", help="write results JSON here")
+    args = ap.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
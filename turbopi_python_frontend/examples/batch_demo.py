@@ -0,0 +1,24 @@
+from turbopi_sdk import batch
+
+
+def main():
+    print("== batch: state -> move -> stop -> state (one round trip) ==")
+    resp = (
+        batch()
+        .get_state(id="before")
+        .move(command="forward", speed=0.5, duration_ms=1000)
+        .stop()
+        .get_state(id="after")
+        .execute()
+    )
+    print(resp)
+
+    for result in resp.get("data", {}).get("results", []):
+        print(f"[{result['index']}] {result.get('id')} status={result['status']} {result.get('duration_ms')}ms")
+
+    print("\n== batch (parallel): status + health + buzzer ==")
+    print(batch(parallel=True).get_status().get_health().set_buzzer(freq=2000, on_time=0.1).execute())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+from turbopi_sdk import Fleet, control
+
+
+def main():
+    # Robots come from TURBOPI_FLEET or the `fleet` key of config.yaml
+    with Fleet.from_config(max_parallel=16, timeout=3) as fleet:
+        print(f"== fleet: {fleet.names} ==")
+
+        print("\n== aggregated /status/health ==")
+        print(fleet.health(deadline=5))
+
+        print("\n== control/state (as completed) ==")
+        for result in fleet.as_completed(control.get_state, deadline=5):
+            print(f"{result.name}: ok={result.ok} {result.elapsed_ms:.0f}ms {result.value or result.error}")
+
+        print("\n== estop (broadcast) ==")
+        for name, result in fleet.estop().items():
+            print(f"{name}: ok={result.ok} {result.elapsed_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,70 @@
-from .sdk_config import get_base_url, set_server_ip
-from .http import http_get, http_post_json, http_post_multipart, iter_sse_events
-
-__all__ = [
-    "get_base_url",
-    "set_server_ip",
-    "http_get",
-    "http_post_json",
-    "http_post_multipart",
-    "iter_sse_events",
-]
\ No newline at end of file
+"""Turbopi Python SDK.
+
+Submodules and the names below are loaded on first access, so ``import
+turbopi_sdk`` (or ``from turbopi_sdk import buzzer``) stays cheap and HTTP
+dependencies such as ``requests`` are imported only when a call is made.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# `batch` is both a submodule and the builder function; import it eagerly (it is
+# tiny) so the function, not the submodule, is bound on the package.
+from .batch import Batch, batch
+
+# public name -> submodule that defines it
+_LAZY = {
+    "get_base_url": "sdk_config",
+    "set_server_ip": "sdk_config",
+    "TurboPiClient": "client",
+    "get_default_client": "client",
+    "set_default_client": "client",
+    "using_client": "client",
+    "ResponseCache": "response_cache",
+    "ResiliencePolicy": "resilience",
+    "CircuitOpenError": "resilience",
+    "use_fast_json": "codec",
+    "fast_json_enabled": "codec",
+    "Hooks": "metrics",
+    "MetricsCollector": "metrics",
+    "enable_metrics": "metrics",
+    "get_metrics": "metrics",
+    "Fleet": "fleet",
+    "FleetResult": "fleet",
+    "http_get": "http",
+    "http_get_bytes": "http",
+    "http_iter_multipart": "http",
+    "http_post_json": "http",
+    "http_put_json": "http",
+    "http_patch_json": "http",
+    "http_delete": "http",
+    "http_post_multipart": "http",
+    "iter_sse_events": "http",
+    "SSEStreamExpiredError": "sse",
+}
+
+__all__ = ["Batch", "batch"] + list(_LAZY)
+
+if TYPE_CHECKING:
+    from .client import TurboPiClient, get_default_client, set_default_client, using_client
+    from .codec import fast_json_enabled, use_fast_json
+    from .fleet import Fleet, FleetResult
+    from .http import http_delete, http_get, http_get_bytes, http_iter_multipart, http_patch_json, http_post_json, http_post_multipart, http_put_json, iter_sse_events
+    from .metrics import Hooks, MetricsCollector, enable_metrics, get_metrics
+    from .resilience import CircuitOpenError, ResiliencePolicy
+    from .response_cache import ResponseCache
+    from .sdk_config import get_base_url, set_server_ip
+    from .sse import SSEStreamExpiredError
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
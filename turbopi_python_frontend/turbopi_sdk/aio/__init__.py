@@ -0,0 +1,26 @@
+"""asyncio variant of the Turbopi SDK (requires ``httpx``).
+
+Module layout mirrors the blocking SDK: ``turbopi_sdk.aio.control.move`` is the
+``async def`` twin of ``turbopi_sdk.control.move``, and SSE helpers such as
+``turbopi_sdk.aio.coze_conversations.stream`` are consumed with ``async for``.
+"""
+
+from .client import AsyncCircuitOpenError, AsyncTurboPiClient, aclose_default_client, get_default_client, set_default_client
+from .http import http_get, http_get_bytes, http_iter_multipart, http_post_json, http_put_json, http_patch_json, http_delete, http_post_multipart, iter_sse_events
+
+__all__ = [
+    "AsyncCircuitOpenError",
+    "AsyncTurboPiClient",
+    "aclose_default_client",
+    "get_default_client",
+    "set_default_client",
+    "http_get",
+    "http_get_bytes",
+    "http_iter_multipart",
+    "http_post_json",
+    "http_put_json",
+    "http_patch_json",
+    "http_delete",
+    "http_post_multipart",
+    "iter_sse_events",
+]
@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Union
+
+from ..camera import _snapshot_params, _stream_params
+from .http import http_get_bytes, http_iter_multipart, http_post_json
+
+
+async def snapshot(width: Optional[int] = None, height: Optional[int] = None, quality: Optional[int] = None) -> Dict[str, Any]:
+    body: Dict[str, Any] = {}
+    if width is not None:
+        body["width"] = int(width)
+    if height is not None:
+        body["height"] = int(height)
+    if quality is not None:
+        body["quality"] = int(quality)
+    return await http_post_json("/api/v1/camera/snapshot", body)
+
+
+async def snapshot_bytes(
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = None,
+    as_memoryview: bool = False,
+    newer_than: Union[float, str, datetime, None] = None,
+) -> Union[bytes, memoryview]:
+    """Async `turbopi_sdk.camera.snapshot_bytes`; raises `httpx.HTTPStatusError` if the capture fails."""
+    params = _snapshot_params(width, height, quality, newer_than)
+    data = await http_get_bytes("/api/v1/camera/snapshot.jpg", params=params)
+    return memoryview(data) if as_memoryview else data
+
+
+async def frames(
+    fps: Optional[float] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = None,
+    max_frames: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Async `turbopi_sdk.camera.frames`; use with ``async for``."""
+    params = _stream_params(fps, width, height, quality)
+    stream = http_iter_multipart("/api/v1/camera/stream", params=params)
+    try:
+        count = 0
+        async for frame in stream:
+            yield frame.data
+            count += 1
+            if max_frames is not None and count >= max_frames:
+                return
+    finally:
+        await stream.aclose()
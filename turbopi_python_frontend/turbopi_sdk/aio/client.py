@@ -0,0 +1,423 @@
+import asyncio
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, BinaryIO, Dict, Iterable, List, Mapping, Optional
+
+import httpx
+
+from .. import codec, metrics
+from ..batch import Batch
+from ..client import (
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_SSE_RECONNECTS,
+    DEFAULT_TIMEOUT,
+    Timeout,
+    _headers,
+)
+from ..mjpeg import MJPEGFrame, MJPEGParser, content_type_boundary
+from ..multipart import FileSpec, MultipartEncoder, ProgressCallback, build_multipart
+from ..response_cache import ResponseCache
+from ..sdk_config import get_base_url
+from ..sse import SSEParser, event_payload, raise_for_stream_error, reconnect_delay
+
+if TYPE_CHECKING:
+    from ..resilience import Resilience, ResiliencePolicy
+
+# `..resilience` depends on `requests`; it is only imported when a policy is given.
+
+
+class AsyncCircuitOpenError(httpx.TransportError):
+    """Raised by `AsyncTurboPiClient` without touching the network while the circuit is open."""
+
+
+def _handle_response(resp: httpx.Response) -> Dict[str, Any]:
+    try:
+        resp.raise_for_status()
+        return codec.loads(resp.content)
+    except httpx.HTTPStatusError:
+        # Try to parse backend error format
+        try:
+            data = codec.loads(resp.content)
+            # FastAPI HTTPException uses {"detail": {...}}
+            if isinstance(data, dict) and "detail" in data:
+                return {"success": False, "error": data["detail"], "status": resp.status_code}
+            return {"success": False, "error": data, "status": resp.status_code}
+        except Exception:
+            return {"success": False, "error": resp.text, "status": resp.status_code}
+
+
+async def _aiter_body(body: MultipartEncoder) -> AsyncIterator[bytes]:
+    # File parts are read from disk, so each chunk is produced in a worker thread
+    # (the progress callback runs there too) to keep the event loop free.
+    loop = asyncio.get_running_loop()
+    chunks = iter(body)
+    while True:
+        chunk = await loop.run_in_executor(None, next, chunks, None)
+        if chunk is None:
+            return
+        yield bytes(chunk)
+
+
+@asynccontextmanager
+async def _open_binary(path: str) -> AsyncIterator[BinaryIO]:
+    # open() and close() can block on slow storage (SD card, network mounts)
+    loop = asyncio.get_running_loop()
+    f = await loop.run_in_executor(None, open, path, "rb")
+    try:
+        yield f
+    finally:
+        await loop.run_in_executor(None, f.close)
+
+
+def _httpx_timeout(timeout: Timeout) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class AsyncTurboPiClient:
+    """asyncio counterpart of `TurboPiClient`, backed by a pooled `httpx.AsyncClient`.
+
+    One instance can carry hundreds of concurrent calls and SSE streams on a
+    single event loop. Create it inside the loop that will use it.
+
+    response_cache: opt-in `ResponseCache` for GETs the backend marks cacheable,
+        exactly as in `TurboPiClient`.
+    resilience: opt-in `ResiliencePolicy` for GETs; hedges run as concurrent tasks
+        and the losing one is cancelled.
+    hooks: `metrics.Hooks` for this client; connect and TTFB timings come from
+        httpx's ``trace`` extension.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        timeouts: Optional[Mapping[str, Timeout]] = None,
+        pool_maxsize: Optional[int] = None,
+        keep_alive: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        resilience: Optional["ResiliencePolicy"] = None,
+        hooks: Optional[Iterable[metrics.Hooks]] = None,
+    ) -> None:
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.timeout = timeout
+        self.timeouts: Dict[str, Timeout] = dict(timeouts or {})
+        self.keep_alive = keep_alive
+        self.response_cache = response_cache
+        self.resilience: Optional["Resilience"] = None
+        if resilience is not None:
+            from ..resilience import Resilience
+
+            self.resilience = Resilience(resilience)
+        self.hooks: List[metrics.Hooks] = list(hooks or [])
+        # Long-lived SSE streams each hold a connection, so the pool is unbounded
+        # by default; only idle keep-alive connections are capped.
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=DEFAULT_POOL_MAXSIZE if keep_alive else 0,
+        )
+        self.session = httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=_httpx_timeout(timeout))
+
+    async def __aenter__(self) -> "AsyncTurboPiClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    def batch(self, parallel: bool = False, stop_on_error: bool = False) -> Batch:
+        """Start a `Batch` of operations sent in one round trip by `Batch.execute()`."""
+        return Batch(self, parallel=parallel, stop_on_error=stop_on_error)
+
+    def timeout_for(self, path: str, timeout: Optional[Timeout] = None) -> Timeout:
+        if timeout is not None:
+            return timeout
+        best: Optional[str] = None
+        for prefix in self.timeouts:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.timeouts[best] if best is not None else self.timeout
+
+    async def request(self, method: str, path: str, timeout: Optional[Timeout] = None, **kwargs: Any) -> httpx.Response:
+        hooks = metrics.combine(self.hooks)
+        if not hooks:
+            return await self.session.request(method, path, timeout=_httpx_timeout(self.timeout_for(path, timeout)), **kwargs)
+
+        call = metrics.CallTiming(method, path, (kwargs.get("headers") or {}).get("X-Trace-ID"))
+        metrics.emit(hooks, "on_request_start", call)
+        try:
+            resp = await self.session.request(
+                method,
+                path,
+                timeout=_httpx_timeout(self.timeout_for(path, timeout)),
+                extensions={"trace": metrics.httpx_trace(call)},
+                **kwargs,
+            )
+        except Exception as e:
+            call.finish(e)
+            metrics.emit(hooks, "on_complete", call)
+            raise
+        call.status = resp.status_code
+        metrics.emit(hooks, "on_response_headers", call)
+        call.finish()
+        metrics.emit(hooks, "on_complete", call)
+        return resp
+
+    async def _send_get(self, path: str, params: Optional[Dict[str, Any]], headers: Dict[str, str], timeout: Optional[Timeout]) -> httpx.Response:
+        if self.resilience is None:
+            return await self.request("GET", path, params=params or {}, headers=headers, timeout=timeout)
+        return await self.resilience.acall(
+            lambda: self.request("GET", path, params=params or {}, headers=headers, timeout=timeout),
+            (httpx.TransportError,),
+            AsyncCircuitOpenError,
+        )
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        cache = self.response_cache
+        if cache is None:
+            resp = await self._send_get(path, params, _headers(), timeout)
+            return _handle_response(resp)
+
+        key = cache.key(path, params)
+        entry, conditional = cache.lookup(key)
+        if entry is not None:
+            return entry.payload()
+        resp = await self._send_get(path, params, _headers(extra=conditional), timeout)
+        if resp.status_code == 304:
+            entry = cache.refresh(key, resp.headers)
+            if entry is not None:
+                return entry.payload()
+            # Evicted meanwhile: fetch the full body again.
+            resp = await self._send_get(path, params, _headers(), timeout)
+        if resp.status_code == 200:
+            cache.store(key, resp.headers, resp.content)
+        return _handle_response(resp)
+
+    def _invalidate(self, path: str) -> None:
+        if self.response_cache is not None:
+            self.response_cache.invalidate_for(path)
+
+    async def post_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = await self.request("POST", path, content=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    async def put_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = await self.request("PUT", path, content=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    async def patch_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = await self.request("PATCH", path, content=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    async def delete(self, path: str, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        hdr = _headers()
+        hdr.pop("Content-Type", None)
+        resp = await self.request("DELETE", path, headers=hdr, timeout=timeout)
+        return _handle_response(resp)
+
+    async def get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> bytes:
+        """GET a binary body (e.g. ``image/jpeg``) as-is; raises `httpx.HTTPStatusError` on failure."""
+        hdr = _headers(extra={"Accept": "*/*"})
+        hdr.pop("Content-Type", None)
+        resp = await self.request("GET", path, params=params or {}, headers=hdr, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+
+    async def iter_multipart(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> AsyncIterator[MJPEGFrame]:
+        """Async `TurboPiClient.iter_multipart`; raises `httpx.HTTPStatusError` if the stream cannot be opened."""
+        hdr = _headers(extra={"Accept": "multipart/x-mixed-replace"})
+        hdr.pop("Content-Type", None)
+        request = self.session.build_request(
+            "GET",
+            path,
+            params=params or {},
+            headers=hdr,
+            timeout=_httpx_timeout(self.timeout_for(path, timeout)),
+        )
+        resp = await self.session.send(request, stream=True)
+        try:
+            resp.raise_for_status()
+            parser = MJPEGParser(content_type_boundary(resp.headers.get("Content-Type")))
+            async for chunk in resp.aiter_bytes():
+                for frame in parser.feed(chunk):
+                    yield frame
+        finally:
+            await resp.aclose()
+
+    async def post_multipart(
+        self,
+        path: str,
+        fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, FileSpec]] = None,
+        timeout: Optional[Timeout] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        files: { field_name: (filename, bytes | memoryview | binary file object, mime) }
+        fields: regular form fields
+        progress: optional callback(bytes_sent, total_bytes_or_None)
+        """
+        self._invalidate(path)
+        body, body_headers = build_multipart(fields, files, progress)
+        hdr = _headers(extra={"Accept": "application/json", **body_headers})
+        resp = await self.request("POST", path, content=_aiter_body(body), headers=hdr, timeout=timeout)
+        return _handle_response(resp)
+
+    def _build_sse_request(
+        self,
+        path: str,
+        method: str,
+        json_body: Optional[Dict[str, Any]],
+        form_fields: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, FileSpec]],
+        timeout: Optional[Timeout],
+        last_event_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+        call: Optional[metrics.CallTiming] = None,
+    ) -> httpx.Request:
+        headers = _headers(extra={"Accept": "text/event-stream"})
+        kwargs: Dict[str, Any] = {}
+        if last_event_id is not None:
+            # The backend replays from its buffer and ignores the body on resume.
+            headers["Last-Event-ID"] = last_event_id
+            headers.pop("Content-Type", None)
+        elif method.upper() != "GET":
+            if files:
+                body, body_headers = build_multipart(form_fields, files, progress)
+                headers.update(body_headers)
+                kwargs = {"content": _aiter_body(body)}
+            elif json_body is not None:
+                headers["Content-Type"] = "application/json"
+                kwargs = {"content": codec.dumps(json_body)}
+            elif form_fields is not None:
+                headers.pop("Content-Type", None)
+                kwargs = {"data": form_fields}
+        if call is not None:
+            call.trace_id = headers["X-Trace-ID"]
+            kwargs["extensions"] = {"trace": metrics.httpx_trace(call)}
+        return self.session.build_request(
+            method.upper(),
+            path,
+            headers=headers,
+            timeout=_httpx_timeout(self.timeout_for(path, timeout)),
+            **kwargs,
+        )
+
+    async def iter_sse_events(
+        self,
+        path: str,
+        method: str = "POST",
+        json_body: Optional[Dict[str, Any]] = None,
+        form_fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, FileSpec]] = None,
+        timeout: Optional[Timeout] = None,
+        max_reconnects: int = DEFAULT_SSE_RECONNECTS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Open an SSE stream and asynchronously yield parsed event objects.
+        Accepts the same arguments as the blocking `TurboPiClient.iter_sse_events`,
+        including `Last-Event-ID` resume after a dropped connection.
+        """
+        parser = SSEParser()
+        resume_from: Optional[str] = None
+        failures = 0
+        while True:
+            try:
+                hooks = metrics.combine(self.hooks)
+                call = metrics.CallTiming(method.upper(), path, stream=True) if hooks else None
+                request = self._build_sse_request(path, method, json_body, form_fields, files, timeout, resume_from, progress, call)
+                if call is not None:
+                    metrics.emit(hooks, "on_request_start", call)
+                error: Optional[BaseException] = None
+                try:
+                    resp = await self.session.send(request, stream=True)
+                    if call is not None:
+                        call.status = resp.status_code
+                        metrics.emit(hooks, "on_response_headers", call)
+                    try:
+                        resp.raise_for_status()
+                        async for chunk in resp.aiter_bytes():
+                            for event in parser.feed(chunk):
+                                failures = 0
+                                payload = event_payload(event)
+                                raise_for_stream_error(event, payload)
+                                if call is not None and call.sse_event(payload):
+                                    metrics.emit(hooks, "on_first_sse_event", call)
+                                yield payload
+                    finally:
+                        await resp.aclose()
+                except BaseException as e:
+                    error = None if isinstance(e, GeneratorExit) else e
+                    raise
+                finally:
+                    if call is not None:
+                        call.finish(error)
+                        metrics.emit(hooks, "on_complete", call)
+                return
+            except httpx.TransportError:
+                if parser.last_event_id is None or failures >= max_reconnects:
+                    raise
+            failures += 1
+            resume_from = parser.last_event_id
+            parser.reset()
+            await asyncio.sleep(reconnect_delay(failures, parser.retry))
+
+
+# httpx clients are bound to the event loop they first ran on, so the lazily
+# created default is per loop. asyncio has no loop-shutdown hook: call
+# `aclose_default_client()` before the loop ends (or install a client with
+# `set_default_client` and close it yourself) to release its connections.
+_default_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncTurboPiClient]" = weakref.WeakKeyDictionary()
+_default_client: Optional[AsyncTurboPiClient] = None
+_default_lock = threading.Lock()
+
+
+def get_default_client() -> AsyncTurboPiClient:
+    """Return the shared async client used by the `turbopi_sdk.aio` module functions.
+
+    Without an installed client, each running event loop gets its own.
+    """
+    client = _default_client
+    if client is not None:
+        return client
+    loop = asyncio.get_running_loop()
+    with _default_lock:
+        client = _default_clients.get(loop)
+        if client is None:
+            client = _default_clients[loop] = AsyncTurboPiClient()
+    return client
+
+
+def set_default_client(client: Optional[AsyncTurboPiClient]) -> None:
+    """Install `client` for the `turbopi_sdk.aio` module functions (None restores lazy per-loop creation)."""
+    global _default_client
+    _default_client = client
+
+
+async def aclose_default_client() -> None:
+    """Close the running loop's lazily created default client (if any).
+
+    Call it at the end of the coroutine passed to `asyncio.run()`; the next use
+    of the module functions creates a fresh client. An installed client is left
+    to its owner.
+    """
+    loop = asyncio.get_running_loop()
+    with _default_lock:
+        client = _default_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,50 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..config_api import WATCH_RECONNECTS, WATCH_TIMEOUT, _watch_path
+from .http import http_get, http_post_json, http_put_json, http_patch_json, iter_sse_events
+
+
+async def get_config(include_secrets: bool = False) -> Dict[str, Any]:
+    params = {"include_secrets": str(bool(include_secrets)).lower()}
+    return await http_get("/api/v1/config/", params=params)
+
+
+async def put_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    return await http_put_json("/api/v1/config/", config)
+
+
+async def patch_config(partial: Dict[str, Any]) -> Dict[str, Any]:
+    return await http_patch_json("/api/v1/config/", partial)
+
+
+async def get_schema() -> Dict[str, Any]:
+    return await http_get("/api/v1/config/schema")
+
+
+async def reset_config() -> Dict[str, Any]:
+    return await http_post_json("/api/v1/config/reset", {})
+
+
+async def get_config_with_secrets() -> Dict[str, Any]:
+    return await http_get("/api/v1/config/secrets")
+
+
+def watch_config(
+    since: Optional[int] = None,
+    include_secrets: bool = False,
+    max_reconnects: int = WATCH_RECONNECTS,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async `turbopi_sdk.config_api.watch_config`; use with ``async for``."""
+    return iter_sse_events(
+        _watch_path(since, include_secrets),
+        method="GET",
+        timeout=WATCH_TIMEOUT,
+        max_reconnects=max_reconnects,
+    )
+
+
+async def poll_config_changes(since: Optional[int] = None, timeout: float = 25.0, include_secrets: bool = False) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"timeout": timeout, "include_secrets": str(bool(include_secrets)).lower()}
+    if since is not None:
+        params["since"] = int(since)
+    return await http_get("/api/v1/config/watch", params=params, timeout=(10, timeout + 10))
@@ -0,0 +1,36 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from .http import http_delete, http_get, http_post_json, iter_sse_events
+
+
+async def create(messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    body = {"messages": messages or []}
+    return await http_post_json("/api/v1/coze/conversations/", body)
+
+
+def stream(text: str, bot_id: str, user_id: str = "fake user id", conversation_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    body = {
+        "text": text,
+        "bot_id": bot_id,
+        "user_id": user_id,
+        "conversation_id": conversation_id,
+    }
+    return iter_sse_events("/api/v1/coze/conversations/stream", method="POST", json_body=body)
+
+
+def stream_plugins(text: str, bot_id: str, user_id: str = "fake user id", conversation_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    body = {
+        "text": text,
+        "bot_id": bot_id,
+        "user_id": user_id,
+        "conversation_id": conversation_id,
+    }
+    return iter_sse_events("/api/v1/coze/conversations/stream/plugins", method="POST", json_body=body)
+
+
+async def retrieve(conversation_id: str) -> Dict[str, Any]:
+    return await http_get(f"/api/v1/coze/conversations/{conversation_id}")
+
+
+async def delete(conversation_id: str) -> Dict[str, Any]:
+    return await http_delete(f"/api/v1/coze/conversations/{conversation_id}")
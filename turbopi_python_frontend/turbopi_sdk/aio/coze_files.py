@@ -0,0 +1,22 @@
+from typing import Any, Dict, Optional
+
+from ..multipart import ProgressCallback
+from .client import _open_binary
+from .http import http_delete, http_get, http_post_multipart
+
+
+async def upload_file(file_path: str, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    async with _open_binary(file_path) as f:
+        files = {
+            "file": (file_path.split("/")[-1] or "upload.bin", f, "application/octet-stream"),
+        }
+        return await http_post_multipart("/api/v1/coze/files/upload", files=files, progress=progress)
+
+
+async def cache_stats() -> Dict[str, Any]:
+    # Hit/miss counters of the backend's content-addressed file_id cache.
+    return await http_get("/api/v1/coze/files/cache")
+
+
+async def clear_cache() -> Dict[str, Any]:
+    return await http_delete("/api/v1/coze/files/cache")
\ No newline at end of file
@@ -0,0 +1,32 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..multipart import ProgressCallback
+from .client import _open_binary
+from .http import iter_sse_events
+
+
+async def image_chat_stream(
+    text: str,
+    bot_id: str,
+    file_path: Optional[str] = None,
+    user_id: str = "user id",
+    conversation_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    fields = {
+        "text": text,
+        "bot_id": bot_id,
+        "user_id": user_id,
+        "conversation_id": conversation_id or "",
+    }
+    if not file_path:
+        async for event in iter_sse_events("/api/v1/coze/image/chat/stream", method="POST", form_fields=fields):
+            yield event
+        return
+    # Keep the image open while the request streams it; field name is `file` per backend API
+    async with _open_binary(file_path) as f:
+        files = {
+            "file": (file_path.split("/")[-1] or "image.bin", f, "application/octet-stream"),
+        }
+        async for event in iter_sse_events("/api/v1/coze/image/chat/stream", method="POST", form_fields=fields, files=files, progress=progress):
+            yield event
@@ -0,0 +1,16 @@
+from typing import Any, Dict, Optional
+
+from ..coze_transcriptions import guess_audio_mime
+from ..multipart import ProgressCallback
+from .client import _open_binary
+from .http import http_post_multipart
+
+
+async def transcribe_audio(file_path: str, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """异步版本的 `turbopi_sdk.coze_transcriptions.transcribe_audio`。"""
+    filename = (file_path.split("/")[-1] or "audio.wav")
+    async with _open_binary(file_path) as f:
+        files = {
+            "file": (filename, f, guess_audio_mime(filename)),
+        }
+        return await http_post_multipart("/api/v1/coze/audio/transcriptions", files=files, progress=progress)
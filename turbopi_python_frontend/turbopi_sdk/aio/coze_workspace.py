@@ -0,0 +1,13 @@
+from typing import Any, Dict
+
+from .http import http_get
+from .config_api import patch_config
+
+
+async def get_workspace_id() -> Dict[str, Any]:
+    return await http_get("/api/v1/coze/workspace/id")
+
+
+async def set_workspace_id(workspace_id: str) -> Dict[str, Any]:
+    """通过配置接口写入 Coze Workspace ID（PATCH /api/v1/config/）。"""
+    return await patch_config({"coze_workspace_id": workspace_id})
@@ -0,0 +1,77 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from ..client import DEFAULT_SSE_RECONNECTS, Timeout
+from ..mjpeg import MJPEGFrame
+from ..multipart import FileSpec, ProgressCallback
+from .client import AsyncTurboPiClient, get_default_client, set_default_client
+
+
+async def http_get(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return await get_default_client().get(path, params=params, timeout=timeout)
+
+
+async def http_get_bytes(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> bytes:
+    return await get_default_client().get_bytes(path, params=params, timeout=timeout)
+
+
+def http_iter_multipart(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> AsyncIterator[MJPEGFrame]:
+    """Open a ``multipart/x-mixed-replace`` stream; use with ``async for``."""
+    return get_default_client().iter_multipart(path, params=params, timeout=timeout)
+
+
+async def http_post_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return await get_default_client().post_json(path, body, timeout=timeout)
+
+
+async def http_put_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return await get_default_client().put_json(path, body, timeout=timeout)
+
+
+async def http_patch_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return await get_default_client().patch_json(path, body, timeout=timeout)
+
+
+async def http_delete(path: str, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return await get_default_client().delete(path, timeout=timeout)
+
+
+async def http_post_multipart(
+    path: str,
+    fields: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, FileSpec]] = None,
+    timeout: Optional[Timeout] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Any]:
+    """
+    files: { field_name: (filename, bytes | memoryview | binary file object, mime) }
+    fields: regular form fields
+    progress: optional callback(bytes_sent, total_bytes_or_None)
+    """
+    return await get_default_client().post_multipart(path, fields=fields, files=files, timeout=timeout, progress=progress)
+
+
+def iter_sse_events(
+    path: str,
+    method: str = "POST",
+    json_body: Optional[Dict[str, Any]] = None,
+    form_fields: Optional[Dict[str, Any]] = None,
+    files: Optional[Dict[str, FileSpec]] = None,
+    timeout: Optional[Timeout] = None,
+    max_reconnects: int = DEFAULT_SSE_RECONNECTS,
+    progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Open an SSE stream; use with ``async for``.
+    - For JSON: set method="POST" and provide json_body
+    - For multipart form: provide form_fields/files
+    """
+    return get_default_client().iter_sse_events(
+        path,
+        method=method,
+        json_body=json_body,
+        form_fields=form_fields,
+        files=files,
+        timeout=timeout,
+        max_reconnects=max_reconnects,
+        progress=progress,
+    )
@@ -0,0 +1,15 @@
+from typing import Any, Dict
+
+from .http import http_get
+
+
+async def get_status() -> Dict[str, Any]:
+    return await http_get("/status/")
+
+
+async def get_health() -> Dict[str, Any]:
+    return await http_get("/status/health")
+
+
+async def get_mode() -> Dict[str, Any]:
+    return await http_get("/status/mode")
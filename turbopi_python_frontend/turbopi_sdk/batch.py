@@ -0,0 +1,132 @@
+from typing import Any, Dict, List, Optional
+
+BATCH_PATH = "/api/v1/batch"
+
+
+class Batch:
+    """Builder for `POST /api/v1/batch`: several robot operations, one round trip.
+
+    Queue operations with the helper methods (each returns the builder, so calls
+    chain) and send them with `execute()`::
+
+        b = client.batch()
+        b.get_state().move("forward", duration_ms=500, speed=0.5).stop().get_state()
+        resp = b.execute()
+        for result in resp["data"]["results"]:
+            print(result["status"], result["body"])
+
+    With an `AsyncTurboPiClient`, `execute()` returns an awaitable.
+
+    parallel: run the operations concurrently on the robot instead of in order.
+    stop_on_error: in sequential mode, skip the remaining operations after a failure.
+    """
+
+    def __init__(self, client: Any, parallel: bool = False, stop_on_error: bool = False) -> None:
+        self._client = client
+        self.parallel = parallel
+        self.stop_on_error = stop_on_error
+        self.operations: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def add(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Any] = None,
+        params: Optional[Dict[str, Any]] = None,
+        id: Optional[str] = None,
+    ) -> "Batch":
+        op: Dict[str, Any] = {"method": method.upper(), "path": path}
+        if body is not None:
+            op["body"] = body
+        if params:
+            op["params"] = params
+        if id is not None:
+            op["id"] = id
+        self.operations.append(op)
+        return self
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, id: Optional[str] = None) -> "Batch":
+        return self.add("GET", path, params=params, id=id)
+
+    def post(self, path: str, body: Optional[Dict[str, Any]] = None, id: Optional[str] = None) -> "Batch":
+        return self.add("POST", path, body=body or {}, id=id)
+
+    # control
+    def move(self, command: str, duration_ms: Optional[int] = None, speed: Optional[float] = None, id: Optional[str] = None) -> "Batch":
+        body: Dict[str, Any] = {"command": command}
+        if duration_ms is not None:
+            body["duration_ms"] = int(duration_ms)
+        if speed is not None:
+            body["speed"] = float(speed)
+        return self.post("/control/move", body, id=id)
+
+    def stop(self, id: Optional[str] = None) -> "Batch":
+        return self.post("/control/stop", id=id)
+
+    def estop(self, id: Optional[str] = None) -> "Batch":
+        return self.post("/control/estop", id=id)
+
+    def get_state(self, id: Optional[str] = None) -> "Batch":
+        return self.get("/control/state", id=id)
+
+    # buzzer
+    def set_buzzer(self, freq: Optional[int] = None, on_time: Optional[float] = None, off_time: Optional[float] = None, repeat: Optional[int] = None, id: Optional[str] = None) -> "Batch":
+        body: Dict[str, Any] = {}
+        if freq is not None:
+            body["freq"] = int(freq)
+        if on_time is not None:
+            body["on_time"] = float(on_time)
+        if off_time is not None:
+            body["off_time"] = float(off_time)
+        if repeat is not None:
+            body["repeat"] = int(repeat)
+        return self.post("/api/v1/buzzer/set", body, id=id)
+
+    # camera
+    def snapshot(self, width: Optional[int] = None, height: Optional[int] = None, quality: Optional[int] = None, id: Optional[str] = None) -> "Batch":
+        body: Dict[str, Any] = {}
+        if width is not None:
+            body["width"] = int(width)
+        if height is not None:
+            body["height"] = int(height)
+        if quality is not None:
+            body["quality"] = int(quality)
+        return self.post("/api/v1/camera/snapshot", body, id=id)
+
+    # status
+    def get_status(self, id: Optional[str] = None) -> "Batch":
+        return self.get("/status/", id=id)
+
+    def get_health(self, id: Optional[str] = None) -> "Batch":
+        return self.get("/status/health", id=id)
+
+    def get_mode(self, id: Optional[str] = None) -> "Batch":
+        return self.get("/status/mode", id=id)
+
+    # config
+    def get_config(self, include_secrets: bool = False, id: Optional[str] = None) -> "Batch":
+        return self.get("/api/v1/config/", params={"include_secrets": str(bool(include_secrets)).lower()}, id=id)
+
+    def patch_config(self, partial: Dict[str, Any], id: Optional[str] = None) -> "Batch":
+        return self.add("PATCH", "/api/v1/config/", body=partial, id=id)
+
+    def payload(self) -> Dict[str, Any]:
+        return {
+            "operations": list(self.operations),
+            "mode": "parallel" if self.parallel else "sequential",
+            "stop_on_error": bool(self.stop_on_error),
+        }
+
+    def execute(self) -> Any:
+        """Send the queued operations; returns the backend response (awaitable for async clients)."""
+        return self._client.post_json(BATCH_PATH, self.payload())
+
+
+def batch(parallel: bool = False, stop_on_error: bool = False) -> Batch:
+    """Start a batch on the shared default client."""
+    from .client import get_default_client
+
+    return Batch(get_default_client(), parallel=parallel, stop_on_error=stop_on_error)
@@ -1,6 +1,7 @@
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Union
 
-from .http import http_post_json
+from .http import http_get_bytes, http_iter_multipart, http_post_json
 
 
 def snapshot(width: Optional[int] = None, height: Optional[int] = None, quality: Optional[int] = None) -> Dict[str, Any]:
@@ -11,4 +12,75 @@ def snapshot(width: Optional[int] = None, height: Optional[int] = None, quality:
         body["height"] = int(height)
     if quality is not None:
         body["quality"] = int(quality)
-    return http_post_json("/api/v1/camera/snapshot", body)
\ No newline at end of file
+    return http_post_json("/api/v1/camera/snapshot", body)
+
+
+def _snapshot_params(
+    width: Optional[int],
+    height: Optional[int],
+    quality: Optional[int],
+    newer_than: Union[float, str, datetime, None] = None,
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    if width is not None:
+        params["width"] = int(width)
+    if height is not None:
+        params["height"] = int(height)
+    if quality is not None:
+        params["quality"] = int(quality)
+    if isinstance(newer_than, datetime):
+        params["newer_than"] = newer_than.isoformat()
+    elif newer_than is not None:
+        params["newer_than"] = newer_than
+    return params
+
+
+def snapshot_bytes(
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = None,
+    as_memoryview: bool = False,
+    newer_than: Union[float, str, datetime, None] = None,
+) -> Union[bytes, memoryview]:
+    """
+    Raw JPEG snapshot from ``GET /api/v1/camera/snapshot.jpg`` (no base64 step).
+    `as_memoryview=True` returns a zero-copy view, e.g. for ``numpy.frombuffer``.
+    `newer_than` (epoch seconds, ISO string or datetime) asks for a frame captured
+    after that time instead of the newest cached one.
+    Raises `requests.HTTPError` if the capture fails.
+    """
+    params = _snapshot_params(width, height, quality, newer_than)
+    data = http_get_bytes("/api/v1/camera/snapshot.jpg", params=params)
+    return memoryview(data) if as_memoryview else data
+
+
+def _stream_params(fps: Optional[float], width: Optional[int], height: Optional[int], quality: Optional[int]) -> Dict[str, Any]:
+    params = _snapshot_params(width, height, quality)
+    if fps is not None:
+        params["fps"] = float(fps)
+    return params
+
+
+def frames(
+    fps: Optional[float] = None,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = None,
+    max_frames: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Live JPEG frames from the MJPEG stream ``GET /api/v1/camera/stream``, yielded
+    one by one as they arrive over a single connection (no request per frame).
+    Stops after `max_frames` if given; otherwise break out of the loop (or close
+    the generator) to end the stream. Raises `requests.HTTPError` if the stream
+    cannot be opened.
+    """
+    params = _stream_params(fps, width, height, quality)
+    stream = http_iter_multipart("/api/v1/camera/stream", params=params)
+    try:
+        for count, frame in enumerate(stream, 1):
+            yield frame.data
+            if max_frames is not None and count >= max_frames:
+                return
+    finally:
+        stream.close()
@@ -0,0 +1,423 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from . import codec, metrics
+from .batch import Batch
+from .mjpeg import MJPEGFrame, MJPEGParser, content_type_boundary, iter_mjpeg
+from .multipart import FileSpec, ProgressCallback, build_multipart
+from .response_cache import ResponseCache
+from .sdk_config import get_base_url
+from .sse import SSEParser, event_payload, iter_sse, raise_for_stream_error, reconnect_delay
+
+if TYPE_CHECKING:
+    import requests
+
+    from .resilience import Resilience, ResiliencePolicy
+
+# `requests` (and `uuid`) are imported on first use, not at import time: short-lived
+# scripts should not pay ~100 ms of imports before their first call.
+
+DEFAULT_TIMEOUT = 15  # seconds
+DEFAULT_POOL_CONNECTIONS = 1
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_SSE_RECONNECTS = 5
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def _sse_dropped() -> Tuple[type, ...]:
+    """Transport failures after which an SSE stream is resumed rather than raised."""
+    import requests
+
+    return (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+def _headers(trace_id: Optional[str] = None, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    import uuid
+
+    h = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+        "X-Trace-ID": trace_id or str(uuid.uuid4()),
+    }
+    if extra:
+        h.update(extra)
+    return h
+
+
+def _handle_response(resp: "requests.Response") -> Dict[str, Any]:
+    import requests
+
+    try:
+        resp.raise_for_status()
+        return codec.loads(resp.content)
+    except requests.HTTPError:
+        # Try to parse backend error format
+        try:
+            data = codec.loads(resp.content)
+            # FastAPI HTTPException uses {"detail": {...}}
+            if isinstance(data, dict) and "detail" in data:
+                return {"success": False, "error": data["detail"], "status": resp.status_code}
+            return {"success": False, "error": data, "status": resp.status_code}
+        except Exception:
+            return {"success": False, "error": resp.text, "status": resp.status_code}
+
+
+class TurboPiClient:
+    """Pooled, keep-alive HTTP client bound to one Turbopi backend.
+
+    All calls share one `requests.Session`, so consecutive control/status calls
+    reuse an open TCP connection instead of paying a new handshake on every call.
+    The base URL is resolved once, when the client is created.
+
+    timeouts: per-endpoint overrides keyed by path prefix; the longest matching
+        prefix wins, e.g. ``{"/control/": 3, "/api/v1/coze/": 60}``. Values may be
+        a float or a ``(connect, read)`` tuple, as accepted by `requests`.
+    response_cache: opt-in `ResponseCache` for GETs the backend marks cacheable
+        (ETag / max-age); writes to config/bot routes through this client clear it.
+    resilience: opt-in `ResiliencePolicy` (hedging, retries, circuit breaker)
+        applied to GETs only; writes such as `control.move` are never repeated.
+        Counters, including how often a hedge won, are in ``client.resilience.stats()``.
+    hooks: `metrics.Hooks` called for every request of this client, in addition
+        to the process-wide ones (`metrics.add_hooks`, `metrics.enable_metrics`).
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        timeouts: Optional[Mapping[str, Timeout]] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive: bool = True,
+        response_cache: Optional[ResponseCache] = None,
+        resilience: Optional["ResiliencePolicy"] = None,
+        hooks: Optional[Iterable[metrics.Hooks]] = None,
+    ) -> None:
+        self.base_url = (base_url or get_base_url()).rstrip("/")
+        self.timeout = timeout
+        self.timeouts: Dict[str, Timeout] = dict(timeouts or {})
+        self.keep_alive = keep_alive
+        self.response_cache = response_cache
+        self.resilience: Optional["Resilience"] = None
+        self.hooks: List[metrics.Hooks] = list(hooks or [])
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if resilience is not None:
+            from .resilience import Resilience
+
+            self.resilience = Resilience(resilience)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        metrics.install_connect_timer(adapter)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def __enter__(self) -> "TurboPiClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.resilience is not None:
+            self.resilience.close()
+        self.session.close()
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}{path}"
+
+    def batch(self, parallel: bool = False, stop_on_error: bool = False) -> Batch:
+        """Start a `Batch` of operations sent in one round trip by `Batch.execute()`."""
+        return Batch(self, parallel=parallel, stop_on_error=stop_on_error)
+
+    def timeout_for(self, path: str, timeout: Optional[Timeout] = None) -> Timeout:
+        if timeout is not None:
+            return timeout
+        best: Optional[str] = None
+        for prefix in self.timeouts:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return self.timeouts[best] if best is not None else self.timeout
+
+    def request(self, method: str, path: str, timeout: Optional[Timeout] = None, **kwargs: Any) -> "requests.Response":
+        hooks = metrics.combine(self.hooks)
+        if not hooks:
+            return self.session.request(method, self.url(path), timeout=self.timeout_for(path, timeout), **kwargs)
+
+        stream = bool(kwargs.get("stream"))
+        call = metrics.CallTiming(method, path, (kwargs.get("headers") or {}).get("X-Trace-ID"), stream=stream)
+        metrics.emit(hooks, "on_request_start", call)
+        metrics.reset_connect_timer()
+        try:
+            resp = self.session.request(method, self.url(path), timeout=self.timeout_for(path, timeout), **kwargs)
+        except Exception as e:
+            call.connect_ms = metrics.take_connect_ms()
+            call.finish(e)
+            metrics.emit(hooks, "on_complete", call)
+            raise
+        call.connect_ms = metrics.take_connect_ms()
+        call.status = resp.status_code
+        call.ttfb_ms = resp.elapsed.total_seconds() * 1000
+        metrics.emit(hooks, "on_response_headers", call)
+        if stream:
+            # Completed by the stream consumer (`iter_sse_events`).
+            resp.turbopi_call = call
+        else:
+            call.finish()
+            metrics.emit(hooks, "on_complete", call)
+        return resp
+
+    def _send_get(self, path: str, params: Optional[Dict[str, Any]], headers: Dict[str, str], timeout: Optional[Timeout]) -> "requests.Response":
+        if self.resilience is None:
+            return self.request("GET", path, params=params or {}, headers=headers, timeout=timeout)
+        # Hedged copies share the trace id, so the backend logs show them as one call.
+        return self.resilience.call(lambda: self.request("GET", path, params=params or {}, headers=headers, timeout=timeout))
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        cache = self.response_cache
+        if cache is None:
+            resp = self._send_get(path, params, _headers(), timeout)
+            return _handle_response(resp)
+
+        key = cache.key(path, params)
+        entry, conditional = cache.lookup(key)
+        if entry is not None:
+            return entry.payload()
+        resp = self._send_get(path, params, _headers(extra=conditional), timeout)
+        if resp.status_code == 304:
+            entry = cache.refresh(key, resp.headers)
+            if entry is not None:
+                return entry.payload()
+            # Evicted meanwhile: fetch the full body again.
+            resp = self._send_get(path, params, _headers(), timeout)
+        if resp.status_code == 200:
+            cache.store(key, resp.headers, resp.content)
+        return _handle_response(resp)
+
+    def _invalidate(self, path: str) -> None:
+        if self.response_cache is not None:
+            self.response_cache.invalidate_for(path)
+
+    def post_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = self.request("POST", path, data=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    def put_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = self.request("PUT", path, data=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    def patch_json(self, path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        resp = self.request("PATCH", path, data=codec.dumps(body or {}), headers=_headers(), timeout=timeout)
+        return _handle_response(resp)
+
+    def delete(self, path: str, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+        self._invalidate(path)
+        hdr = _headers()
+        hdr.pop("Content-Type", None)
+        resp = self.request("DELETE", path, headers=hdr, timeout=timeout)
+        return _handle_response(resp)
+
+    def get_bytes(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> bytes:
+        """GET a binary body (e.g. ``image/jpeg``) as-is; raises `requests.HTTPError` on failure."""
+        hdr = _headers(extra={"Accept": "*/*"})
+        hdr.pop("Content-Type", None)
+        resp = self.request("GET", path, params=params or {}, headers=hdr, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+
+    def iter_multipart(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Iterator[MJPEGFrame]:
+        """
+        GET a ``multipart/x-mixed-replace`` stream (e.g. MJPEG) and yield each part
+        as soon as it has arrived. Closing the generator closes the connection.
+        Raises `requests.HTTPError` if the stream cannot be opened.
+        """
+        hdr = _headers(extra={"Accept": "multipart/x-mixed-replace"})
+        hdr.pop("Content-Type", None)
+        r = self.request("GET", path, params=params or {}, headers=hdr, stream=True, timeout=timeout)
+        call: Optional[metrics.CallTiming] = getattr(r, "turbopi_call", None)
+        error: Optional[BaseException] = None
+        try:
+            with r:
+                r.raise_for_status()
+                parser = MJPEGParser(content_type_boundary(r.headers.get("Content-Type")))
+                yield from iter_mjpeg(r.iter_content(chunk_size=None), parser)
+        except BaseException as e:
+            error = None if isinstance(e, GeneratorExit) else e
+            raise
+        finally:
+            if call is not None:
+                call.finish(error)
+                metrics.emit(metrics.combine(self.hooks), "on_complete", call)
+
+    def post_multipart(
+        self,
+        path: str,
+        fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, FileSpec]] = None,
+        timeout: Optional[Timeout] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        files: { field_name: (filename, bytes | memoryview | binary file object, mime) }
+        fields: regular form fields
+        progress: optional callback(bytes_sent, total_bytes_or_None)
+
+        File contents are streamed in chunks rather than loaded into memory.
+        """
+        self._invalidate(path)
+        body, body_headers = build_multipart(fields, files, progress)
+        hdr = _headers(extra={"Accept": "application/json", **body_headers})
+        resp = self.request("POST", path, data=body, headers=hdr, timeout=timeout)
+        return _handle_response(resp)
+
+    def _open_sse(
+        self,
+        path: str,
+        method: str,
+        json_body: Optional[Dict[str, Any]],
+        form_fields: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, FileSpec]],
+        timeout: Optional[Timeout],
+        last_event_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> "requests.Response":
+        headers = _headers(extra={"Accept": "text/event-stream"})
+        if last_event_id is not None:
+            # The backend replays from its buffer and ignores the body on resume.
+            headers["Last-Event-ID"] = last_event_id
+            headers.pop("Content-Type", None)
+            return self.request(method.upper(), path, headers=headers, stream=True, timeout=timeout)
+        if method.upper() == "GET":
+            return self.request("GET", path, headers=headers, stream=True, timeout=timeout)
+        if files:
+            # multipart/form-data with files, streamed from their sources
+            body, body_headers = build_multipart(form_fields, files, progress)
+            headers.update(body_headers)
+            return self.request("POST", path, data=body, headers=headers, stream=True, timeout=timeout)
+        if json_body is not None:
+            # application/json body
+            headers["Content-Type"] = "application/json"
+            return self.request("POST", path, data=codec.dumps(json_body), headers=headers, stream=True, timeout=timeout)
+        if form_fields is not None:
+            # x-www-form-urlencoded body (no files)
+            headers.pop("Content-Type", None)
+            return self.request("POST", path, data=form_fields, headers=headers, stream=True, timeout=timeout)
+        # no body
+        return self.request("POST", path, headers=headers, stream=True, timeout=timeout)
+
+    def iter_sse_events(
+        self,
+        path: str,
+        method: str = "POST",
+        json_body: Optional[Dict[str, Any]] = None,
+        form_fields: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, FileSpec]] = None,
+        timeout: Optional[Timeout] = None,
+        max_reconnects: int = DEFAULT_SSE_RECONNECTS,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Iterable[Dict[str, Any]]:
+        """
+        Open an SSE stream and yield parsed event objects.
+        - For JSON: set method="POST" and provide json_body
+        - For multipart form: provide form_fields/files (streamed; `progress` reports upload bytes)
+
+        If the connection drops after at least one event carried an id, the stream
+        is resumed with `Last-Event-ID` (jittered backoff, up to `max_reconnects`
+        consecutive attempts) and continues without duplicating events.
+        """
+        parser = SSEParser()
+        resume_from: Optional[str] = None
+        failures = 0
+        while True:
+            try:
+                r = self._open_sse(path, method, json_body, form_fields, files, timeout, resume_from, progress)
+                call: Optional[metrics.CallTiming] = getattr(r, "turbopi_call", None)
+                error: Optional[BaseException] = None
+                # Always hand the connection back to the pool, even if the caller stops early.
+                try:
+                    with r:
+                        r.raise_for_status()
+                        for event in iter_sse(r.iter_content(chunk_size=None), parser):
+                            failures = 0
+                            payload = event_payload(event)
+                            raise_for_stream_error(event, payload)
+                            if call is not None and call.sse_event(payload):
+                                metrics.emit(metrics.combine(self.hooks), "on_first_sse_event", call)
+                            yield payload
+                except BaseException as e:
+                    error = None if isinstance(e, GeneratorExit) else e
+                    raise
+                finally:
+                    if call is not None:
+                        call.finish(error)
+                        metrics.emit(metrics.combine(self.hooks), "on_complete", call)
+                return
+            except _sse_dropped():
+                if parser.last_event_id is None or failures >= max_reconnects:
+                    raise
+            failures += 1
+            resume_from = parser.last_event_id
+            parser.reset()
+            time.sleep(reconnect_delay(failures, parser.retry))
+
+
+_default_client: Optional[TurboPiClient] = None
+_default_lock = threading.Lock()
+_client_override: "contextvars.ContextVar[Optional[TurboPiClient]]" = contextvars.ContextVar(
+    "turbopi_client_override", default=None
+)
+
+
+def get_default_client() -> TurboPiClient:
+    """Return the shared client used by the module-level SDK functions."""
+    override = _client_override.get()
+    if override is not None:
+        return override
+    global _default_client
+    client = _default_client
+    if client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = TurboPiClient()
+            client = _default_client
+    return client
+
+
+def set_default_client(client: Optional[TurboPiClient]) -> None:
+    """Install `client` for the module-level SDK functions (None restores lazy creation)."""
+    global _default_client
+    with _default_lock:
+        old, _default_client = _default_client, client
+    if old is not None and old is not client:
+        old.close()
+
+
+def reset_default_client() -> None:
+    """Drop the shared client so the next call re-reads the server address."""
+    set_default_client(None)
+
+
+@contextmanager
+def using_client(client: TurboPiClient) -> Iterator[TurboPiClient]:
+    """Route module-level SDK calls in the current context (thread/task) to `client`.
+
+    Unlike `set_default_client`, this does not affect other threads, so the same
+    SDK function can run against several robots concurrently.
+    """
+    token = _client_override.set(client)
+    try:
+        yield client
+    finally:
+        _client_override.reset(token)
@@ -0,0 +1,76 @@
+import json
+import os
+from typing import Any, Callable, Union
+
+# Optional dependency (pip install orjson), imported only when fast JSON is enabled.
+orjson: Any = None
+
+_ENV_KEY = "TURBOPI_FAST_JSON"
+
+JSONInput = Union[bytes, bytearray, memoryview, str]
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _std_loads(data: JSONInput) -> Any:
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data: JSONInput) -> Any:
+    return orjson.loads(data)
+
+
+_dumps: Callable[[Any], bytes] = _std_dumps
+_loads: Callable[[JSONInput], Any] = _std_loads
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode `obj` as compact UTF-8 JSON bytes with the active codec."""
+    return _dumps(obj)
+
+
+def loads(data: JSONInput) -> Any:
+    """Decode JSON from bytes or str with the active codec."""
+    return _loads(data)
+
+
+def _load_orjson() -> Any:
+    global orjson
+    if orjson is None:
+        try:
+            import orjson as module
+        except ImportError:
+            return None
+        orjson = module
+    return orjson
+
+
+def use_fast_json(enabled: bool = True) -> bool:
+    """Switch the SDK's JSON codec to orjson (when installed) or back to the stdlib.
+
+    Affects request bodies, response decoding and SSE payloads. Returns True if
+    orjson is now active; without orjson installed this is a no-op returning False.
+    """
+    global _dumps, _loads
+    if enabled and _load_orjson() is not None:
+        _dumps, _loads = _orjson_dumps, _orjson_loads
+        return True
+    _dumps, _loads = _std_dumps, _std_loads
+    return False
+
+
+def fast_json_enabled() -> bool:
+    return _loads is _orjson_loads
+
+
+# Opt in from the environment: TURBOPI_FAST_JSON=1
+if os.getenv(_ENV_KEY, "").strip().lower() in ("1", "true", "yes", "on"):
+    use_fast_json(True)
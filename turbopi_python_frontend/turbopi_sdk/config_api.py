@@ -1,6 +1,10 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 
-from .http import http_get, http_post_json, http_put_json, http_patch_json
+from .http import http_get, http_post_json, http_put_json, http_patch_json, iter_sse_events
+
+# The backend sends a keep-alive every 15 s on an idle watch stream.
+WATCH_TIMEOUT = (10, 60)  # (connect, read) seconds
+WATCH_RECONNECTS = 1000
 
 
 def get_config(include_secrets: bool = False) -> Dict[str, Any]:
@@ -25,4 +29,44 @@ def reset_config() -> Dict[str, Any]:
 
 
 def get_config_with_secrets() -> Dict[str, Any]:
-    return http_get("/api/v1/config/secrets")
\ No newline at end of file
+    return http_get("/api/v1/config/secrets")
+
+
+def _watch_path(since: Optional[int], include_secrets: bool) -> str:
+    path = f"/api/v1/config/watch?stream=true&include_secrets={str(bool(include_secrets)).lower()}"
+    if since is not None:
+        path += f"&since={int(since)}"
+    return path
+
+
+def watch_config(
+    since: Optional[int] = None,
+    include_secrets: bool = False,
+    max_reconnects: int = WATCH_RECONNECTS,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield configuration changes as they happen (GET /api/v1/config/watch, SSE).
+
+    The first event is ``{"type": "snapshot", "version", "etag", "config"}``
+    unless `since` is still in the backend's change history; later events are
+    ``{"type": "change", "version", "etag", "changed": {...}, "removed": [...]}``.
+    A dropped connection resumes from the last version seen, so no change is lost.
+    """
+    return iter_sse_events(
+        _watch_path(since, include_secrets),
+        method="GET",
+        timeout=WATCH_TIMEOUT,
+        max_reconnects=max_reconnects,
+    )
+
+
+def poll_config_changes(since: Optional[int] = None, timeout: float = 25.0, include_secrets: bool = False) -> Dict[str, Any]:
+    """
+    Long-poll variant of `watch_config`: wait up to `timeout` seconds for a
+    version newer than `since`. ``data`` holds ``version``, ``etag``,
+    ``snapshot``, ``config`` (snapshot only) and ``changes``.
+    """
+    params: Dict[str, Any] = {"timeout": timeout, "include_secrets": str(bool(include_secrets)).lower()}
+    if since is not None:
+        params["since"] = int(since)
+    return http_get("/api/v1/config/watch", params=params, timeout=(10, timeout + 10))
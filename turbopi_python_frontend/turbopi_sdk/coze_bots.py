@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 from .http import http_get, http_post_json, http_post_multipart
 
@@ -68,11 +68,10 @@ def create_bot_multipart(
         "max_tokens": str(max_tokens),
         "response_format": response_format,
     }
-    files: Optional[Dict[str, Tuple[str, bytes, str]]] = None
-    if avatar_file_path:
-        with open(avatar_file_path, "rb") as f:
-            data = f.read()
+    if not avatar_file_path:
+        return http_post_multipart("/api/v1/coze/bots/create", fields=fields)
+    with open(avatar_file_path, "rb") as f:
         files = {
-            "avatar": (avatar_file_path.split("/")[-1] or "avatar.bin", data, "application/octet-stream"),
+            "avatar": (avatar_file_path.split("/")[-1] or "avatar.bin", f, "application/octet-stream"),
         }
-    return http_post_multipart("/api/v1/coze/bots/create", fields=fields, files=files)
\ No newline at end of file
+        return http_post_multipart("/api/v1/coze/bots/create", fields=fields, files=files)
\ No newline at end of file
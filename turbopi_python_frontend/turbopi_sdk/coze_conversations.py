@@ -1,6 +1,6 @@
 from typing import Any, Dict, Iterable, List, Optional
 
-from .http import http_get, http_post_json, iter_sse_events
+from .http import http_delete, http_get, http_post_json, iter_sse_events
 
 
 def create(messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
@@ -33,17 +33,4 @@ def retrieve(conversation_id: str) -> Dict[str, Any]:
 
 
 def delete(conversation_id: str) -> Dict[str, Any]:
-    # Backend uses DELETE method; our helper is POST-only for body, so call requests directly via http session would be custom.
-    # For simplicity, emulate via POST to delete? No—must use correct HTTP verb.
-    import requests
-    from .sdk_config import get_base_url
-    url = f"{get_base_url()}/api/v1/coze/conversations/{conversation_id}"
-    resp = requests.delete(url, headers={"Accept": "application/json"})
-    try:
-        resp.raise_for_status()
-        return resp.json()
-    except Exception:
-        try:
-            return {"success": False, "error": resp.json(), "status": resp.status_code}
-        except Exception:
-            return {"success": False, "error": resp.text, "status": resp.status_code}
\ No newline at end of file
+    return http_delete(f"/api/v1/coze/conversations/{conversation_id}")
@@ -1,12 +1,22 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from .http import http_post_multipart
+from .http import http_delete, http_get, http_post_multipart
+from .multipart import ProgressCallback
 
 
-def upload_file(file_path: str) -> Dict[str, Any]:
+def upload_file(file_path: str, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    # The file is streamed from disk in chunks; `progress(sent, total)` reports upload bytes.
     with open(file_path, "rb") as f:
-        data = f.read()
-    files = {
-        "file": (file_path.split("/")[-1] or "upload.bin", data, "application/octet-stream"),
-    }
-    return http_post_multipart("/api/v1/coze/files/upload", files=files)
\ No newline at end of file
+        files = {
+            "file": (file_path.split("/")[-1] or "upload.bin", f, "application/octet-stream"),
+        }
+        return http_post_multipart("/api/v1/coze/files/upload", files=files, progress=progress)
+
+
+def cache_stats() -> Dict[str, Any]:
+    # Hit/miss counters of the backend's content-addressed file_id cache.
+    return http_get("/api/v1/coze/files/cache")
+
+
+def clear_cache() -> Dict[str, Any]:
+    return http_delete("/api/v1/coze/files/cache")
\ No newline at end of file
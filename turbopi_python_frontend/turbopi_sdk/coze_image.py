@@ -1,6 +1,7 @@
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Optional
 
 from .http import iter_sse_events
+from .multipart import ProgressCallback
 
 
 def image_chat_stream(
@@ -9,6 +10,7 @@ def image_chat_stream(
     file_path: Optional[str] = None,
     user_id: str = "user id",
     conversation_id: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Iterable[Dict[str, Any]]:
     fields = {
         "text": text,
@@ -16,12 +18,12 @@ def image_chat_stream(
         "user_id": user_id,
         "conversation_id": conversation_id or "",
     }
-    files: Optional[Dict[str, Tuple[str, bytes, str]]] = None
-    if file_path:
-        with open(file_path, "rb") as f:
-            data = f.read()
-        # field name is `file` per backend API
+    if not file_path:
+        yield from iter_sse_events("/api/v1/coze/image/chat/stream", method="POST", form_fields=fields)
+        return
+    # Keep the image open while the request streams it; field name is `file` per backend API
+    with open(file_path, "rb") as f:
         files = {
-            "file": (file_path.split("/")[-1] or "image.bin", data, "application/octet-stream"),
+            "file": (file_path.split("/")[-1] or "image.bin", f, "application/octet-stream"),
         }
-    return iter_sse_events("/api/v1/coze/image/chat/stream", method="POST", form_fields=fields, files=files)
\ No newline at end of file
+        yield from iter_sse_events("/api/v1/coze/image/chat/stream", method="POST", form_fields=fields, files=files, progress=progress)
\ No newline at end of file
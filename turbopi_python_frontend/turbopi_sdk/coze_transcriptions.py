@@ -1,47 +1,47 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .http import http_post_multipart
+from .multipart import ProgressCallback
 
 
-def transcribe_audio(file_path: str) -> Dict[str, Any]:
+_AUDIO_MIME_BY_EXT = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "m4a": "audio/m4a",
+    "mp4": "video/mp4",
+    "ogg": "audio/ogg",
+    "opus": "audio/opus",
+    "aac": "audio/aac",
+    "amr": "audio/amr",
+    "spx": "audio/speex",
+}
+
+
+def guess_audio_mime(filename: str) -> str:
+    """基于扩展名猜测音频 MIME 类型，未知扩展名返回 application/octet-stream。"""
+    ext = filename.lower().split(".")[-1] if "." in filename else ""
+    return _AUDIO_MIME_BY_EXT.get(ext, "application/octet-stream")
+
+
+def transcribe_audio(file_path: str, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
     """
     调用后端 /api/v1/coze/audio/transcriptions 接口，将本地音频文件转写为文本。
 
     参数:
         file_path: 本地音频文件路径（支持 wav/mp3/m4a/ogg/opus 等常见格式，≤10MB）。
+        progress: 可选的上传进度回调 progress(已发送字节数, 总字节数)。
 
     返回:
         后端标准响应字典，形如 { success, code, message, data: { text, logid }, trace_id, mode }
     """
-    # 读取文件字节
-    with open(file_path, "rb") as f:
-        data = f.read()
-
     # 基于扩展名的最佳 MIME 猜测（后端也会进一步检测）
     filename = (file_path.split("/")[-1] or "audio.wav")
-    ext = filename.lower().split(".")[-1] if "." in filename else ""
-    mime = "application/octet-stream"
-    if ext == "wav":
-        mime = "audio/wav"
-    elif ext == "mp3":
-        mime = "audio/mpeg"
-    elif ext == "m4a":
-        mime = "audio/m4a"
-    elif ext == "mp4":
-        mime = "video/mp4"
-    elif ext == "ogg":
-        mime = "audio/ogg"
-    elif ext == "opus":
-        mime = "audio/opus"
-    elif ext == "aac":
-        mime = "audio/aac"
-    elif ext == "amr":
-        mime = "audio/amr"
-    elif ext == "spx":
-        mime = "audio/speex"
-
-    files = {
-        # 与前端保持一致的字段名: 'file'
-        "file": (filename, data, mime),
-    }
-    return http_post_multipart("/api/v1/coze/audio/transcriptions", files=files)
\ No newline at end of file
+    mime = guess_audio_mime(filename)
+
+    # 文件以分块方式流式上传，不会整体读入内存
+    with open(file_path, "rb") as f:
+        files = {
+            # 与前端保持一致的字段名: 'file'
+            "file": (filename, f, mime),
+        }
+        return http_post_multipart("/api/v1/coze/audio/transcriptions", files=files, progress=progress)
\ No newline at end of file
@@ -0,0 +1,231 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from .client import Timeout, TurboPiClient, using_client
+from .sdk_config import base_url_for, get_fleet_addresses
+
+DEFAULT_FLEET_PARALLELISM = 32
+DEFAULT_FLEET_TIMEOUT = 5  # seconds, per robot request
+
+# A fleet call is either an SDK function run against each robot (``control.estop``)
+# or a callable taking the robot's `TurboPiClient`.
+FleetCall = Callable[..., Any]
+
+
+@dataclass
+class FleetResult:
+    """Outcome of one fleet call on one robot."""
+
+    name: str
+    base_url: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        if self.error is not None or self.timed_out:
+            return False
+        if isinstance(self.value, dict) and "success" in self.value:
+            return bool(self.value["success"])
+        return True
+
+
+class Fleet:
+    """A set of TurboPi backends driven concurrently.
+
+    Every robot gets its own pooled `TurboPiClient`; calls fan out over a bounded
+    thread pool, so ``fleet.estop()`` on 30 robots costs about one round trip
+    instead of 30 sequential ones.
+
+    robots: addresses (``ip``, ``host:port`` or URL) or ``{name: address}``.
+    max_parallel: maximum number of robots contacted at the same time.
+    timeout: per-robot request timeout (float or ``(connect, read)``).
+
+    Any module-level SDK function can be fanned out; inside the call it talks to
+    the robot being served::
+
+        from turbopi_sdk import Fleet, control
+        with Fleet(["192.168.3.80", "192.168.3.81"]) as fleet:
+            results = fleet.broadcast(control.move, "forward", duration_ms=500)
+            print(fleet.health())
+    """
+
+    def __init__(
+        self,
+        robots: Union[Iterable[str], Mapping[str, str]],
+        max_parallel: int = DEFAULT_FLEET_PARALLELISM,
+        timeout: Timeout = DEFAULT_FLEET_TIMEOUT,
+        **client_kwargs: Any,
+    ) -> None:
+        named = dict(robots) if isinstance(robots, Mapping) else {str(a): str(a) for a in robots}
+        if not named:
+            raise ValueError("fleet must contain at least one robot")
+        self.clients: Dict[str, TurboPiClient] = {
+            name: TurboPiClient(base_url=base_url_for(address), timeout=timeout, **client_kwargs)
+            for name, address in named.items()
+        }
+        self.max_parallel = max(1, int(max_parallel))
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(self.max_parallel, len(self.clients)),
+            thread_name_prefix="turbopi-fleet",
+        )
+
+    @classmethod
+    def from_config(cls, **kwargs: Any) -> "Fleet":
+        """Build the fleet from ``TURBOPI_FLEET`` or the ``fleet`` key of `config.yaml`."""
+        return cls(get_fleet_addresses(), **kwargs)
+
+    def __enter__(self) -> "Fleet":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.clients)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        for client in self.clients.values():
+            client.close()
+
+    def _run(self, name: str, fn: FleetCall, with_client: bool, args: Any, kwargs: Any) -> FleetResult:
+        client = self.clients[name]
+        started = time.perf_counter()
+        result = FleetResult(name=name, base_url=client.base_url)
+        try:
+            if with_client:
+                result.value = fn(client, *args, **kwargs)
+            else:
+                with using_client(client):
+                    result.value = fn(*args, **kwargs)
+        except Exception as e:
+            result.error = e
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        return result
+
+    def as_completed(
+        self,
+        fn: FleetCall,
+        *args: Any,
+        robots: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None,
+        with_client: bool = False,
+        **kwargs: Any,
+    ) -> Iterator[FleetResult]:
+        """Run ``fn(*args, **kwargs)`` on every robot, yielding results as they finish.
+
+        robots: subset of robot names (default: all).
+        deadline: seconds for the whole fan-out; robots that have not answered by
+            then are yielded last with ``timed_out=True``.
+        with_client: call ``fn(client, *args, **kwargs)`` instead of routing a
+            module-level SDK function to the robot.
+        """
+        names = list(robots) if robots is not None else self.names
+        pending: Dict[Future, str] = {
+            self._executor.submit(self._run, name, fn, with_client, args, kwargs): name
+            for name in names
+        }
+        end = None if deadline is None else time.monotonic() + deadline
+        while pending:
+            remaining = None if end is None else max(0.0, end - time.monotonic())
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                del pending[future]
+                yield future.result()
+        for future, name in pending.items():
+            future.cancel()
+            yield FleetResult(
+                name=name,
+                base_url=self.clients[name].base_url,
+                timed_out=True,
+                elapsed_ms=(deadline or 0.0) * 1000,
+            )
+
+    def broadcast(
+        self,
+        fn: FleetCall,
+        *args: Any,
+        robots: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None,
+        with_client: bool = False,
+        **kwargs: Any,
+    ) -> Dict[str, FleetResult]:
+        """Run ``fn`` on every robot concurrently and return ``{name: FleetResult}`` in fleet order."""
+        collected = {
+            r.name: r
+            for r in self.as_completed(fn, *args, robots=robots, deadline=deadline, with_client=with_client, **kwargs)
+        }
+        return {name: collected[name] for name in self.clients if name in collected}
+
+    def fan_out(
+        self,
+        calls: Mapping[str, Callable[[], Any]],
+        deadline: Optional[float] = None,
+    ) -> Dict[str, FleetResult]:
+        """Run a different zero-argument SDK call per robot: ``{name: lambda: control.move("left")}``."""
+        results: Dict[str, FleetResult] = {}
+        for name, call in calls.items():
+            if name not in self.clients:
+                raise KeyError(f"unknown robot: {name}")
+        futures: Dict[Future, str] = {
+            self._executor.submit(self._run, name, call, False, (), {}): name
+            for name, call in calls.items()
+        }
+        done, not_done = wait(futures, timeout=deadline)
+        for future in done:
+            result = future.result()
+            results[result.name] = result
+        for future in not_done:
+            future.cancel()
+            name = futures[future]
+            results[name] = FleetResult(name=name, base_url=self.clients[name].base_url, timed_out=True)
+        return {name: results[name] for name in calls}
+
+    # Common broadcasts
+    def estop(self, deadline: Optional[float] = None) -> Dict[str, FleetResult]:
+        return self.broadcast(lambda c: c.post_json("/control/estop", {}), deadline=deadline, with_client=True)
+
+    def stop(self, deadline: Optional[float] = None) -> Dict[str, FleetResult]:
+        return self.broadcast(lambda c: c.post_json("/control/stop", {}), deadline=deadline, with_client=True)
+
+    def health(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """Aggregate ``/status/health`` across the fleet."""
+        results = self.broadcast(lambda c: c.get("/status/health"), deadline=deadline, with_client=True)
+        robots: Dict[str, Any] = {}
+        healthy = unhealthy = unreachable = 0
+        for name, r in results.items():
+            if r.error is not None or r.timed_out:
+                unreachable += 1
+                state = "unreachable"
+            elif r.ok:
+                healthy += 1
+                state = "healthy"
+            else:
+                unhealthy += 1
+                state = "unhealthy"
+            robots[name] = {
+                "state": state,
+                "base_url": r.base_url,
+                "elapsed_ms": round(r.elapsed_ms, 1),
+                "response": r.value,
+                "error": None if r.error is None else f"{type(r.error).__name__}: {r.error}",
+            }
+        return {
+            "total": len(results),
+            "healthy": healthy,
+            "unhealthy": unhealthy,
+            "unreachable": unreachable,
+            "all_healthy": healthy == len(results),
+            "robots": robots,
+        }
@@ -1,85 +1,66 @@
-import json
-import uuid
-from typing import Any, Dict, Generator, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, Optional
 
-import requests
+from .client import (
+    DEFAULT_SSE_RECONNECTS,
+    DEFAULT_TIMEOUT,
+    Timeout,
+    TurboPiClient,
+    _handle_response,
+    _headers,
+    get_default_client,
+    reset_default_client,
+    set_default_client,
+)
+from .mjpeg import MJPEGFrame
+from .metrics import CallTiming, Hooks, MetricsCollector, add_hooks, enable_metrics, get_metrics, remove_hooks
+from .multipart import FileSpec, ProgressCallback
 
-from .sdk_config import get_base_url
+# Module-level helpers are thin wrappers over the shared pooled client; use
+# `set_default_client(TurboPiClient(...))` to tune pool size or timeouts.
+# Instrumentation: `enable_metrics()` or `add_hooks(MyHooks())` apply to every client.
 
 
-DEFAULT_TIMEOUT = 15  # seconds
+def http_get(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return get_default_client().get(path, params=params, timeout=timeout)
 
 
-def _headers(trace_id: Optional[str] = None, extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
-    h = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "X-Trace-ID": trace_id or str(uuid.uuid4()),
-    }
-    if extra:
-        h.update(extra)
-    return h
+def http_get_bytes(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> bytes:
+    return get_default_client().get_bytes(path, params=params, timeout=timeout)
 
 
-def _handle_response(resp: requests.Response) -> Dict[str, Any]:
-    try:
-        resp.raise_for_status()
-        return resp.json()
-    except requests.HTTPError:
-        # Try to parse backend error format
-        try:
-            data = resp.json()
-            # FastAPI HTTPException uses {"detail": {...}}
-            if isinstance(data, dict) and "detail" in data:
-                return {"success": False, "error": data["detail"], "status": resp.status_code}
-            return {"success": False, "error": data, "status": resp.status_code}
-        except Exception:
-            return {"success": False, "error": resp.text, "status": resp.status_code}
+def http_iter_multipart(path: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Iterator[MJPEGFrame]:
+    return get_default_client().iter_multipart(path, params=params, timeout=timeout)
 
 
-def http_get(path: str, params: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    url = f"{get_base_url()}{path}"
-    resp = requests.get(url, params=params or {}, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
+def http_post_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return get_default_client().post_json(path, body, timeout=timeout)
 
 
-def http_post_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    url = f"{get_base_url()}{path}"
-    data = json.dumps(body or {})
-    resp = requests.post(url, data=data, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
+def http_put_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return get_default_client().put_json(path, body, timeout=timeout)
 
 
-def http_put_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    url = f"{get_base_url()}{path}"
-    data = json.dumps(body or {})
-    resp = requests.put(url, data=data, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
+def http_patch_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return get_default_client().patch_json(path, body, timeout=timeout)
 
 
-def http_patch_json(path: str, body: Optional[Dict[str, Any]] = None, timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
-    url = f"{get_base_url()}{path}"
-    data = json.dumps(body or {})
-    resp = requests.patch(url, data=data, headers=_headers(), timeout=timeout)
-    return _handle_response(resp)
+def http_delete(path: str, timeout: Optional[Timeout] = None) -> Dict[str, Any]:
+    return get_default_client().delete(path, timeout=timeout)
 
 
 def http_post_multipart(
     path: str,
     fields: Optional[Dict[str, Any]] = None,
-    files: Optional[Dict[str, Tuple[str, bytes, str]]] = None,
-    timeout: int = DEFAULT_TIMEOUT,
+    files: Optional[Dict[str, FileSpec]] = None,
+    timeout: Optional[Timeout] = None,
+    progress: Optional[ProgressCallback] = None,
 ) -> Dict[str, Any]:
     """
-    files: { field_name: (filename, file_bytes, mime) }
+    files: { field_name: (filename, bytes | memoryview | binary file object, mime) }
     fields: regular form fields
+    progress: optional callback(bytes_sent, total_bytes_or_None)
     """
-    url = f"{get_base_url()}{path}"
-    hdr = _headers(extra={"Accept": "application/json"})
-    # remove json content-type for multipart
-    hdr.pop("Content-Type", None)
-    resp = requests.post(url, data=fields or {}, files=files or {}, headers=hdr, timeout=timeout)
-    return _handle_response(resp)
+    return get_default_client().post_multipart(path, fields=fields, files=files, timeout=timeout, progress=progress)
 
 
 def iter_sse_events(
@@ -87,54 +68,24 @@ def iter_sse_events(
     method: str = "POST",
     json_body: Optional[Dict[str, Any]] = None,
     form_fields: Optional[Dict[str, Any]] = None,
-    files: Optional[Dict[str, Tuple[str, bytes, str]]] = None,
-    timeout: int = DEFAULT_TIMEOUT,
+    files: Optional[Dict[str, FileSpec]] = None,
+    timeout: Optional[Timeout] = None,
+    max_reconnects: int = DEFAULT_SSE_RECONNECTS,
+    progress: Optional[ProgressCallback] = None,
 ) -> Iterable[Dict[str, Any]]:
     """
     Open an SSE stream and yield parsed event objects.
     - For JSON: set method="POST" and provide json_body
     - For multipart form: provide form_fields/files
+    - Dropped connections are resumed via `Last-Event-ID` up to `max_reconnects` times
     """
-    url = f"{get_base_url()}{path}"
-    headers = _headers(extra={"Accept": "text/event-stream"})
-    if method.upper() == "GET":
-        r = requests.get(url, headers=headers, stream=True, timeout=timeout)
-    else:
-        if files:
-            # multipart/form-data with files
-            headers.pop("Content-Type", None)
-            r = requests.post(url, data=form_fields or {}, files=files, headers=headers, stream=True, timeout=timeout)
-        elif json_body is not None:
-            # application/json body
-            headers["Content-Type"] = "application/json"
-            r = requests.post(url, data=json.dumps(json_body), headers=headers, stream=True, timeout=timeout)
-        elif form_fields is not None:
-            # x-www-form-urlencoded body (no files)
-            headers.pop("Content-Type", None)
-            r = requests.post(url, data=form_fields, headers=headers, stream=True, timeout=timeout)
-        else:
-            # no body
-            r = requests.post(url, headers=headers, stream=True, timeout=timeout)
-
-    r.raise_for_status()
-
-    buffer = ""
-    for chunk in r.iter_content(chunk_size=1024):
-        if not chunk:
-            continue
-        buffer += chunk.decode("utf-8", errors="ignore")
-        while "\n\n" in buffer:
-            frame, buffer = buffer.split("\n\n", 1)
-            # Parse lines in frame
-            data_lines = []
-            for line in frame.splitlines():
-                if line.startswith("data:"):
-                    data_lines.append(line[len("data:"):].strip())
-            if not data_lines:
-                continue
-            try:
-                payload_str = "\n".join(data_lines)
-                event = json.loads(payload_str)
-                yield event
-            except Exception:
-                yield {"type": "raw", "content": "\n".join(data_lines)}
\ No newline at end of file
+    return get_default_client().iter_sse_events(
+        path,
+        method=method,
+        json_body=json_body,
+        form_fields=form_fields,
+        files=files,
+        timeout=timeout,
+        max_reconnects=max_reconnects,
+        progress=progress,
+    )
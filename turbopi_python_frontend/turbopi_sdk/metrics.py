@@ -0,0 +1,382 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Histogram upper bounds. Latencies are in milliseconds, SSE throughput in events/s.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+RATE_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+DEFAULT_RECENT_CALLS = 256
+
+
+class CallTiming:
+    """Timings of one HTTP exchange, handed to every hook.
+
+    connect_ms is DNS + TCP (+ TLS) time and stays None when a pooled keep-alive
+    connection was reused. ttfb_ms is the time until the response headers were
+    parsed. For SSE responses, first_event_ms / first_content_ms are measured from
+    the start of the request and total_ms covers the whole stream.
+    """
+
+    __slots__ = (
+        "method", "path", "trace_id", "stream", "started", "connect_ms", "ttfb_ms", "total_ms",
+        "status", "error", "events", "first_event_ms", "first_content_ms",
+    )
+
+    def __init__(self, method: str, path: str, trace_id: Optional[str] = None, stream: bool = False) -> None:
+        self.method = method
+        self.path = path
+        self.trace_id = trace_id
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.connect_ms: Optional[float] = None
+        self.ttfb_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        self.events = 0
+        self.first_event_ms: Optional[float] = None
+        self.first_content_ms: Optional[float] = None
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def sse_event(self, payload: Any) -> bool:
+        """Count one SSE event; returns True for the first event of the stream."""
+        self.events += 1
+        first = self.first_event_ms is None
+        if first:
+            self.first_event_ms = self.elapsed_ms()
+        if self.first_content_ms is None and isinstance(payload, dict) and payload.get("type") == "content":
+            self.first_content_ms = self.elapsed_ms()
+        return first
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.total_ms = self.elapsed_ms()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    @property
+    def events_per_s(self) -> Optional[float]:
+        """Event rate after the first event arrived (excludes the time to first token)."""
+        if self.events < 2 or self.total_ms is None or self.first_event_ms is None:
+            return None
+        window = (self.total_ms - self.first_event_ms) / 1000
+        return (self.events - 1) / window if window > 0 else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {
+            "method": self.method,
+            "path": self.path,
+            "trace_id": self.trace_id,
+            "status": self.status,
+            "error": self.error,
+            "connect_ms": self.connect_ms,
+            "ttfb_ms": self.ttfb_ms,
+            "total_ms": self.total_ms,
+        }
+        if self.stream:
+            data.update(
+                events=self.events,
+                first_event_ms=self.first_event_ms,
+                first_content_ms=self.first_content_ms,
+                events_per_s=self.events_per_s,
+            )
+        return data
+
+
+class Hooks:
+    """Instrumentation callbacks; subclass and override the ones you need.
+
+    on_request_start: before the request is sent (trace_id is already set).
+    on_response_headers: status, connect_ms and ttfb_ms are known. For non-streaming
+        calls this runs after the body was read, with the same timings.
+    on_first_sse_event: the first event of an SSE stream arrived.
+    on_complete: the call finished, failed (``call.error``) or the stream ended.
+    """
+
+    def on_request_start(self, call: CallTiming) -> None:
+        pass
+
+    def on_response_headers(self, call: CallTiming) -> None:
+        pass
+
+    def on_first_sse_event(self, call: CallTiming) -> None:
+        pass
+
+    def on_complete(self, call: CallTiming) -> None:
+        pass
+
+
+def emit(hooks: Sequence[Hooks], name: str, call: CallTiming) -> None:
+    # Instrumentation must never break a robot call.
+    for hook in hooks:
+        try:
+            getattr(hook, name)(call)
+        except Exception:
+            import logging
+
+            logging.getLogger(__name__).exception("instrumentation hook %r failed in %s", hook, name)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile `q` (None without samples)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        out, seen = [], 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            out.append((_fmt(bound), seen))
+        out.append(("+Inf", self.count))
+        return out
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 3),
+            "mean": round(self.sum / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+# metric name -> (bucket bounds, CallTiming attribute, help text)
+_SERIES = OrderedDict([
+    ("connect_ms", (LATENCY_BUCKETS_MS, "connect_ms", "DNS + TCP/TLS connect time of new connections")),
+    ("ttfb_ms", (LATENCY_BUCKETS_MS, "ttfb_ms", "Time until response headers")),
+    ("total_ms", (LATENCY_BUCKETS_MS, "total_ms", "Total call time, whole stream for SSE")),
+    ("sse_first_event_ms", (LATENCY_BUCKETS_MS, "first_event_ms", "SSE time to first event")),
+    ("sse_ttft_ms", (LATENCY_BUCKETS_MS, "first_content_ms", "SSE time to first content event")),
+    ("sse_events_per_s", (RATE_BUCKETS, "events_per_s", "SSE events per second after the first event")),
+])
+
+
+class MetricsCollector(Hooks):
+    """Per-endpoint histograms plus the most recent calls, keyed by trace id.
+
+    Endpoints are labelled ``(method, path)``; pass `path_label` to fold ids out of
+    paths (e.g. ``/api/v1/coze/bots/123`` -> ``/api/v1/coze/bots/{id}``).
+    """
+
+    def __init__(self, recent: int = DEFAULT_RECENT_CALLS, path_label: Optional[Callable[[str], str]] = None) -> None:
+        self._lock = threading.Lock()
+        self._path_label = path_label
+        self._series: Dict[Tuple[str, str], Dict[str, Histogram]] = {}
+        self._status: Dict[Tuple[str, str, str], int] = {}
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._untraced: Deque[Dict[str, Any]] = deque(maxlen=recent)
+        self._max_recent = recent
+
+    def on_complete(self, call: CallTiming) -> None:
+        path = self._path_label(call.path) if self._path_label else call.path
+        endpoint = (call.method, path)
+        outcome = str(call.status) if call.status is not None else "error"
+        record = call.as_dict()
+        with self._lock:
+            series = self._series.get(endpoint)
+            if series is None:
+                series = self._series[endpoint] = {name: Histogram(spec[0]) for name, spec in _SERIES.items()}
+            for name, (_, attr, _) in _SERIES.items():
+                value = getattr(call, attr)
+                if value is not None:
+                    series[name].observe(value)
+            key = (call.method, path, outcome)
+            self._status[key] = self._status.get(key, 0) + 1
+            if call.trace_id:
+                # Hedged or retried attempts share a trace id; keep every attempt.
+                self._recent.setdefault(call.trace_id, {"trace_id": call.trace_id, "calls": []})["calls"].append(record)
+                self._recent.move_to_end(call.trace_id)
+                while len(self._recent) > self._max_recent:
+                    self._recent.popitem(last=False)
+            else:
+                self._untraced.append(record)
+
+    def trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Timings recorded for `trace_id` (the backend logs the same id)."""
+        with self._lock:
+            entry = self._recent.get(trace_id)
+            return None if entry is None else {"trace_id": trace_id, "calls": list(entry["calls"])}
+
+    def recent(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(e, calls=list(e["calls"])) for e in self._recent.values()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._status.clear()
+            self._recent.clear()
+            self._untraced.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints: Dict[str, Any] = {}
+            for (method, path), series in self._series.items():
+                endpoints[f"{method} {path}"] = {
+                    "status": {o: n for (m, p, o), n in self._status.items() if (m, p) == (method, path)},
+                    **{name: h.as_dict() for name, h in series.items() if h.count},
+                }
+            return {"endpoints": endpoints}
+
+    def to_prometheus(self, prefix: str = "turbopi_sdk") -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {prefix}_requests_total Completed SDK calls by status")
+            lines.append(f"# TYPE {prefix}_requests_total counter")
+            for (method, path, outcome), n in sorted(self._status.items()):
+                lines.append(f'{prefix}_requests_total{{method="{method}",path="{_escape(path)}",status="{outcome}"}} {n}')
+            for name, (_, _, help_text) in _SERIES.items():
+                metric = f"{prefix}_{name}"
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (method, path), series in sorted(self._series.items()):
+                    h = series[name]
+                    if not h.count:
+                        continue
+                    labels = f'method="{method}",path="{_escape(path)}"'
+                    for le, n in h.cumulative():
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {n}')
+                    lines.append(f"{metric}_sum{{{labels}}} {h.sum:.3f}")
+                    lines.append(f"{metric}_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide hooks, seen by every client in addition to its own.
+_global_hooks: List[Hooks] = []
+_global_lock = threading.Lock()
+_collector: Optional[MetricsCollector] = None
+
+
+def add_hooks(*hooks: Hooks) -> None:
+    with _global_lock:
+        for hook in hooks:
+            if hook not in _global_hooks:
+                _global_hooks.append(hook)
+
+
+def remove_hooks(*hooks: Hooks) -> None:
+    with _global_lock:
+        for hook in hooks:
+            if hook in _global_hooks:
+                _global_hooks.remove(hook)
+
+
+def global_hooks() -> List[Hooks]:
+    return _global_hooks
+
+
+def enable_metrics(**kwargs: Any) -> MetricsCollector:
+    """Install (once) and return the process-wide `MetricsCollector`."""
+    global _collector
+    with _global_lock:
+        if _collector is None:
+            _collector = MetricsCollector(**kwargs)
+            _global_hooks.append(_collector)
+        return _collector
+
+
+def get_metrics() -> Optional[MetricsCollector]:
+    return _collector
+
+
+def combine(own: Iterable[Hooks]) -> List[Hooks]:
+    own = list(own)
+    return own + _global_hooks if _global_hooks else own
+
+
+# DNS + connect timing for `requests`: urllib3 connections record how long
+# connect() took into a thread-local, read back by the client after the call.
+
+_connect = threading.local()
+_timed_pools: Optional[Dict[str, Any]] = None
+
+
+def reset_connect_timer() -> None:
+    _connect.seconds = None
+
+
+def take_connect_ms() -> Optional[float]:
+    seconds = getattr(_connect, "seconds", None)
+    _connect.seconds = None
+    return None if seconds is None else seconds * 1000
+
+
+def _record_connect(seconds: float) -> None:
+    _connect.seconds = (getattr(_connect, "seconds", None) or 0.0) + seconds
+
+
+def _timed(conn_cls: Any) -> Any:
+    class TimedConnection(conn_cls):
+        def connect(self) -> None:
+            start = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                _record_connect(time.perf_counter() - start)
+
+    TimedConnection.__name__ = f"Timed{conn_cls.__name__}"
+    return TimedConnection
+
+
+def install_connect_timer(adapter: Any) -> None:
+    """Make a `requests` HTTPAdapter time new connections."""
+    global _timed_pools
+    if _timed_pools is None:
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        _timed_pools = {
+            scheme: type(f"Timed{pool.__name__}", (pool,), {"ConnectionCls": _timed(pool.ConnectionCls)})
+            for scheme, pool in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool))
+        }
+    adapter.poolmanager.pool_classes_by_scheme = dict(_timed_pools)
+
+
+def httpx_trace(call: CallTiming) -> Callable[[str, Dict[str, Any]], Any]:
+    """httpx ``trace`` extension filling `connect_ms` and `ttfb_ms` of `call`."""
+    connect_started: List[float] = []
+
+    async def trace(event: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if event == "connection.connect_tcp.started":
+            connect_started.append(now)
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete") and connect_started:
+            call.connect_ms = (now - connect_started[0]) * 1000
+        elif event.endswith("receive_response_headers.complete"):
+            call.ttfb_ms = (now - call.started) * 1000
+
+    return trace
@@ -0,0 +1,102 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+_HEADER_END = b"\r\n\r\n"
+_MAX_HEADER_BYTES = 16 * 1024
+
+
+class MJPEGFrame(NamedTuple):
+    """One part of a `multipart/x-mixed-replace` stream."""
+
+    data: bytes
+    headers: Dict[str, str]
+
+
+class MJPEGParser:
+    """Incremental parser for a `multipart/x-mixed-replace` (MJPEG) byte stream.
+
+    Feed raw bytes in whatever chunks the transport delivers; each completed
+    part is returned as soon as its last byte arrives. Parts with a
+    ``Content-Length`` header (as sent by ``GET /api/v1/camera/stream``) are
+    cut by length without scanning the image bytes; parts without one are
+    delimited by the next boundary line. The boundary is learnt from the first
+    ``--boundary`` line when not given.
+    """
+
+    def __init__(self, boundary: Optional[str] = None) -> None:
+        self._buf = bytearray()
+        self._delimiter: Optional[bytes] = b"--" + boundary.encode("latin-1") if boundary else None
+        self._headers: Optional[Dict[str, str]] = None
+        self._length: Optional[int] = None
+
+    def reset(self) -> None:
+        """Drop any half-received part."""
+        self._buf.clear()
+        self._headers = None
+        self._length = None
+
+    def feed(self, chunk: bytes) -> List[MJPEGFrame]:
+        """Consume `chunk` and return the parts it completed (possibly none)."""
+        buf = self._buf
+        buf += chunk
+        frames: List[MJPEGFrame] = []
+        while True:
+            if self._headers is None and not self._read_headers():
+                return frames
+            if self._length is not None:
+                if len(buf) < self._length:
+                    return frames
+                data = bytes(buf[: self._length])
+                del buf[: self._length]
+            else:
+                end = buf.find(b"\r\n" + self._delimiter, 0)
+                if end < 0:
+                    return frames
+                data = bytes(buf[:end])
+                del buf[:end]
+            frames.append(MJPEGFrame(data, self._headers))
+            self._headers = None
+            self._length = None
+
+    def _read_headers(self) -> bool:
+        buf = self._buf
+        # Skip the CRLF that ends the previous part and any preamble before the boundary
+        start = buf.find(b"--" if self._delimiter is None else self._delimiter)
+        if start < 0:
+            if len(buf) > _MAX_HEADER_BYTES:
+                del buf[: len(buf) - _MAX_HEADER_BYTES]
+            return False
+        end = buf.find(_HEADER_END, start)
+        if end < 0:
+            if len(buf) - start > _MAX_HEADER_BYTES:
+                raise ValueError("multipart part headers too long")
+            return False
+        lines = bytes(buf[start:end]).decode("latin-1").split("\r\n")
+        if self._delimiter is None:
+            self._delimiter = lines[0].strip().encode("latin-1")
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+        del buf[: end + len(_HEADER_END)]
+        self._headers = headers
+        length = headers.get("content-length")
+        self._length = int(length) if length and length.isdigit() else None
+        return True
+
+
+def content_type_boundary(content_type: Optional[str]) -> Optional[str]:
+    """The ``boundary`` parameter of a multipart ``Content-Type`` header, if any."""
+    for param in (content_type or "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "boundary" and value.strip():
+            return value.strip().strip('"')
+    return None
+
+
+def iter_mjpeg(chunks: Iterable[bytes], parser: Optional[MJPEGParser] = None) -> Iterator[MJPEGFrame]:
+    """Parse an iterable of byte chunks into `MJPEGFrame` objects."""
+    parser = parser or MJPEGParser()
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
@@ -0,0 +1,149 @@
+import os
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+FileSource = Union[bytes, bytearray, memoryview, BinaryIO]
+FileSpec = Tuple[str, FileSource, str]
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def _quote(value: str) -> bytes:
+    # Same escaping browsers use for Content-Disposition parameters.
+    return value.replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A").encode("utf-8")
+
+
+def _remaining_length(f: BinaryIO) -> Optional[int]:
+    try:
+        return os.fstat(f.fileno()).st_size - f.tell()
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        pos = f.tell()
+        end = f.seek(0, os.SEEK_END)
+        f.seek(pos)
+        return end - pos
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class MultipartEncoder:
+    """Streaming `multipart/form-data` body.
+
+    File parts are read from their source in `chunk_size` pieces while the
+    request is on the wire, so uploading a 10 MB recording never holds the whole
+    file (or a second, encoded copy of it) in memory. Sources may be bytes,
+    memoryviews (sliced without copying) or binary file-like objects. `len()`
+    gives the exact Content-Length whenever every file size is known; otherwise
+    it is 0 and the body goes out with chunked transfer encoding.
+
+    progress: optional ``callback(bytes_sent, total_bytes_or_None)`` invoked
+        after every chunk.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Mapping[str, Any]] = None,
+        files: Optional[Mapping[str, FileSpec]] = None,
+        boundary: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        if boundary is None:
+            import uuid
+
+            boundary = uuid.uuid4().hex
+        self.boundary = boundary
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._parts: List[Union[bytes, memoryview, BinaryIO]] = []
+        self._length: Optional[int] = 0
+        self.bytes_sent = 0
+
+        for name, value in (fields or {}).items():
+            for item in value if isinstance(value, (list, tuple)) else [value]:
+                if isinstance(item, (bytes, bytearray)):
+                    data = bytes(item)
+                else:
+                    data = str(item).encode("utf-8")
+                self._add(self._part_header(name) + data + b"\r\n")
+        for name, (filename, source, mime) in (files or {}).items():
+            self._add(self._part_header(name, filename, mime))
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                self._add(memoryview(source).cast("B"))
+            else:
+                self._add_stream(source)
+            self._add(b"\r\n")
+        self._add(b"--" + self.boundary.encode("ascii") + b"--\r\n")
+
+    @property
+    def content_type(self) -> str:
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length or 0
+
+    def __bool__(self) -> bool:
+        # Never "empty": requests treats a falsy body as no body at all.
+        return True
+
+    @property
+    def length(self) -> Optional[int]:
+        """Total body size in bytes, or None if some file size is unknown."""
+        return self._length
+
+    def _part_header(self, name: str, filename: Optional[str] = None, mime: Optional[str] = None) -> bytes:
+        disposition = b'Content-Disposition: form-data; name="' + _quote(name) + b'"'
+        if filename is not None:
+            disposition += b'; filename="' + _quote(filename) + b'"'
+        header = b"--" + self.boundary.encode("ascii") + b"\r\n" + disposition + b"\r\n"
+        if mime:
+            header += b"Content-Type: " + mime.encode("ascii") + b"\r\n"
+        return header + b"\r\n"
+
+    def _add(self, part: Union[bytes, memoryview]) -> None:
+        self._parts.append(part)
+        if self._length is not None:
+            self._length += len(part)
+
+    def _add_stream(self, f: BinaryIO) -> None:
+        self._parts.append(f)
+        size = _remaining_length(f)
+        if size is None or self._length is None:
+            self._length = None
+        else:
+            self._length += size
+
+    def _advance(self, n: int) -> None:
+        self.bytes_sent += n
+        if self.progress is not None:
+            self.progress(self.bytes_sent, self._length)
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        size = self.chunk_size
+        for part in self._parts:
+            if isinstance(part, (bytes, memoryview)):
+                for i in range(0, len(part), size):
+                    chunk = part[i:i + size]
+                    yield chunk
+                    self._advance(len(chunk))
+            else:
+                while True:
+                    chunk = part.read(size)
+                    if not chunk:
+                        break
+                    yield chunk
+                    self._advance(len(chunk))
+
+
+def build_multipart(
+    fields: Optional[Mapping[str, Any]],
+    files: Optional[Mapping[str, FileSpec]],
+    progress: Optional[ProgressCallback] = None,
+) -> Tuple[MultipartEncoder, Dict[str, str]]:
+    """Return the encoder and the request headers that describe it."""
+    encoder = MultipartEncoder(fields=fields, files=files, progress=progress)
+    headers = {"Content-Type": encoder.content_type}
+    if encoder.length is not None:
+        headers["Content-Length"] = str(encoder.length)
+    return encoder, headers
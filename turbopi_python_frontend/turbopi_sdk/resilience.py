@@ -0,0 +1,334 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Awaitable, Callable, Deque, Dict, FrozenSet, Optional
+
+import requests
+
+DEFAULT_HEDGE_PERCENTILE = 95.0
+DEFAULT_HEDGE_DELAY = 0.1  # seconds, used until enough latencies were observed
+DEFAULT_RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while a backend's circuit is open."""
+
+
+class ResiliencePolicy:
+    """Tail-latency and failure handling for idempotent GETs.
+
+    hedge: send a duplicate request when the first has not answered after the
+        `hedge_percentile` latency of recent calls (``hedge_delay`` until
+        `min_samples` latencies are known); the first answer wins.
+    retries: extra attempts after a transport error or a `retry_statuses`
+        response, with jittered exponential backoff from `retry_backoff`.
+    breaker_threshold: consecutive failed calls that open the circuit; while open,
+        calls fail fast with `CircuitOpenError` for `breaker_reset` seconds, then
+        one trial call decides whether it closes again.
+    """
+
+    def __init__(
+        self,
+        hedge: bool = True,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        hedge_delay: float = DEFAULT_HEDGE_DELAY,
+        min_hedge_delay: float = 0.01,
+        min_samples: int = 20,
+        window: int = 200,
+        retries: int = 2,
+        retry_backoff: float = 0.05,
+        max_retry_backoff: float = 1.0,
+        retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 10.0,
+    ) -> None:
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.retry_statuses = frozenset(retry_statuses)
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.retry_backoff * (2 ** (attempt - 1)), self.max_retry_backoff)
+        return delay * random.uniform(0.5, 1.0)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one backend."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold: int, reset_after: float) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = self.HALF_OPEN  # let exactly one trial call through
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release_trial(self) -> None:
+        """A call ended without an outcome (cancelled, interrupted): reopen if it was the trial."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.threshold > 0 and self.failures >= self.threshold):
+                if self.state != self.OPEN:
+                    self.opens += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class Resilience:
+    """Per-backend state for a `ResiliencePolicy`: latency window, breaker and counters."""
+
+    def __init__(self, policy: ResiliencePolicy) -> None:
+        self.policy = policy
+        self.breaker = CircuitBreaker(policy.breaker_threshold, policy.breaker_reset)
+        self._latencies: Deque[float] = deque(maxlen=policy.window)
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.counters: Dict[str, int] = {
+            "calls": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "retries": 0,
+            "failures": 0,
+            "breaker_rejections": 0,
+        }
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Current hedge trigger: the configured percentile of recent latencies."""
+        policy = self.policy
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < policy.min_samples:
+            return policy.hedge_delay
+        idx = min(len(samples) - 1, int(len(samples) * policy.hedge_percentile / 100.0))
+        return max(policy.min_hedge_delay, samples[idx])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+        counters["hedge_win_rate"] = counters["hedge_wins"] / counters["hedges"] if counters["hedges"] else 0.0
+        counters["hedge_delay_ms"] = round(self.hedge_delay() * 1000, 1)
+        counters["breaker_state"] = self.breaker.state
+        counters["breaker_opens"] = self.breaker.opens
+        return counters
+
+    def _is_failure(self, resp: Any) -> bool:
+        return resp.status_code in self.policy.retry_statuses
+
+    def _timed(self, send: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        resp = send()
+        self.record_latency(time.perf_counter() - start)
+        return resp
+
+    # blocking (requests)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="turbopi-hedge")
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _hedged(self, send: Callable[[], Any]) -> Any:
+        if not self.policy.hedge:
+            return self._timed(send)
+        pool = self._pool()
+        primary = pool.submit(self._timed, send)
+        try:
+            return primary.result(timeout=self.hedge_delay())
+        except FutureTimeout:
+            pass
+        self._count("hedges")
+        hedge = pool.submit(self._timed, send)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self._count("hedge_wins")
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def call(self, send: Callable[[], Any]) -> Any:
+        """Run an idempotent request with hedging, retries and the circuit breaker."""
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("breaker_rejections")
+            raise CircuitOpenError("circuit open: backend failed repeatedly, not sending request")
+        attempt = 0
+        settled = False
+        try:
+            while True:
+                try:
+                    resp = self._hedged(send)
+                    if not self._is_failure(resp) or attempt >= self.policy.retries:
+                        settled = True
+                        if self._is_failure(resp):
+                            self._fail()
+                        else:
+                            self.breaker.record_success()
+                        return resp
+                    resp.close()
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt >= self.policy.retries:
+                        settled = True
+                        self._fail()
+                        raise
+                attempt += 1
+                self._count("retries")
+                time.sleep(self.policy.backoff(attempt))
+        except Exception:
+            # Any other error (e.g. ChunkedEncodingError) is a failed call too
+            if not settled:
+                settled = True
+                self._fail()
+            raise
+        finally:
+            if not settled:
+                self.breaker.release_trial()
+
+    def _fail(self) -> None:
+        self._count("failures")
+        self.breaker.record_failure()
+
+    # asyncio (httpx)
+
+    async def _atimed(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        start = time.perf_counter()
+        resp = await send()
+        self.record_latency(time.perf_counter() - start)
+        return resp
+
+    async def _ahedged(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.policy.hedge:
+            return await self._atimed(send)
+        primary = asyncio.ensure_future(self._atimed(send))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay())
+            if done:
+                return primary.result()
+            self._count("hedges")
+            hedge = asyncio.ensure_future(self._atimed(send))
+            tasks.append(hedge)
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is hedge:
+                        self._count("hedge_wins")
+                    return task.result()
+            raise error
+        finally:
+            # Losers, and both requests if the caller was cancelled
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def acall(
+        self,
+        send: Callable[[], Awaitable[Any]],
+        transport_errors: tuple,
+        open_error: Callable[[str], BaseException],
+    ) -> Any:
+        """asyncio twin of `call`; `transport_errors` are the retryable client exceptions and
+        `open_error` builds the exception raised while the circuit is open."""
+        self._count("calls")
+        if not self.breaker.allow():
+            self._count("breaker_rejections")
+            raise open_error("circuit open: backend failed repeatedly, not sending request")
+        attempt = 0
+        settled = False
+        try:
+            while True:
+                try:
+                    resp = await self._ahedged(send)
+                    if not self._is_failure(resp) or attempt >= self.policy.retries:
+                        settled = True
+                        if self._is_failure(resp):
+                            self._fail()
+                        else:
+                            self.breaker.record_success()
+                        return resp
+                except transport_errors:
+                    if attempt >= self.policy.retries:
+                        settled = True
+                        self._fail()
+                        raise
+                attempt += 1
+                self._count("retries")
+                await asyncio.sleep(self.policy.backoff(attempt))
+        except Exception:
+            if not settled:
+                settled = True
+                self._fail()
+            raise
+        finally:
+            # CancelledError is not an Exception: a cancelled trial must not leave the breaker half-open
+            if not settled:
+                self.breaker.release_trial()
+
+
+def _close_response(future: Future) -> None:
+    # The losing duplicate still holds a pooled connection; release it.
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
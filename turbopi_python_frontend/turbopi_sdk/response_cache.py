@@ -0,0 +1,132 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from . import codec
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+DEFAULT_MAX_ENTRIES = 256
+
+# Writes under these prefixes can change cached reads (workspace id and voice live
+# in the config; bot metadata changes on create; batches may patch the config), so
+# they drop the whole cache.
+INVALIDATING_PATH_PREFIXES = ("/api/v1/config", "/api/v1/coze/bots", "/api/v1/coze/workspace", "/api/v1/batch")
+
+
+class CachedResponse:
+    """One cached GET body with its validator and freshness deadline."""
+
+    __slots__ = ("etag", "body", "expires_at")
+
+    def __init__(self, etag: Optional[str], body: bytes, expires_at: float) -> None:
+        self.etag = etag
+        self.body = body
+        self.expires_at = expires_at
+
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def payload(self) -> Dict[str, Any]:
+        # Decode per call so callers can never mutate the cached copy.
+        return codec.loads(self.body)
+
+
+class ResponseCache:
+    """Opt-in TTL + ETag cache for GET responses.
+
+    Only responses the backend marks cacheable (an ``ETag`` or a
+    ``Cache-Control: max-age``) are stored. While an entry is fresh it is served
+    without touching the network; once stale it is revalidated with
+    ``If-None-Match``, which costs one small 304 round trip when nothing changed.
+
+    ttl: freshness period in seconds overriding the server's ``max-age``
+        (``0`` always revalidates); None follows the server.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        if not params:
+            return path
+        return path + "?" + "&".join(f"{k}={params[k]}" for k in sorted(params))
+
+    def _freshness(self, headers: Mapping[str, str]) -> Optional[float]:
+        cache_control = headers.get("Cache-Control", "")
+        if "no-store" in cache_control:
+            return None
+        if self.ttl is not None:
+            return self.ttl
+        if "no-cache" in cache_control:
+            return 0.0
+        m = _MAX_AGE.search(cache_control)
+        return float(m.group(1)) if m else 0.0
+
+    def lookup(self, key: str) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+        """Return ``(fresh_entry, conditional_headers)``.
+
+        `fresh_entry` is set only when the cached body can be served as is; otherwise
+        `conditional_headers` carries ``If-None-Match`` for a stale entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, {}
+            self._entries.move_to_end(key)
+            if entry.fresh():
+                self.hits += 1
+                return entry, {}
+            return None, ({"If-None-Match": entry.etag} if entry.etag else {})
+
+    def store(self, key: str, headers: Mapping[str, str], body: bytes) -> None:
+        etag = headers.get("ETag")
+        if not etag and "max-age" not in headers.get("Cache-Control", ""):
+            return
+        freshness = self._freshness(headers)
+        if freshness is None or (not etag and freshness <= 0):
+            return
+        with self._lock:
+            self._entries[key] = CachedResponse(etag, body, time.monotonic() + freshness)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: str, headers: Mapping[str, str]) -> Optional[CachedResponse]:
+        """Mark `key` fresh again after a 304 and return its entry."""
+        freshness = self._freshness(headers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.revalidated += 1
+            entry.expires_at = time.monotonic() + (freshness or 0.0)
+            return entry
+
+    def invalidate_for(self, path: str) -> None:
+        """Drop cached reads a write to `path` may have changed."""
+        if path.startswith(INVALIDATING_PATH_PREFIXES):
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+            }
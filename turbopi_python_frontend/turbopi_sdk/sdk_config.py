@@ -1,10 +1,10 @@
 import os
-import yaml
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 _CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
 _ENV_KEY = "TURBOPI_SERVER_IP"
+_FLEET_ENV_KEY = "TURBOPI_FLEET"
 _DEFAULT_IP = "127.0.0.1"
 _PORT = 8000
 
@@ -14,6 +14,8 @@ _cached_ip: Optional[str] = None
 def _load_ip_from_file() -> str:
     try:
         if _CONFIG_PATH.exists():
+            import yaml  # imported on first use to keep `import turbopi_sdk` fast
+
             with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
                 data = yaml.safe_load(f) or {}
                 ip = str(data.get("server_ip") or _DEFAULT_IP).strip()
@@ -40,6 +42,47 @@ def get_base_url() -> str:
     return f"http://{ip}:{_PORT}"
 
 
+def base_url_for(address: str) -> str:
+    """Base URL for a robot given as ``ip``, ``host:port`` or a full URL."""
+    address = str(address).strip().rstrip("/")
+    if "://" in address:
+        return address
+    if ":" in address:
+        return f"http://{address}"
+    return f"http://{address}:{_PORT}"
+
+
+def get_fleet_addresses() -> Dict[str, str]:
+    """Robots of the fleet as ``{name: address}``.
+
+    Read from ``TURBOPI_FLEET`` (comma separated, entries ``ip`` or ``name=ip``),
+    otherwise from the ``fleet`` key of `config.yaml` (a list or a mapping).
+    """
+    env = os.getenv(_FLEET_ENV_KEY)
+    if env and env.strip():
+        robots: Dict[str, str] = {}
+        for item in env.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            name, _, address = item.rpartition("=")
+            robots[name or address] = address
+        return robots
+    try:
+        if _CONFIG_PATH.exists():
+            import yaml
+
+            with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+            fleet = data.get("fleet") or {}
+            if isinstance(fleet, dict):
+                return {str(k): str(v) for k, v in fleet.items()}
+            return {str(a): str(a) for a in fleet}
+    except Exception:
+        pass
+    return {}
+
+
 def set_server_ip(ip: str) -> None:
     """Update `config.yaml` with a new server IP (runtime override).
 
@@ -48,8 +91,22 @@ def set_server_ip(ip: str) -> None:
     ip = str(ip).strip()
     if not ip:
         raise ValueError("server ip cannot be empty")
+    import yaml
+
+    data = {}
+    try:
+        if _CONFIG_PATH.exists():
+            with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+    except Exception:
+        data = {}
+    # Keep other keys (e.g. `fleet`) intact.
+    data["server_ip"] = ip
     _CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
-        yaml.safe_dump({"server_ip": ip}, f, allow_unicode=True)
+        yaml.safe_dump(data, f, allow_unicode=True)
     global _cached_ip
-    _cached_ip = ip
\ No newline at end of file
+    _cached_ip = ip
+    # The shared client captured the old base URL; rebuild it on next use.
+    from .client import reset_default_client
+    reset_default_client()
\ No newline at end of file
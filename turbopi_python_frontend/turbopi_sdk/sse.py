@@ -0,0 +1,168 @@
+import random
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from . import codec
+
+_EOL = re.compile(rb"[\r\n]")
+_BOM = b"\xef\xbb\xbf"
+
+STREAM_EXPIRED_CODE = "SSE_STREAM_EXPIRED"
+
+DEFAULT_RECONNECT_DELAY = 0.1  # seconds, first retry when the server sent no `retry:`
+MAX_RECONNECT_DELAY = 5.0
+
+
+class SSEEvent(NamedTuple):
+    """One dispatched Server-Sent Event."""
+
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class SSEParser:
+    """Incremental, linear-time parser for a `text/event-stream` byte stream.
+
+    Feed raw bytes in whatever chunks the transport delivers. Each byte is scanned
+    once: the parser remembers how far it has looked for a line terminator and
+    only ever discards the consumed prefix. Lines are decoded as UTF-8 only once
+    they are complete, so a multi-byte character split across two chunks is never
+    lost. Handles ``\\n``, ``\\r\\n`` and ``\\r`` line endings, comments, and the
+    ``event``, ``data``, ``id`` and ``retry`` fields as specified by WHATWG HTML.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._scan = 0
+        self._started = False
+        self._data: List[bytearray] = []
+        self._event = ""
+        # `id:` of the event being received; becomes `last_event_id` once the event is complete
+        self._pending_id: Optional[str] = None
+        self.last_event_id: Optional[str] = None
+        self.retry: Optional[int] = None
+
+    def reset(self) -> None:
+        """Drop any half-received event before reconnecting; keeps `last_event_id` and `retry`."""
+        self._buf.clear()
+        self._scan = 0
+        self._started = False
+        self._data = []
+        self._event = ""
+        self._pending_id = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """Consume `chunk` and return the events it completed (possibly none)."""
+        buf = self._buf
+        buf += chunk
+        if not self._started:
+            if len(buf) < len(_BOM) and _BOM.startswith(bytes(buf)):
+                return []
+            if buf.startswith(_BOM):
+                del buf[: len(_BOM)]
+            self._started = True
+
+        events: List[SSEEvent] = []
+        start = 0
+        pos = self._scan
+        end_of_buf = len(buf)
+        while True:
+            m = _EOL.search(buf, pos)
+            if m is None:
+                pos = end_of_buf
+                break
+            i = m.start()
+            if buf[i] == 0x0D:
+                if i + 1 == end_of_buf:
+                    # A lone trailing CR may be the first half of CRLF; wait for more bytes.
+                    pos = i
+                    break
+                nxt = i + 2 if buf[i + 1] == 0x0A else i + 1
+            else:
+                nxt = i + 1
+            event = self._process_line(buf[start:i])
+            if event is not None:
+                events.append(event)
+            start = pos = nxt
+
+        if start:
+            del buf[:start]
+        self._scan = pos - start
+        return events
+
+    def _process_line(self, line: bytearray) -> Optional[SSEEvent]:
+        if not line:
+            return self._dispatch()
+        if line[0] == 0x3A:  # ":" comment / keep-alive
+            return None
+        colon = line.find(b":")
+        if colon == -1:
+            field, value = line, b""
+        else:
+            field, value = line[:colon], line[colon + 1:]
+            if value[:1] == b" ":
+                value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode("utf-8", errors="replace")
+        elif field == b"id":
+            if b"\x00" not in value:
+                self._pending_id = value.decode("utf-8", errors="replace")
+        elif field == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def _dispatch(self) -> Optional[SSEEvent]:
+        data, self._data = self._data, []
+        event_type, self._event = self._event, ""
+        if self._pending_id is not None:
+            self.last_event_id, self._pending_id = self._pending_id, None
+        if not data:
+            return None
+        return SSEEvent(
+            data=b"\n".join(data).decode("utf-8", errors="replace"),
+            event=event_type or "message",
+            id=self.last_event_id,
+            retry=self.retry,
+        )
+
+
+def iter_sse(chunks: Iterable[bytes], parser: Optional[SSEParser] = None) -> Iterator[SSEEvent]:
+    """Parse an iterable of byte chunks into `SSEEvent` objects."""
+    parser = parser or SSEParser()
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+
+
+def reconnect_delay(attempt: int, retry_ms: Optional[int] = None) -> float:
+    """Jittered exponential backoff for reconnect `attempt` (1-based), seeded by the server's `retry:`."""
+    base = retry_ms / 1000.0 if retry_ms is not None else DEFAULT_RECONNECT_DELAY
+    delay = min(base * (2 ** (attempt - 1)), MAX_RECONNECT_DELAY)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class SSEStreamExpiredError(RuntimeError):
+    """The backend could not replay every missed event; the answer is incomplete."""
+
+    def __init__(self, payload: Dict[str, Any]):
+        super().__init__(payload.get("message") or "SSE stream can no longer be resumed")
+        self.payload = payload
+
+
+def event_payload(event: SSEEvent) -> Dict[str, Any]:
+    """Decode the JSON payload of a backend event, falling back to a raw event."""
+    try:
+        return codec.loads(event.data)
+    except Exception:
+        return {"type": "raw", "content": event.data}
+
+
+def raise_for_stream_error(event: SSEEvent, payload: Dict[str, Any]) -> None:
+    """Raise `SSEStreamExpiredError` for the replay middleware's in-band expiry event."""
+    if event.event == "error" and isinstance(payload, dict) and payload.get("code") == STREAM_EXPIRED_CODE:
+        raise SSEStreamExpiredError(payload)